@@ -0,0 +1,264 @@
+"""Lexer, Parser ve vurgulama hattı için tekrarlanabilir performans ölçümü.
+
+Örnek:
+    python benchmark.py -o sonuc.json
+    python benchmark.py --sizes small medium --compare onceki.json --threshold 0.15
+
+Sentetik derlemler sabit tohumla üretilir; aynı boyut her çalıştırmada aynı
+metni verir. tokenize, parse ve highlight aşamaları ayrı ayrı ölçülür:
+highlight, GUI'nin tam geçişini (anlamsal etiketler, etiket aralıkları ve
+TagBatcher farkı) Tk yerine çağrıları yalnızca sayan başsız bir hedefe karşı
+çalıştırır. Süre ölçümü ile tracemalloc tepe bellek ölçümü ayrı turlarda
+yapılır; tracemalloc süreleri şişirmesin diye. --compare verilirse sonuçlar
+önceki bir JSON ile karşılaştırılır ve eşiği aşan gerilemede çıkış kodu 1 olur.
+"""
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from syntax import Lexer, Parser, TagBatcher, collect_tag_ranges, semantic_tags
+
+SEED = 1234
+# Boyut adı -> yaklaşık satır sayısı
+SIZES = {"small": 1000, "medium": 10000, "large": 50000}
+PHASES = ("tokenize", "parse", "highlight")
+NAMES = ["alpha", "beta", "gamma", "delta", "value", "items", "result", "config", "node", "total"]
+
+
+def nested_corpus(lines, rng):
+    """Derin girintili bloklar ve iç içe parantezli ifadeler."""
+    out = []
+    while len(out) < lines:
+        depth = rng.randint(4, 12)
+        out.append(f"def {rng.choice(NAMES)}_{len(out)}({rng.choice(NAMES)}, *args, **kwargs):")
+        for level in range(1, depth):
+            indent = "    " * level
+            name = rng.choice(NAMES)
+            keyword = rng.choice(("if", "while", "for", "with"))
+            if keyword == "for":
+                out.append(f"{indent}for {name} in range({level}):")
+            elif keyword == "with":
+                out.append(f"{indent}with open({name}) as handle_{level}:")
+            else:
+                out.append(f"{indent}{keyword} {name} > {level} and not {rng.choice(NAMES)}:")
+            expression = rng.choice(NAMES)
+            for _ in range(rng.randint(2, 8)):
+                expression = f"({expression} + [{rng.choice(NAMES)}, {{'k': {level}}}][0])"
+            out.append(f"{indent}    {name} = {expression}")
+        out.append("    " * depth + f"return {rng.choice(NAMES)}")
+        out.append("")
+    return "\n".join(out[:lines])
+
+
+def fstring_corpus(lines, rng):
+    """Her satırında bir veya daha fazla ifade içeren f-string'ler."""
+    out = []
+    for i in range(lines):
+        name = rng.choice(NAMES)
+        parts = []
+        for _ in range(rng.randint(1, 4)):
+            inner = rng.choice((name, f"{name}.{rng.choice(NAMES)}", f"{name}[{i}]",
+                                f"len({name}) * {i}", f"{{'a': {i}}}['a']"))
+            parts.append(f"{rng.choice(NAMES)}={{{inner}}}")
+        quote = rng.choice(("\"", "'"))
+        out.append(f"{name}_{i} = f{quote}{' '.join(parts)}{quote}")
+    return "\n".join(out)
+
+
+def triple_string_corpus(lines, rng):
+    """Uzun üç tırnaklı dizeler ve aralarında kısa kod."""
+    out = []
+    while len(out) < lines:
+        name = rng.choice(NAMES)
+        out.append(f"def {name}_{len(out)}():")
+        out.append('    """')
+        for _ in range(rng.randint(20, 120)):
+            words = " ".join(rng.choice(NAMES) for _ in range(rng.randint(3, 12)))
+            out.append(f"    {words} 'alıntı' \"tırnak\" {{süslü}}")
+        out.append('    """')
+        out.append(f"    return {name}")
+    return "\n".join(out[:lines - 1] + ['"""'])
+
+
+def short_lines_corpus(lines, rng):
+    """Çok sayıda kısa satır: atamalar, çağrılar ve yorumlar."""
+    out = []
+    for i in range(lines):
+        kind = rng.randrange(4)
+        name = rng.choice(NAMES)
+        if kind == 0:
+            out.append(f"{name} = {i}")
+        elif kind == 1:
+            out.append(f"{name}()")
+        elif kind == 2:
+            out.append(f"# {name}")
+        else:
+            out.append("")
+    return "\n".join(out)
+
+
+CORPORA = {
+    "nested": nested_corpus,
+    "fstring": fstring_corpus,
+    "triple": triple_string_corpus,
+    "short": short_lines_corpus,
+}
+
+
+def make_corpus(name, lines):
+    """Ad ve satır sayısı için her zaman aynı metni üretir."""
+    return CORPORA[name](lines, random.Random(f"{SEED}:{name}:{lines}"))
+
+
+class HeadlessTagBatcher(TagBatcher):
+    """Tk'ye gitmeden yalnızca indeks dizelerini üretip çağrıları sayan TagBatcher."""
+
+    def __init__(self):
+        super().__init__(None)
+        self.indices_sent = 0
+
+    def add(self, tag, ranges):
+        self.calls += 1
+        self.indices_sent += len(self.indices(ranges))
+
+    def remove(self, tag, ranges):
+        self.calls += 1
+        self.indices_sent += len(self.indices(ranges))
+
+
+def run_tokenize(text):
+    lexer = Lexer(engine="regex", compact=True)
+    lexer.set_text(text)
+    return lexer.tokenize()
+
+
+def run_parse(tokens):
+    parser = Parser(tokens, engine="precedence")
+    parser.parse()
+    return parser
+
+
+def run_highlight(tokens, parser):
+    batcher = HeadlessTagBatcher()
+    ranges = collect_tag_ranges(tokens, semantic_tags(parser))
+    batcher.apply(ranges)
+    return batcher
+
+
+def measure(function, *args, repeat=3, memory=True):
+    """En iyi süreyi ve (ayrı bir turda) tracemalloc tepe belleğini döndürür."""
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = function(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        function(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, best, peak
+
+
+def benchmark(corpus, size, repeat=3, memory=True):
+    """Bir derlem ve boyut için üç aşamayı ölçer; JSON'a yazılacak sözlüğü döndürür."""
+    text = make_corpus(corpus, SIZES[size])
+    tokens, tokenize_time, tokenize_peak = measure(run_tokenize, text, repeat=repeat, memory=memory)
+    parser, parse_time, parse_peak = measure(run_parse, tokens, repeat=repeat, memory=memory)
+    batcher, highlight_time, highlight_peak = measure(run_highlight, tokens, parser, repeat=repeat, memory=memory)
+    count = len(tokens)
+    timings = {
+        "tokenize": (tokenize_time, tokenize_peak),
+        "parse": (parse_time, parse_peak),
+        "highlight": (highlight_time, highlight_peak),
+    }
+    result = {
+        "lines": text.count("\n") + 1,
+        "bytes": len(text.encode("utf-8")),
+        "tokens": count,
+        "statements": len(parser.statements),
+        "tag_calls": batcher.calls,
+    }
+    for phase, (seconds, peak) in timings.items():
+        result[phase] = {
+            "seconds": round(seconds, 6),
+            "tokens_per_sec": round(count / seconds) if seconds else None,
+            "peak_bytes": peak,
+        }
+    return result
+
+
+def compare(results, baseline, threshold):
+    """Süresi veya tepe belleği eşikten fazla artan ölçümleri liste olarak döndürür."""
+    regressions = []
+    for key, result in results.items():
+        previous = baseline.get("results", {}).get(key)
+        if not previous:
+            continue
+        for phase in PHASES:
+            for metric in ("seconds", "peak_bytes"):
+                old, new = previous[phase].get(metric), result[phase].get(metric)
+                if old and new and new > old * (1 + threshold):
+                    regressions.append(f"{key} {phase} {metric}: {old} -> {new} (+{(new / old - 1) * 100:.1f}%)")
+    return regressions
+
+
+def main(argv=None):
+    arguments = argparse.ArgumentParser(description="PySyntaxHighlight performans ölçümü")
+    arguments.add_argument("--corpus", nargs="+", choices=sorted(CORPORA), default=sorted(CORPORA),
+                           help="ölçülecek derlemler (varsayılan: hepsi)")
+    arguments.add_argument("--sizes", nargs="+", choices=list(SIZES), default=["small", "medium"],
+                           help="derlem boyutları (varsayılan: small medium)")
+    arguments.add_argument("-r", "--repeat", type=int, default=3, help="en iyi süre için tekrar sayısı")
+    arguments.add_argument("--no-memory", action="store_true", help="tracemalloc turunu atla")
+    arguments.add_argument("-o", "--output", help="sonuçların yazılacağı JSON dosyası")
+    arguments.add_argument("--compare", help="karşılaştırılacak önceki JSON sonucu")
+    arguments.add_argument("--threshold", type=float, default=0.20,
+                           help="gerileme sayılacak göreli artış (varsayılan: 0.20)")
+    args = arguments.parse_args(argv)
+
+    results = {}
+    for corpus in args.corpus:
+        for size in args.sizes:
+            key = f"{corpus}/{size}"
+            result = benchmark(corpus, size, repeat=args.repeat, memory=not args.no_memory)
+            results[key] = result
+            print(f"{key:16} {result['lines']:>7} satır {result['tokens']:>8} token  " + "  ".join(
+                f"{phase} {result[phase]['seconds'] * 1000:8.1f} ms {result[phase]['tokens_per_sec'] or 0:>10} tok/sn"
+                + (f" {result[phase]['peak_bytes'] / 1024 / 1024:6.1f} MB" if result[phase]['peak_bytes'] else "")
+                for phase in PHASES))
+
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "seed": SEED,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"Gerileme: {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
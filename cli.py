@@ -0,0 +1,209 @@
+"""PySyntaxHighlight için başsız (Tk'siz) toplu vurgulama komut satırı.
+
+Örnek:
+    python cli.py src/ "tests/**/*.py" -o vurgulu/ -f html --theme dark -j 8
+
+Dosyalar, dizinler (içindeki tüm .py dosyaları) veya glob desenleri kabul edilir.
+Lex ve ayrıştırma bir ProcessPoolExecutor üzerinde dosya başına çalışır; tkinter
+hiç içe aktarılmaz, bu yüzden ekransız CI ortamlarında kullanılabilir.
+"""
+import argparse
+import glob
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from formatters import FORMATTERS, THEMES
+from syntax import TOKEN_TYPES, Lexer, Parser, TagRanges, collect_tag_ranges, semantic_tags
+
+
+def write_tokens(out, tokens, roles):
+    """Her token için bir satır: satır:sütun, tür, anlamsal rol ve değer."""
+    text = tokens.text
+    for position, (code, start, length, line, column) in enumerate(
+            zip(tokens.types, tokens.starts, tokens.lengths, tokens.lines, tokens.columns)):
+        value = text[start:start + length]
+        out.write(f"{line}:{column}\t{TOKEN_TYPES[code]}\t{roles.get(position, '-')}\t{value!r}\n")
+
+
+def write_token_stream(out, tokens):
+    """write_tokens ile aynı biçim; Lexer.iter_tokens akışından, anlamsal roller olmadan.
+    Yazılan token sayısını döndürür."""
+    count = 0
+    for token in tokens:
+        out.write(f"{token.line}:{token.column}\t{token.type}\t-\t{token.value!r}\n")
+        count += 1
+    return count
+
+
+def write_tags(out, tokens, roles):
+    """Tk etiket aralıkları: başlangıç ve bitiş indeksi ile etiket adı, konuma göre sıralı."""
+    ranges = TagRanges(collect_tag_ranges(tokens, roles))
+    for i in range(len(ranges)):
+        out.write(f"{ranges.lines[i]}.{ranges.columns[i]}\t{ranges.end_lines[i]}.{ranges.end_columns[i]}"
+                  f"\t{ranges.tags[ranges.codes[i]]}\n")
+
+
+# Düz metin çıktı biçimleri -> (yazıcı, dosya uzantısı); renkli biçimler formatters.FORMATTERS'tadır
+WRITERS = {
+    "tokens": (write_tokens, ".tokens"),
+    "tags": (write_tags, ".tags"),
+}
+
+
+def output_name(path, base=None):
+    """Çıktı dizini altında kullanılacak göreli adı üretir; dizin dışına çıkamaz."""
+    name = os.path.relpath(path, base) if base else os.path.relpath(path)
+    if name.startswith(os.pardir) or os.path.isabs(name):
+        name = os.path.basename(path)
+    return name
+
+
+def expand_paths(patterns):
+    """Dosya, dizin ve glob desenlerini (yol, çıktı adı) çiftlerine açar; tekrarlar atılır."""
+    files = []
+    seen = set()
+
+    def add(path, name):
+        key = os.path.realpath(path)
+        if key not in seen:
+            seen.add(key)
+            files.append((path, name))
+
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, dirs, names in os.walk(pattern):
+                dirs.sort()
+                for name in sorted(names):
+                    if name.endswith(".py"):
+                        path = os.path.join(root, name)
+                        add(path, output_name(path, pattern))
+        elif os.path.isfile(pattern):
+            add(pattern, output_name(pattern))
+        else:
+            for path in sorted(glob.glob(pattern, recursive=True)):
+                if os.path.isfile(path):
+                    add(path, output_name(path))
+    return files
+
+
+def stream_file(job, output):
+    """Dosyayı tümüyle belleğe almadan Lexer.iter_tokens ile tokens biçiminde yazar.
+    render_file ile aynı demeti döndürür."""
+    path, name = job
+    lexer = Lexer(engine="regex")
+    try:
+        size = os.path.getsize(path)
+        with open(path, 'r', encoding='utf-8') as file:
+            if output is None:
+                out = io.StringIO()
+                count = write_token_stream(out, lexer.iter_tokens(file))
+                return name, size, count, out.getvalue(), None
+            target = os.path.join(output, name + WRITERS["tokens"][1])
+            os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+            with open(target, 'w', encoding='utf-8') as out:
+                count = write_token_stream(out, lexer.iter_tokens(file))
+    except (OSError, UnicodeDecodeError) as e:
+        return name, 0, 0, None, str(e)
+    return name, size, count, None, None
+
+
+def render_file(job, output, fmt, theme="light", stream=False):
+    """İşçi süreçte bir dosyayı okur, tokenlaştırır, ayrıştırır ve seçilen biçimde yazar.
+
+    (çıktı adı, bayt sayısı, token sayısı, çıktı metni, hata) döndürür; çıktı dizini
+    verildiyse metin doğrudan dosyaya yazılır ve None döner."""
+    if stream and fmt == "tokens":
+        return stream_file(job, output)
+    path, name = job
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            text = file.read()
+    except (OSError, UnicodeDecodeError) as e:
+        return name, 0, 0, None, str(e)
+
+    lexer = Lexer(engine="regex", compact=True)
+    lexer.set_text(text)
+    tokens = lexer.tokenize()
+    parser = Parser(tokens, engine="precedence")
+    parser.parse()
+    roles = semantic_tags(parser)
+
+    if fmt in FORMATTERS:
+        formatter = FORMATTERS[fmt](THEMES[theme])
+        extension = formatter.extension
+
+        def writer(out, tokens, roles):
+            formatter.format(tokens, roles, out)
+    else:
+        writer, extension = WRITERS[fmt]
+    size = len(text.encode('utf-8'))
+    if output is None:
+        out = io.StringIO()
+        writer(out, tokens, roles)
+        return name, size, len(tokens), out.getvalue(), None
+    target = os.path.join(output, name + extension)
+    try:
+        os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+        with open(target, 'w', encoding='utf-8') as out:
+            writer(out, tokens, roles)
+    except OSError as e:
+        return name, size, len(tokens), None, str(e)
+    return name, size, len(tokens), None, None
+
+
+def main(argv=None):
+    arguments = argparse.ArgumentParser(description="PySyntaxHighlight başsız toplu vurgulama")
+    arguments.add_argument("paths", nargs="+", help="dosyalar, dizinler veya glob desenleri")
+    arguments.add_argument("-o", "--output", help="çıktı dizini (verilmezse standart çıktıya yazılır)")
+    arguments.add_argument("-f", "--format", choices=sorted(WRITERS) + sorted(FORMATTERS), default="tokens",
+                           help="token akışı, etiket aralıkları veya renkli çıktı (varsayılan: tokens)")
+    arguments.add_argument("--theme", choices=sorted(THEMES), default="light",
+                           help="renkli biçimler için tema (varsayılan: light)")
+    arguments.add_argument("--stream", action="store_true",
+                           help="tokens biçiminde dosyaları sabit bellekle akış halinde işle (anlamsal roller olmadan)")
+    arguments.add_argument("-j", "--workers", type=int, default=os.cpu_count(),
+                           help="işçi süreç sayısı (varsayılan: çekirdek sayısı)")
+    arguments.add_argument("--chunksize", type=int, default=1,
+                           help="bir işçiye tek seferde gönderilen dosya sayısı")
+    args = arguments.parse_args(argv)
+    if args.workers is not None and args.workers < 1:
+        arguments.error("-j/--workers en az 1 olmalıdır")
+    if args.chunksize < 1:
+        arguments.error("--chunksize en az 1 olmalıdır")
+
+    files = expand_paths(args.paths)
+    if not files:
+        arguments.error("eşleşen dosya bulunamadı")
+    if args.stream and args.format != "tokens":
+        arguments.error("--stream yalnızca tokens biçimiyle kullanılabilir")
+
+    start = time.perf_counter()
+    total_bytes = total_tokens = failed = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        results = executor.map(render_file, files, repeat(args.output), repeat(args.format),
+                               repeat(args.theme), repeat(args.stream), chunksize=args.chunksize)
+        for name, size, token_count, rendered, error in results:
+            if error:
+                failed += 1
+                print(f"Hata: {name}: {error}", file=sys.stderr)
+                continue
+            total_bytes += size
+            total_tokens += token_count
+            if rendered is not None:
+                sys.stdout.write(f"==> {name} <==\n")
+                sys.stdout.write(rendered)
+    elapsed = max(time.perf_counter() - start, 1e-9)
+
+    processed = len(files) - failed
+    megabytes = total_bytes / (1024 * 1024)
+    print(f"{processed} dosya, {total_tokens} token, {megabytes:.2f} MB, {elapsed:.2f} sn: "
+          f"{processed / elapsed:.1f} dosya/sn, {megabytes / elapsed:.2f} MB/sn", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
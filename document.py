@@ -0,0 +1,178 @@
+"""Metin alanından bağımsız, parça tablosu (piece table) tabanlı belge modeli.
+
+Örnek:
+    document = PieceTable("a = 1\\nb = 2")
+    document.insert(document.offset(2, 0), "# yorum\\n")
+    document.position(8)      # (2, 2)
+    document.lines(2, 3)      # "# yorum\\nb = 2"
+
+Metin değiştirilmez tamponlardan (açılan metin ve eklenen her parça) ve bu
+tamponlara bakan (tampon, başlangıç, bitiş) parçalarından oluşur. Her tamponun
+satır sonu ofsetleri bir kez hesaplanır; parçaların birikimli karakter ve satır
+sonu sayıları sayesinde ofset ile (satır, sütun) arasındaki dönüşüm iki ikili
+aramayla yapılır. Düzenlemeler yalnızca parça listesini değiştirir; metnin
+tamamı hiçbir zaman yeniden kurulmaz (parça sayısı PIECE_LIMIT'i aşınca tek
+tampona sıkıştırılması dışında).
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+
+PIECE_LIMIT = 1024  # Bu kadar parçadan sonra belge tek tampona sıkıştırılır
+COALESCE_LIMIT = 4096  # Ardışık eklemelerin aynı tamponda birleştirildiği en büyük tampon uzunluğu
+
+
+def newline_offsets(text):
+    """Metindeki satır sonlarının ofsetlerini döndürür."""
+    offsets = array("q")
+    find = text.find
+    position = find("\n")
+    while position >= 0:
+        offsets.append(position)
+        position = find("\n", position + 1)
+    return offsets
+
+
+class PieceTable:
+    """Parça tablosu üzerinde satır dizinli belge.
+
+    Satırlar 1, sütunlar Tk'deki gibi 0 tabanlıdır; belge Tk'nin eklediği son
+    satır sonunu içermez."""
+
+    def __init__(self, text=""):
+        self.set_text(text)
+
+    def set_text(self, text):
+        self.buffers = []  # (metin, satır sonu ofsetleri)
+        self.pieces = []  # (tampon numarası, başlangıç, bitiş)
+        self.ends = []  # Her parçanın sonuna kadarki toplam karakter sayısı
+        self.breaks = []  # Her parçanın sonuna kadarki toplam satır sonu sayısı
+        if text:
+            self.buffers.append((text, newline_offsets(text)))
+            self.pieces.append((0, 0, len(text)))
+        self.reindex(0)
+
+    def __len__(self):
+        return self.ends[-1] if self.ends else 0
+
+    def line_count(self):
+        return (self.breaks[-1] if self.breaks else 0) + 1
+
+    def count_breaks(self, buffer, start, end):
+        newlines = self.buffers[buffer][1]
+        return bisect_left(newlines, end) - bisect_left(newlines, start)
+
+    def reindex(self, first):
+        """first parçasından itibaren birikimli karakter ve satır sonu sayılarını yeniler."""
+        del self.ends[first:]
+        del self.breaks[first:]
+        total = self.ends[-1] if self.ends else 0
+        lines = self.breaks[-1] if self.breaks else 0
+        for buffer, start, end in self.pieces[first:]:
+            total += end - start
+            lines += self.count_breaks(buffer, start, end)
+            self.ends.append(total)
+            self.breaks.append(lines)
+
+    def piece_start(self, index):
+        return self.ends[index - 1] if index else 0
+
+    def split(self, offset):
+        """offset'te bir parça sınırı oluşturur; o noktada başlayan parçanın indeksini döndürür."""
+        index = bisect_right(self.ends, offset)
+        if index == len(self.pieces) or self.piece_start(index) == offset:
+            return index
+        buffer, start, end = self.pieces[index]
+        cut = start + offset - self.piece_start(index)
+        self.pieces[index:index + 1] = [(buffer, start, cut), (buffer, cut, end)]
+        self.ends.insert(index, offset)
+        self.breaks.insert(index, (self.breaks[index - 1] if index else 0) + self.count_breaks(buffer, start, cut))
+        return index + 1
+
+    def insert(self, offset, text):
+        """text'i offset'e ekler."""
+        if not text:
+            return
+        # Yazılan karakterler: önceki eklemenin hemen arkasına geliyorsa aynı tamponu uzat
+        index = bisect_left(self.ends, offset)
+        if offset and index < len(self.pieces) and self.ends[index] == offset:
+            buffer, start, end = self.pieces[index]
+            content, newlines = self.buffers[buffer]
+            if end == len(content) and len(content) < COALESCE_LIMIT and buffer:
+                newlines.extend(len(content) + position for position in newline_offsets(text))
+                self.buffers[buffer] = (content + text, newlines)
+                self.pieces[index] = (buffer, start, end + len(text))
+                self.reindex(index)
+                return
+        self.buffers.append((text, newline_offsets(text)))
+        index = self.split(offset)
+        self.pieces.insert(index, (len(self.buffers) - 1, 0, len(text)))
+        self.reindex(index)
+        self.compact()
+
+    def delete(self, start, end):
+        """[start, end) aralığını siler."""
+        if end <= start:
+            return
+        first = self.split(start)
+        last = self.split(end)
+        del self.pieces[first:last]
+        self.reindex(first)
+        self.compact()
+
+    def compact(self):
+        """Parça sayısı sınırı aşınca belgeyi tek tampona toplar."""
+        if len(self.pieces) > PIECE_LIMIT:
+            self.set_text(self.text())
+
+    def text(self, start=0, end=None):
+        """[start, end) aralığındaki metni döndürür; yalnızca kesişen parçalar okunur."""
+        length = len(self)
+        end = length if end is None else min(end, length)
+        if start >= end:
+            return ""
+        index = bisect_right(self.ends, start)
+        parts = []
+        while index < len(self.pieces) and self.piece_start(index) < end:
+            buffer, piece_start, piece_end = self.pieces[index]
+            offset = self.piece_start(index)
+            parts.append(self.buffers[buffer][0][piece_start + max(start - offset, 0):
+                                                 piece_start + min(end - offset, piece_end - piece_start)])
+            index += 1
+        return parts[0] if len(parts) == 1 else "".join(parts)
+
+    def line_start(self, line):
+        """1 tabanlı satırın başlangıç ofseti; belgenin ötesindeki satırlar için uzunluk."""
+        count = line - 1  # Satırdan önceki satır sonu sayısı
+        if count <= 0:
+            return 0
+        index = bisect_left(self.breaks, count)
+        if index == len(self.pieces):
+            return len(self)
+        before = self.breaks[index - 1] if index else 0
+        buffer, start, _ = self.pieces[index]
+        newlines = self.buffers[buffer][1]
+        position = newlines[bisect_left(newlines, start) + count - before - 1]
+        return self.piece_start(index) + position - start + 1
+
+    def position(self, offset):
+        """Ofseti (satır, sütun) ikilisine çevirir."""
+        offset = max(0, min(offset, len(self)))
+        index = min(bisect_right(self.ends, offset), len(self.pieces) - 1)
+        if index < 0:
+            return 1, offset
+        buffer, start, _ = self.pieces[index]
+        inside = offset - self.piece_start(index)
+        line = (self.breaks[index - 1] if index else 0) + self.count_breaks(buffer, start, start + inside) + 1
+        return line, offset - self.line_start(line)
+
+    def offset(self, line, column):
+        """(satır, sütun) konumunu ofsete çevirir; sütun satır sonunda sınırlanır."""
+        start = self.line_start(line)
+        stop = self.line_start(line + 1)
+        if stop > start and line < self.line_count():
+            stop -= 1  # Satır sonu karakteri satıra dahil değil
+        return min(start + column, stop)
+
+    def lines(self, first_line, last_line):
+        """first_line..last_line satırlarını (son satırın satır sonu dahil) döndürür."""
+        return self.text(self.line_start(first_line), self.line_start(last_line + 1))
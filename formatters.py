@@ -0,0 +1,289 @@
+"""Token akışını HTML, ANSI terminal veya RTF çıktısına dönüştüren biçimlendiriciler.
+
+Örnek:
+    with open("kaynak.html", "w", encoding="utf-8") as out:
+        highlight(metin, HtmlFormatter(full=True), out)
+
+Biçimlendiriciler Lexer'ın sıkışık TokenBuffer'ını ve Parser çıktısından gelen
+anlamsal rolleri (semantic_tags()) alır. Çıktı küçük parçalar halinde dosya
+nesnesine yazılır; belge hiçbir zaman tek bir dizede toplanmaz.
+"""
+import re
+from html import escape
+
+from syntax import TAG_NAMES, TOKEN_TYPES, Lexer, Parser, semantic_tags
+
+# Tema renkleri (GUI ve biçimlendiriciler ortak kullanır)
+LIGHT_THEME = {
+    "bg": "#FFFFFF",  # Beyaz zemin
+    "fg": "#000000",  # Siyah yazı
+    "keyword": "#0033A0",        # Koyu mavi
+    "operator": "#000000",       # Siyah
+    "number": "#D32F2F",         # Canlı kırmızı
+    "string": "#388E3C",         # Koyu yeşil
+    "fstring": "#388E3C",
+    "fstring_expr": "#00796B",   # Teal
+    "comment": "#9E9E9E",        # Gri
+    "identifier": "#000000",     # Siyah
+    "constant": "#6A1B9A",       # Mor
+    "error": "#C62828",          # Kırmızı
+    "decorator": "#EF6C00",      # Turuncu
+    "function_def": "#00695C",   # Camgöbeği
+    "class_def": "#1E88E5",      # Parlak mavi
+    "call": "#1565C0",           # Mavi ton
+    "lambda": "#00838F",         # Camgöbeği
+    "loop_var": "#512DA8",       # Mor
+    "conditional": "#3949AB",    # Koyu mavi
+    "parameter": "#5D4037",      # Kahverengi
+    "attribute": "#F57C00",      # Turuncu
+    "line_numbers_bg": "#F0F0F0",
+    "line_numbers_fg": "#888888"
+}
+
+DARK_THEME = {
+    "bg": "#1E1E1E",
+    "fg": "#D4D4D4",
+    "keyword": "#569CD6",        # Mavi
+    "operator": "#D4D4D4",       # Açık gri
+    "number": "#B5CEA8",         # Açık yeşil
+    "string": "#CE9178",         # Somon
+    "fstring": "#CE9178",
+    "fstring_expr": "#4EC9B0",   # Turkuaz
+    "comment": "#6A9955",        # Yumuşak yeşil
+    "identifier": "#D4D4D4",
+    "constant": "#C586C0",       # Mor
+    "error": "#F44747",          # Parlak kırmızı
+    "decorator": "#DCDCAA",      # Sarımsı
+    "function_def": "#DCDCAA",
+    "class_def": "#4EC9B0",      # Camgöbeği
+    "call": "#9CDCFE",           # Açık mavi
+    "lambda": "#569CD6",
+    "loop_var": "#C586C0",
+    "conditional": "#569CD6",
+    "parameter": "#9CDCFE",
+    "attribute": "#D7BA7D",      # Sarımsı
+    "line_numbers_bg": "#2D2D2D",
+    "line_numbers_fg": "#858585"
+}
+
+THEMES = {"light": LIGHT_THEME, "dark": DARK_THEME}
+
+FLUSH_PIECES = 4096  # Dosyaya yazılmadan önce biriktirilen en fazla parça sayısı
+
+
+def hex_to_rgb(color):
+    return int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+
+
+def ansi256(color):
+    """#RRGGBB rengine en yakın xterm-256 renk indeksini bulur (6x6x6 küp veya gri ton)."""
+    r, g, b = hex_to_rgb(color)
+    levels = [0, 95, 135, 175, 215, 255]
+    cube = [min(range(6), key=lambda i: abs(levels[i] - value)) for value in (r, g, b)]
+    gray = max(0, min(23, round(((r + g + b) / 3 - 8) / 10)))
+    candidates = [
+        (16 + 36 * cube[0] + 6 * cube[1] + cube[2], [levels[i] for i in cube]),
+        (232 + gray, [8 + 10 * gray] * 3),
+    ]
+    return min(candidates, key=lambda c: sum((a - b) ** 2 for a, b in zip(c[1], (r, g, b))))[0]
+
+
+class Formatter:
+    """Biçimlendiricilerin ortak akışı: token'lar ve aralarındaki metin sırayla yazılır.
+
+    Alt sınıflar header(), footer(), plain(metin) ve styled(etiket, metin) sağlar."""
+    extension = ".txt"
+
+    def __init__(self, theme=LIGHT_THEME):
+        self.theme = theme
+
+    def color(self, tag):
+        """Etiketin rengi; varsayılan yazı rengiyle aynıysa None."""
+        color = self.theme[tag.lower()]
+        return None if color == self.theme["fg"] else color
+
+    def header(self):
+        return ""
+
+    def footer(self):
+        return ""
+
+    def plain(self, text):
+        return text
+
+    def styled(self, tag, text):
+        return self.plain(text)
+
+    def format(self, tokens, roles, out):
+        """tokens: Lexer(compact=True) çıktısı TokenBuffer; roles: semantic_tags() sözlüğü."""
+        text = tokens.text
+        pieces = [self.header()]
+        position = 0
+        for index, (code, start, length) in enumerate(zip(tokens.types, tokens.starts, tokens.lengths)):
+            end = start + length
+            start = max(start, position)
+            if start >= end:
+                continue
+            if start > position:
+                pieces.append(self.plain(text[position:start]))
+            token_type = TOKEN_TYPES[code]
+            tag = roles.get(index) or ("CONSTANT" if token_type == "LITERAL" else token_type)
+            pieces.append(self.styled(tag, text[start:end]))
+            position = end
+            if len(pieces) >= FLUSH_PIECES:
+                out.write("".join(pieces))
+                pieces.clear()
+        if position < len(text):
+            pieces.append(self.plain(text[position:]))
+        pieces.append(self.footer())
+        out.write("".join(pieces))
+
+
+class HtmlFormatter(Formatter):
+    """<pre> içinde HTML üretir. Varsayılan olarak sınıf tabanlıdır (css() stil sayfasını
+    verir); inline=True her token'a style özniteliği yazar. full=True tam belge üretir."""
+    extension = ".html"
+
+    def __init__(self, theme=LIGHT_THEME, inline=False, full=False, prefix="pysh"):
+        super().__init__(theme)
+        self.inline = inline
+        self.full = full
+        self.prefix = prefix
+
+    def css(self):
+        rules = [f".{self.prefix} {{ background: {self.theme['bg']}; color: {self.theme['fg']}; }}"]
+        for tag in TAG_NAMES:
+            rules.append(f".{self.prefix}-{tag.lower()} {{ color: {self.theme[tag.lower()]}; }}")
+        return "\n".join(rules) + "\n"
+
+    def header(self):
+        parts = []
+        if self.full:
+            parts.append('<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n')
+            if not self.inline:
+                parts.append(f"<style>\n{self.css()}</style>\n")
+            parts.append("</head>\n<body>\n")
+        if self.inline:
+            parts.append(f'<pre style="background: {self.theme["bg"]}; color: {self.theme["fg"]}">')
+        else:
+            parts.append(f'<pre class="{self.prefix}">')
+        return "".join(parts)
+
+    def footer(self):
+        return "</pre>\n</body>\n</html>\n" if self.full else "</pre>\n"
+
+    def plain(self, text):
+        return escape(text, quote=False)
+
+    def styled(self, tag, text):
+        if not self.inline:
+            return f'<span class="{self.prefix}-{tag.lower()}">{escape(text, quote=False)}</span>'
+        color = self.color(tag)
+        if color is None:
+            return escape(text, quote=False)
+        return f'<span style="color: {color}">{escape(text, quote=False)}</span>'
+
+
+class AnsiFormatter(Formatter):
+    """Terminal için ANSI renk kodları üretir; truecolor=False ise 256 renk paleti kullanılır."""
+    extension = ".ansi"
+    RESET = "\x1b[0m"
+
+    def __init__(self, theme=LIGHT_THEME, truecolor=True):
+        super().__init__(theme)
+        self.truecolor = truecolor
+        self.codes = {}
+        for tag in TAG_NAMES:
+            color = self.color(tag)
+            if color is None:
+                continue
+            if truecolor:
+                self.codes[tag] = "\x1b[38;2;{};{};{}m".format(*hex_to_rgb(color))
+            else:
+                self.codes[tag] = f"\x1b[38;5;{ansi256(color)}m"
+
+    def styled(self, tag, text):
+        code = self.codes.get(tag)
+        if code is None:
+            return text
+        # Çok satırlı token'larda renk satır sonunda kapatılır; sayfalayıcılarda taşmaz
+        return code + text.replace("\n", self.RESET + "\n" + code) + self.RESET
+
+
+RTF_SPECIAL = re.compile(r"[\\{}\t\n]|[^\x00-\x7f]")
+
+
+def rtf_escape(text):
+    def replace(match):
+        char = match.group()
+        if char in "\\{}":
+            return "\\" + char
+        if char == "\t":
+            return "\\tab "
+        if char == "\n":
+            return "\\par\n"
+        code = ord(char)
+        if code > 0xFFFF:
+            # RTF \u 16 bitlik işaretli değer alır; BMP dışı karakterler vekil çift olarak yazılır
+            code -= 0x10000
+            units = [0xD800 + (code >> 10), 0xDC00 + (code & 0x3FF)]
+        else:
+            units = [code]
+        return "".join(f"\\u{unit - 65536 if unit > 32767 else unit}?" for unit in units)
+    return RTF_SPECIAL.sub(replace, text)
+
+
+class RtfFormatter(Formatter):
+    """Kelime işlemcilere yapıştırılabilir RTF üretir (Courier New, tema renk tablosuyla)."""
+    extension = ".rtf"
+
+    def __init__(self, theme=LIGHT_THEME):
+        super().__init__(theme)
+        colors = [theme["fg"]]
+        for tag in TAG_NAMES:
+            color = self.color(tag)
+            if color is not None and color not in colors:
+                colors.append(color)
+        self.colors = colors
+        self.indices = {color: index for index, color in enumerate(colors, 1)}
+
+    def header(self):
+        table = "".join("\\red{}\\green{}\\blue{};".format(*hex_to_rgb(color)) for color in self.colors)
+        r, g, b = hex_to_rgb(self.theme["bg"])
+        # Sayfa arka planı: Word \\viewbksp ile arka plan şeklinin dolgu rengini (BGR) kullanır
+        background = ("{\\*\\background{\\shp{\\*\\shpinst{\\sp{\\sn fillColor}"
+                      f"{{\\sv {b << 16 | g << 8 | r}}}}}}}}}}}\\viewbksp1")
+        return ("{\\rtf1\\ansi\\deff0{\\fonttbl{\\f0\\fmodern Courier New;}}"
+                f"{{\\colortbl;{table}}}{background}\n\\f0\\fs20\\cf1 ")
+
+    def footer(self):
+        return "}\n"
+
+    def plain(self, text):
+        return rtf_escape(text)
+
+    def styled(self, tag, text):
+        color = self.color(tag)
+        if color is None:
+            return rtf_escape(text)
+        return f"{{\\cf{self.indices[color]} {rtf_escape(text)}}}"
+
+
+# Komut satırı biçim adları -> tema alan biçimlendirici üreticisi
+FORMATTERS = {
+    "html": lambda theme: HtmlFormatter(theme, full=True),
+    "html-inline": lambda theme: HtmlFormatter(theme, inline=True, full=True),
+    "ansi": lambda theme: AnsiFormatter(theme),
+    "ansi256": lambda theme: AnsiFormatter(theme, truecolor=False),
+    "rtf": RtfFormatter,
+}
+
+
+def highlight(text, formatter, out):
+    """Metni tokenlaştırıp ayrıştırır ve biçimlendiriciyle out dosya nesnesine yazar."""
+    lexer = Lexer(engine="regex", compact=True)
+    lexer.set_text(text)
+    tokens = lexer.tokenize()
+    parser = Parser(tokens, engine="precedence")
+    parser.parse()
+    formatter.format(tokens, semantic_tags(parser), out)
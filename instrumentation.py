@@ -0,0 +1,114 @@
+"""Vurgulama hattı için düşük maliyetli ölçüm.
+
+GUI her vurgulama geçişinde aşama sürelerini (ör. lex, parse, semantic,
+ranges, tags), token ve deyim sayısını ve Tcl etiket çağrısı sayısını bir
+halka tampona yazar. Kayıt kapalıyken her çağrı tek bir None kontrolüdür.
+İstenirse sonraki birkaç geçiş cProfile ile profillenir; rapor JSON
+dökümüne ve metin özetine eklenir.
+"""
+import cProfile
+import io
+import json
+import pstats
+import time
+from collections import deque
+
+STATS_HISTORY = 256  # Halka tamponda tutulan son geçiş sayısı
+PROFILE_LINES = 40  # Profil raporunda listelenen fonksiyon sayısı
+
+
+class PassStats:
+    """Vurgulama geçişlerinin aşama sürelerini ve sayaçlarını halka tamponda tutar.
+
+    Bir geçiş begin() ile açılır; her phase() çağrısı önceki işaretten bu yana
+    geçen süreyi verilen aşamaya ekler ve end() sayaçlarla birlikte kaydı
+    tampona yazar. Açık bir geçiş yokken phase() ve end() hiçbir şey yapmaz."""
+
+    def __init__(self, maxlen=STATS_HISTORY):
+        self.enabled = False
+        self.passes = deque(maxlen=maxlen)
+        self.current = None  # Açık geçişin kaydı; kayıt kapalıyken hep None
+        self.mark = 0.0
+        self.profile_passes = 0  # Profillenecek kalan geçiş sayısı
+        self.profiler = None
+        self.profile_report = None  # Son tamamlanan profilin metin raporu
+
+    def begin(self, kind, started=None):
+        """Yeni bir geçiş açar; started verilirse süre o andan itibaren sayılır."""
+        if not self.enabled:
+            return
+        self.mark = time.perf_counter() if started is None else started
+        self.current = {"kind": kind, "time": time.time(), "phases": {}, "started": self.mark}
+        if self.profile_passes:
+            if self.profiler is None:
+                self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def phase(self, name):
+        """Son işaretten bu yana geçen süreyi name aşamasına ekler."""
+        if self.current is None:
+            return
+        now = time.perf_counter()
+        phases = self.current["phases"]
+        phases[name] = phases.get(name, 0.0) + now - self.mark
+        self.mark = now
+
+    def end(self, **counters):
+        """Açık geçişi sayaçlarla (ör. tokens, statements, tag_calls) tampona yazar."""
+        if self.current is None:
+            return
+        record = self.current
+        self.current = None
+        record["total"] = time.perf_counter() - record.pop("started")
+        record.update(counters)
+        self.passes.append(record)
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.profile_passes -= 1
+            if not self.profile_passes:
+                self.finish_profile()
+
+    def start_profile(self, count):
+        """Sonraki count geçişi cProfile ile profiller; kaydı da açar."""
+        self.enabled = True
+        self.profile_passes = count
+        self.profiler = None
+
+    def finish_profile(self):
+        output = io.StringIO()
+        pstats.Stats(self.profiler, stream=output).sort_stats("cumulative").print_stats(PROFILE_LINES)
+        self.profile_report = output.getvalue()
+        self.profiler = None
+
+    def clear(self):
+        self.passes.clear()
+
+    def to_json(self):
+        """Tamponu ve varsa son profil raporunu JSON metni olarak döndürür."""
+        return json.dumps({"passes": list(self.passes), "profile": self.profile_report}, indent=2)
+
+    def summary(self):
+        """Aşama ortalamaları ve son geçişlerle okunabilir bir metin özeti üretir."""
+        if not self.passes:
+            lines = ["Kayıtlı geçiş yok."]
+        else:
+            totals = {}
+            for record in self.passes:
+                for name, seconds in record["phases"].items():
+                    totals[name] = totals.get(name, 0.0) + seconds
+            count = len(self.passes)
+            lines = [f"{count} geçiş, ortalama {sum(r['total'] for r in self.passes) / count * 1000:.2f} ms",
+                     "Aşama ortalamaları: " + "  ".join(
+                         f"{name} {seconds / count * 1000:.2f} ms" for name, seconds in totals.items()),
+                     ""]
+            for record in reversed(self.passes):
+                counters = "  ".join(f"{key} {value}" for key, value in record.items()
+                                     if key not in ("kind", "time", "phases", "total"))
+                phases = "  ".join(f"{name} {seconds * 1000:.2f}" for name, seconds in record["phases"].items())
+                lines.append(f"{time.strftime('%H:%M:%S', time.localtime(record['time']))} {record['kind']:10}"
+                             f" {record['total'] * 1000:8.2f} ms  {phases}  {counters}")
+        if self.profile_report:
+            lines += ["", "Son profil:", self.profile_report]
+        elif self.profile_passes:
+            lines += ["", f"Profil sürüyor: {self.profile_passes} geçiş kaldı."]
+        return "\n".join(lines)
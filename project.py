@@ -1,981 +1,147 @@
 import tkinter as tk
-from tkinter import filedialog, messagebox
+from tkinter import filedialog, font, messagebox
+import codecs
+import mmap
 import os
+import stat
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from document import PieceTable
+from formatters import DARK_THEME, LIGHT_THEME
+from instrumentation import PassStats
+from tokencache import TokenCache
+# Lexer, Parser ve etiket hesapları Tk içermeyen syntax modülündedir; başsız araçlar
+# (ör. cli.py) onu doğrudan kullanır. Buradan da içe aktarılabilmeleri için yeniden dışa verilir.
+from syntax import (TAG_NAMES, Lexer, ParseCache, Parser, TagBatcher, Token, TokenBuffer, analyze,
+                    changed_roles, collect_tag_ranges, merge_edits, semantic_tags)
+
+# Görünür alan öncelikli vurgulama ayarları (satır sayısı olarak)
+VIEWPORT_MARGIN = 50  # Görünür alanın üstüne ve altına eklenen pay
+HIGHLIGHT_CHUNK_LINES = 200  # Boşta çalışan her adımda renklendirilen blok
+LEX_CHUNK_LINES = 2000  # Boşta çalışan her adımda tokenlaştırılan bölüm
+
+# Gecikmeli vurgulama ayarları
+DEBOUNCE_MIN_MS = 10  # Küçük metinlerde tuşa basıldıktan sonra beklenen en kısa süre
+DEBOUNCE_MAX_MS = 1000  # Çok büyük metinlerde bile en fazla bu kadar beklenir
+DEBOUNCE_FACTOR = 3  # Gecikme, son geçişlerin ortalama süresinin bu katı olur
+PASS_HISTORY = 8  # Ortalamaya giren son vurgulama geçişi sayısı
+
+# Ölçüm ayarları
+PROFILE_PASSES = 20  # "Profille" menüsünün cProfile ile kaydettiği geçiş sayısı
+
+# Arka plan işçisi ayarları
+WORKER_PROCESS_THRESHOLD = 200000  # Bu uzunluktan (karakter) büyük metinler ayrı süreçte işlenir
+WORKER_POLL_MS = 20  # İşçi sonucunun ana döngüden yoklanma aralığı
+
+# Büyük dosya kipi
+LARGE_FILE_BYTES = 16 * 1024 * 1024  # Bu boyuttan büyük dosyalar mmap ile parça parça yüklenir
+LOAD_CHUNK_BYTES = 1 << 20  # Boşta çalışan her yükleme adımında çözülüp metin alanına eklenen bayt
+
+# Satır numarası kenar çubuğu
+GUTTER_PADDING = 3  # Numaraların iki yanındaki boşluk (piksel)
+GUTTER_MIN_DIGITS = 4  # Kenar çubuğunun en az kaç basamak genişliğinde olacağı
+
+def create_temp(directory, name):
+    """directory içinde yalnızca bu çağrıya ait yeni bir geçici dosya açar.
+
+    mkstemp'in aksine dosya 0o666 ile oluşturulur ve umask'ı çekirdek uygular;
+    böylece yeni dosyalar normal izinlerle yazılır, süreç umask'ına dokunulmaz."""
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    while True:
+        temp_path = os.path.join(directory, f".{name}.{os.urandom(4).hex()}.tmp")
+        try:
+            return os.open(temp_path, flags, 0o666), temp_path
+        except FileExistsError:
+            continue
+
+def write_atomic(path, text):
+    """Metni aynı dizindeki geçici bir dosyaya yazar, fsync'ler ve os.replace ile yerine koyar.
+
+    Yarıda kesilen bir yazma mevcut dosyayı bozmaz; var olan dosyanın izinleri korunur.
+    Bağlantı (symlink) ise hedefi değiştirilir."""
+    path = os.path.realpath(path)
+    directory = os.path.dirname(path)
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = None  # Yeni dosya: geçici dosyanın umask'lı izinleri kalır
+    descriptor, temp_path = create_temp(directory, os.path.basename(path))
+    try:
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+            file.write(text)
+            file.flush()
+            os.fsync(file.fileno())
+        if mode is not None:
+            os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+    if hasattr(os, "O_DIRECTORY"):
+        # Yeniden adlandırmanın kendisi de diske işlensin; desteklemeyen dosya sistemleri atlanır
+        try:
+            directory_descriptor = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(directory_descriptor)
+            finally:
+                os.close(directory_descriptor)
+        except OSError:
+            pass
 
-class Token:
-    def __init__(self, type, value, line, column):
-        self.type = type  # "KEYWORD", "OPERATOR", "IDENTIFIER", "LITERAL", "ERROR" vb.
-        self.value = value
-        self.line = line
-        self.column = column
-
-class Lexer:
-    def __init__(self):
-        self.keywords = {
-            "def", "for", "if", "else", "while", "elif", "try", "except", "finally",
-            "class", "None", "lambda", "with", "as", "import", "from", "async",
-            "await", "break", "continue", "pass", "return", "True", "False",
-            "global", "nonlocal", "assert", "raise", "del", "match", "case",
-            "and", "or", "not", "in", "is"
-        }
-        self.operators = {
-            "+", "-", "*", "/", "=", "==", "<", ">", "<=", ">=", "%", "//", "**",
-            "&", "|", "^", "~", "<<", ">>", "@", ":=", "!=", ":", ",", "(", ")",
-            "[", "]", "{", "}", ".", ";"
-        }
-        self.literals = {"True", "False", "None"}  # Özel literaller
-        self.current_char = ""
-        self.pos = -1
-        self.line = 1
-        self.column = 0
-        self.text = ""
-
-    def set_text(self, text):
-        self.text = text
-        self.pos = -1
-        self.line = 1
-        self.column = 0
-        self.current_char = ""
-
-    def advance(self):
-        self.pos += 1
-        self.column += 1
-        if self.pos < len(self.text):
-            self.current_char = self.text[self.pos]
-        else:
-            self.current_char = None
-
-    def tokenize(self):
-        tokens = []
-        self.advance()
-
-        while self.current_char is not None:
-            if self.current_char.isspace():
-                if self.current_char == "\n":
-                    self.line += 1
-                    self.column = 0
-                self.advance()
-                continue
-
-            if self.current_char == "#":
-                comment = ""
-                start_column = self.column
-                while self.current_char is not None and self.current_char != "\n":
-                    comment += self.current_char
-                    self.advance()
-                tokens.append(Token("COMMENT", comment, self.line, start_column))
-                continue
-
-            if self.current_char in ['"', "'"] and self.pos + 2 < len(self.text) and self.text[self.pos:self.pos+3] in ['"""', "'''"]:
-                quote = self.text[self.pos:self.pos+3]
-                comment = quote
-                start_line = self.line
-                start_column = self.column
-                self.advance()
-                self.advance()
-                self.advance()
-                while self.current_char is not None and self.text[self.pos:self.pos+3] != quote:
-                    if self.current_char == "\n":
-                        self.line += 1
-                        self.column = 0
-                    comment += self.current_char
-                    self.advance()
-                if self.current_char is not None:
-                    comment += self.text[self.pos:self.pos+3]
-                    self.advance()
-                    self.advance()
-                    self.advance()
-                tokens.append(Token("COMMENT", comment, start_line, start_column))
-                continue
-
-            if self.current_char in self.operators:
-                op = self.current_char
-                start_column = self.column
-                self.advance()
-                if self.current_char is not None and op + self.current_char in self.operators:
-                    op += self.current_char
-                    self.advance()
-                tokens.append(Token("OPERATOR", op, self.line, start_column))
-                continue
-
-            if self.current_char.isalpha() or self.current_char == "_":
-                identifier = ""
-                start_column = self.column
-                while self.current_char is not None and (self.current_char.isalnum() or self.current_char == "_"):
-                    identifier += self.current_char
-                    self.advance()
-                if identifier in self.literals:
-                    token_type = "LITERAL"
-                elif identifier in self.keywords:
-                    token_type = "KEYWORD"
-                else:
-                    token_type = "IDENTIFIER"
-                tokens.append(Token(token_type, identifier, self.line, start_column))
-                continue
-
-            if self.current_char.isdigit():
-                number = ""
-                start_column = self.column
-                is_float = False
-                while self.current_char is not None and (self.current_char.isdigit() or self.current_char == "."):
-                    if self.current_char == ".":
-                        if is_float:
-                            tokens.append(Token("ERROR", number, self.line, start_column))
-                            break
-                        is_float = True
-                    number += self.current_char
-                    self.advance()
-                tokens.append(Token("NUMBER", number, self.line, start_column))
-                continue
-
-            if self.current_char in ['"', "'"]:
-                tokens.extend(self.tokenize_string())
-                continue
-
-            # Hatalı karakter
-            tokens.append(Token("ERROR", self.current_char, self.line, self.column))
-            self.advance()
-
-        return tokens
-
-    def tokenize_string(self):
-        quote = self.current_char
-        string = ""
-        start_line = self.line
-        start_column = self.column
-        is_f_string = self.pos > 0 and self.text[self.pos - 1].lower() == 'f'
-        string += quote
-        self.advance()
-        tokens = []
-        while self.current_char is not None:
-            if self.current_char == quote and self.text[self.pos:self.pos+2] != quote * 2:
-                string += self.current_char
-                self.advance()
-                tokens.append(Token("FSTRING" if is_f_string else "STRING", string, start_line, start_column))
-                return tokens
-            if is_f_string and self.current_char == "{":
-                if string:
-                    tokens.append(Token("FSTRING", string, start_line, start_column))
-                    string = ""
-                    start_line = self.line
-                    start_column = self.column
-                self.advance()
-                expr = ""
-                brace_count = 1
-                while self.current_char is not None and brace_count > 0:
-                    if self.current_char == "\n":
-                        self.line += 1
-                        self.column = 0
-                    if self.current_char == "{":
-                        brace_count += 1
-                    elif self.current_char == "}":
-                        brace_count -= 1
-                    expr += self.current_char
-                    self.advance()
-                if brace_count == 0 and self.current_char is not None:
-                    tokens.append(Token("FSTRING_EXPR", "{" + expr, start_line, start_column))
-                else:
-                    tokens.append(Token("ERROR", "{" + expr, start_line, start_column))
-                continue
-            if self.current_char == "\n":
-                self.line += 1
-                self.column = 0
-            string += self.current_char
-            self.advance()
-        # Kapanmamış dize için hata token'ı
-        tokens.append(Token("ERROR", string, start_line, start_column))
-        return tokens
-
-class Parser:
-    def __init__(self, tokens):
-        self.tokens = tokens
-        self.pos = 0
-        self.current_token = self.tokens[0] if self.tokens else None
-        self.max_iterations = 10000  # Sonsuz döngü önleme
-
-    def advance(self):
-        self.pos += 1
-        if self.pos < len(self.tokens):
-            self.current_token = self.tokens[self.pos]
-        else:
-            self.current_token = None
-
-    def peek(self):
-        return self.tokens[self.pos + 1] if self.pos + 1 < len(self.tokens) else None
-
-    def expect(self, token_type, value=None):
-        if self.current_token and self.current_token.type == token_type and (value is None or self.current_token.value == value):
-            self.advance()
-        else:
-            self.advance()  # Hata toleransı için devam et
-
-    def parse(self):
-        statements = []
-        iteration_count = 0
-        while self.current_token is not None and iteration_count < self.max_iterations:
-            statements.append(self.parse_statement())
-            iteration_count += 1
-        if iteration_count >= self.max_iterations:
-            print("Parser: Maksimum iterasyon sınırına ulaşıldı.")
-        return statements
-
-    def parse_statement(self):
-        if self.current_token and self.current_token.type == "KEYWORD":
-            if self.current_token.value == "def":
-                return self.parse_function_def()
-            elif self.current_token.value == "async":
-                return self.parse_async_stmt()
-            elif self.current_token.value == "if":
-                return self.parse_if_stmt()
-            elif self.current_token.value == "for":
-                return self.parse_for_stmt()
-            elif self.current_token.value == "while":
-                return self.parse_while_stmt()
-            elif self.current_token.value == "try":
-                return self.parse_try_stmt()
-            elif self.current_token.value == "class":
-                return self.parse_class_def()
-            elif self.current_token.value == "import":
-                return self.parse_import_stmt()
-            elif self.current_token.value == "from":
-                return self.parse_from_stmt()
-            elif self.current_token.value == "with":
-                return self.parse_with_stmt()
-            elif self.current_token.value == "match":
-                return self.parse_match_stmt()
-            elif self.current_token.value in ["break", "continue", "pass", "return", "raise", "yield"]:
-                return self.parse_control_stmt()
-            elif self.current_token.value == "global":
-                return self.parse_global_stmt()
-            elif self.current_token.value == "nonlocal":
-                return self.parse_nonlocal_stmt()
-            elif self.current_token.value == "assert":
-                return self.parse_assert_stmt()
-            elif self.current_token.value == "del":
-                return self.parse_del_stmt()
-        elif self.current_token and self.current_token.type == "IDENTIFIER":
-            return self.parse_assignment()
-        elif self.current_token and self.current_token.type == "COMMENT":
-            comment = self.current_token.value
-            self.advance()
-            return ("COMMENT", comment)
-        elif self.current_token and self.current_token.type == "ERROR":
-            error = self.current_token.value
-            self.advance()
-            return ("ERROR", error)
-        else:
-            return self.parse_expression_stmt()
-
-    def parse_function_def(self):
-        decorators = []
-        while self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == "@":
-            decorators.append(self.parse_decorator())
-        is_async = False
-        if self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "async":
-            self.expect("KEYWORD", "async")
-            is_async = True
-        self.expect("KEYWORD", "def")
-        identifier = self.current_token.value if self.current_token and self.current_token.type == "IDENTIFIER" else ""
-        self.expect("IDENTIFIER")
-        self.expect("OPERATOR", "(")
-        params = self.parse_param_list()
-        self.expect("OPERATOR", ")")
-        self.expect("OPERATOR", ":")
-        suite = self.parse_suite()
-        return ("FUNCTION_DEF", identifier, params, suite, decorators, is_async)
-
-    def parse_decorator(self):
-        self.expect("OPERATOR", "@")
-        identifier = self.current_token.value if self.current_token and self.current_token.type == "IDENTIFIER" else ""
-        self.expect("IDENTIFIER")
-        return ("DECORATOR", identifier)
-
-    def parse_param_list(self):
-        params = []
-        iteration_count = 0
-        while self.current_token and self.current_token.type == "IDENTIFIER" and iteration_count < self.max_iterations:
-            params.append(self.current_token.value)
-            self.expect("IDENTIFIER")
-            if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ",":
-                self.expect("OPERATOR", ",")
-            else:
-                break
-            iteration_count += 1
-        return params
-
-    def parse_suite(self):
-        statements = []
-        self.expect("OPERATOR", ":")
-        iteration_count = 0 
-        while self.current_token and iteration_count < self.max_iterations:
-            if self.current_token.type == "KEYWORD" and self.current_token.value in ["elif", "else", "except", "finally"]:
-                break  # Suite'i sonlandır
-            statements.append(self.parse_statement())
-            iteration_count += 1
-        return statements
-
-    def parse_async_stmt(self):
-        self.expect("KEYWORD", "async")
-        if self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "def":
-            return self.parse_function_def()
-        elif self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "with":
-            return self.parse_with_stmt()
-        elif self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "for":
-            return self.parse_for_stmt()
-        else:
-            return ("ASYNC_STMT", None)
-
-    def parse_if_stmt(self):
-        self.expect("KEYWORD", "if")
-        expression = self.parse_expression()
-        self.expect("OPERATOR", ":")
-        suite = self.parse_suite()
-        elif_stmts = []
-        while self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "elif":
-            self.expect("KEYWORD", "elif")
-            elif_expr = self.parse_expression()
-            self.expect("OPERATOR", ":")
-            elif_suite = self.parse_suite()
-            elif_stmts.append(("ELIF", elif_expr, elif_suite))
-        else_suite = None
-        if self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "else":
-            self.expect("KEYWORD", "else")
-            self.expect("OPERATOR", ":")
-            else_suite = self.parse_suite()
-        return ("IF_STMT", expression, suite, elif_stmts, else_suite)
-
-    def parse_for_stmt(self):
-        is_async = False
-        if self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "async":
-            self.expect("KEYWORD", "async")
-            is_async = True
-        self.expect("KEYWORD", "for")
-        identifier = self.current_token.value if self.current_token and self.current_token.type == "IDENTIFIER" else ""
-        self.expect("IDENTIFIER")
-        self.expect("KEYWORD", "in")
-        expression = self.parse_expression()
-        self.expect("OPERATOR", ":")
-        suite = self.parse_suite()
-        return ("FOR_STMT", identifier, expression, suite, is_async)
-
-    def parse_while_stmt(self):
-        self.expect("KEYWORD", "while")
-        expression = self.parse_expression()
-        self.expect("OPERATOR", ":")
-        suite = self.parse_suite()
-        return ("WHILE_STMT", expression, suite)
-
-    def parse_try_stmt(self):
-        self.expect("KEYWORD", "try")
-        self.expect("OPERATOR", ":")
-        try_suite = self.parse_suite()
-        except_stmts = []
-        while self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "except":
-            self.expect("KEYWORD", "except")
-            self.expect("OPERATOR", ":")
-            except_suite = self.parse_suite()
-            except_stmts.append(("EXCEPT", except_suite))
-        finally_suite = None
-        if self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "finally":
-            self.expect("KEYWORD", "finally")
-            self.expect("OPERATOR", ":")
-            finally_suite = self.parse_suite()
-        return ("TRY_STMT", try_suite, except_stmts, finally_suite)
-
-    def parse_class_def(self):
-        self.expect("KEYWORD", "class")
-        identifier = self.current_token.value if self.current_token and self.current_token.type == "IDENTIFIER" else ""
-        self.expect("IDENTIFIER")
-        bases = []
-        if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == "(":
-            self.expect("OPERATOR", "(")
-            if self.current_token and self.current_token.type == "IDENTIFIER":
-                bases.append(self.current_token.value)
-                self.expect("IDENTIFIER")
-                while self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ",":
-                    self.expect("OPERATOR", ",")
-                    if self.current_token and self.current_token.type == "IDENTIFIER":
-                        bases.append(self.current_token.value)
-                        self.expect("IDENTIFIER")
-            self.expect("OPERATOR", ")")
-        self.expect("OPERATOR", ":")
-        suite = self.parse_suite()
-        return ("CLASS_DEF", identifier, bases, suite)
-
-    def parse_import_stmt(self):
-        self.expect("KEYWORD", "import")
-        identifiers = []
-        if self.current_token and self.current_token.type == "IDENTIFIER":
-            identifiers.append(self.current_token.value)
-            self.expect("IDENTIFIER")
-            while self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ",":
-                self.expect("OPERATOR", ",")
-                if self.current_token and self.current_token.type == "IDENTIFIER":
-                    identifiers.append(self.current_token.value)
-                    self.expect("IDENTIFIER")
-        return ("IMPORT_STMT", identifiers)
-
-    def parse_from_stmt(self):
-        self.expect("KEYWORD", "from")
-        module = self.current_token.value if self.current_token and self.current_token.type == "IDENTIFIER" else ""
-        self.expect("IDENTIFIER")
-        self.expect("KEYWORD", "import")
-        identifiers = []
-        if self.current_token and self.current_token.type == "IDENTIFIER":
-            identifiers.append(self.current_token.value)
-            self.expect("IDENTIFIER")
-            while self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ",":
-                self.expect("OPERATOR", ",")
-                if self.current_token and self.current_token.type == "IDENTIFIER":
-                    identifiers.append(self.current_token.value)
-                    self.expect("IDENTIFIER")
-        return ("FROM_IMPORT_STMT", module, identifiers)
-
-    def parse_with_stmt(self):
-        is_async = False
-        if self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "async":
-            self.expect("KEYWORD", "async")
-            is_async = True
-        self.expect("KEYWORD", "with")
-        expression = self.parse_expression()
-        identifier = None
-        if self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "as":
-            self.expect("KEYWORD", "as")
-            identifier = self.current_token.value if self.current_token and self.current_token.type == "IDENTIFIER" else ""
-            self.expect("IDENTIFIER")
-        self.expect("OPERATOR", ":")
-        suite = self.parse_suite()
-        return ("WITH_STMT", expression, identifier, suite, is_async)
-
-    def parse_match_stmt(self):
-        self.expect("KEYWORD", "match")
-        expression = self.parse_expression()
-        self.expect("OPERATOR", ":")
-        cases = []
-        iteration_count = 0
-        while self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "case" and iteration_count < self.max_iterations:
-            self.expect("KEYWORD", "case")
-            pattern = self.parse_pattern()
-            self.expect("OPERATOR", ":")
-            suite = self.parse_suite()
-            cases.append(("CASE", pattern, suite))
-            iteration_count += 1
-        return ("MATCH_STMT", expression, cases)
-
-    def parse_pattern(self):
-        if self.current_token and self.current_token.type in ["NUMBER", "STRING", "FSTRING"]:
-            value = self.current_token.value
-            self.advance()
-            return ("LITERAL", value)
-        elif self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value in ["True", "False", "None"]:
-            value = self.current_token.value
-            self.advance()
-            return ("LITERAL", value)
-        elif self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == "[":
-            self.expect("OPERATOR", "[")
-            patterns = self.parse_pattern_list()
-            self.expect("OPERATOR", "]")
-            return ("LIST_PATTERN", patterns)
-        elif self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == "{":
-            self.expect("OPERATOR", "{")
-            items = self.parse_dict_pattern_list()
-            self.expect("OPERATOR", "}")
-            return ("DICT_PATTERN", items)
-        elif self.current_token and self.current_token.type == "IDENTIFIER":
-            value = self.current_token.value
-            self.expect("IDENTIFIER")
-            return ("IDENTIFIER", value)
-        else:
-            return ("PATTERN", None)
-
-    def parse_pattern_list(self):
-        patterns = []
-        iteration_count = 0
-        while self.current_token and (self.current_token.type not in ["OPERATOR"] or self.current_token.value != "]") and iteration_count < self.max_iterations:
-            patterns.append(self.parse_pattern())
-            if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ",":
-                self.expect("OPERATOR", ",")
-            else:
-                break
-            iteration_count += 1
-        return patterns
-
-    def parse_dict_pattern_list(self):
-        items = []
-        iteration_count = 0
-        while self.current_token and (self.current_token.type not in ["OPERATOR"] or self.current_token.value != "}") and iteration_count < self.max_iterations:
-            key = self.parse_pattern()
-            self.expect("OPERATOR", ":")
-            value = self.parse_pattern()
-            items.append((key, value))
-            if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ",":
-                self.expect("OPERATOR", ",")
-            else:
-                break
-            iteration_count += 1
-        return items
-
-    def parse_control_stmt(self):
-        control_type = self.current_token.value
-        self.expect("KEYWORD", control_type)
-        if control_type in ["return", "yield"]:
-            expr = self.parse_expression() if self.current_token and self.current_token.type != "OPERATOR" else None
-            return (control_type.upper() + "_STMT", expr)
-        elif control_type == "raise":
-            expr = self.parse_expression()
-            return ("RAISE_STMT", expr)
-        else:  # break, continue, pass
-            return (control_type.upper() + "_STMT", None)
-
-    def parse_global_stmt(self):
-        self.expect("KEYWORD", "global")
-        identifiers = []
-        iteration_count = 0
-        while self.current_token and self.current_token.type == "IDENTIFIER" and iteration_count < self.max_iterations:
-            identifiers.append(self.current_token.value)
-            self.expect("IDENTIFIER")
-            if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ",":
-                self.expect("OPERATOR", ",")
-            else:
-                break
-            iteration_count += 1
-        return ("GLOBAL_STMT", identifiers)
-
-    def parse_nonlocal_stmt(self):
-        self.expect("KEYWORD", "nonlocal")
-        identifiers = []
-        iteration_count = 0
-        while self.current_token and self.current_token.type == "IDENTIFIER" and iteration_count < self.max_iterations:
-            identifiers.append(self.current_token.value)
-            self.expect("IDENTIFIER")
-            if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ",":
-                self.expect("OPERATOR", ",")
-            else:
-                break
-            iteration_count += 1
-        return ("NONLOCAL_STMT", identifiers)
-
-    def parse_assert_stmt(self):
-        self.expect("KEYWORD", "assert")
-        expr = self.parse_expression()
-        msg = None
-        if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ",":
-            self.expect("OPERATOR", ",")
-            msg = self.parse_expression()
-        return ("ASSERT_STMT", expr, msg)
-
-    def parse_del_stmt(self):
-        self.expect("KEYWORD", "del")
-        targets = self.parse_target_list()
-        return ("DEL_STMT", targets)
-
-    def parse_assignment(self):
-        targets = self.parse_target_list()
-        if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value in ["=", ":="]:
-            op = self.current_token.value
-            self.expect("OPERATOR", op)
-            expressions = self.parse_expression_list()
-            return ("ASSIGNMENT", targets, op, expressions)
-        else:
-            return ("ASSIGNMENT", targets, None, [])
-
-    def parse_target_list(self):
-        targets = []
-        iteration_count = 0
-        while self.current_token and self.current_token.type == "IDENTIFIER" and iteration_count < self.max_iterations:
-            targets.append(self.current_token.value)
-            self.expect("IDENTIFIER")
-            if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ",":
-                self.expect("OPERATOR", ",")
-            else:
-                break
-            iteration_count += 1
-        if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value in ["(", "["]:
-            delim = self.current_token.value
-            self.expect("OPERATOR", delim)
-            targets = self.parse_target_list()
-            self.expect("OPERATOR", "]" if delim == "[" else ")")
-        return targets
-
-    def parse_fstring_expr(self):
-        if self.current_token and self.current_token.type == "FSTRING_EXPR":
-            expr_value = self.current_token.value[1:-1]
-            self.advance()
-            temp_lexer = Lexer()
-            temp_lexer.set_text(expr_value)
-            temp_tokens = temp_lexer.tokenize()
-            temp_parser = Parser(temp_tokens)
-            expr = temp_parser.parse_expression()
-            return ("FSTRING_EXPR", expr)
-        return None
-
-    def parse_expression(self):
-        expr = self.parse_if_expr()
-        while self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ".":
-            self.expect("OPERATOR", ".")
-            if self.current_token and self.current_token.type == "IDENTIFIER":
-                attr = self.current_token.value
-                self.expect("IDENTIFIER")
-                expr = ("ATTRIBUTE", expr, attr)
-            else:
-                break
-        return expr
-
-    def parse_if_expr(self):
-        expr = self.parse_logical_or_expr()
-        if self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "if":
-            self.expect("KEYWORD", "if")
-            cond = self.parse_logical_or_expr()
-            if self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "else":
-                self.expect("KEYWORD", "else")
-                else_expr = self.parse_if_expr()
-                return ("IF_EXPR", expr, cond, else_expr)
-        return expr
-
-    def parse_logical_or_expr(self):
-        expr = self.parse_logical_and_expr()
-        iteration_count = 0
-        while self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "or" and iteration_count < self.max_iterations:
-            self.expect("KEYWORD", "or")
-            right = self.parse_logical_and_expr()
-            expr = ("LOGICAL_OR", expr, right)
-            iteration_count += 1
-        return expr
-
-    def parse_logical_and_expr(self):
-        expr = self.parse_not_expr()
-        iteration_count = 0
-        while self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "and" and iteration_count < self.max_iterations:
-            self.expect("KEYWORD", "and")
-            right = self.parse_not_expr()
-            expr = ("LOGICAL_AND", expr, right)
-            iteration_count += 1
-        return expr
-
-    def parse_not_expr(self):
-        if self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "not":
-            self.expect("KEYWORD", "not")
-            expr = self.parse_not_expr()
-            return ("NOT", expr)
-        return self.parse_comparison()
-
-    def parse_comparison(self):
-        expr = self.parse_bitwise_or_expr()
-        iteration_count = 0
-        while self.current_token and (
-            (self.current_token.type == "KEYWORD" and self.current_token.value in ["in", "is"]) or
-            (self.current_token.type == "OPERATOR" and self.current_token.value in ["<", ">", "==", ">=", "<=", "!="])
-        ) and iteration_count < self.max_iterations:
-            if self.current_token.type == "KEYWORD" and self.current_token.value == "in":
-                peek_token = self.peek()
-                if peek_token and peek_token.type == "KEYWORD" and peek_token.value == "not":
-                    self.expect("KEYWORD", "in")
-                    self.expect("KEYWORD", "not")
-                    right = self.parse_bitwise_or_expr()
-                    expr = ("NOT_IN", expr, right)
-                else:
-                    self.expect("KEYWORD", "in")
-                    right = self.parse_bitwise_or_expr()
-                    expr = ("IN", expr, right)
-            elif self.current_token.type == "KEYWORD" and self.current_token.value == "is":
-                peek_token = self.peek()
-                if peek_token and peek_token.type == "KEYWORD" and peek_token.value == "not":
-                    self.expect("KEYWORD", "is")
-                    self.expect("KEYWORD", "not")
-                    right = self.parse_bitwise_or_expr()
-                    expr = ("IS_NOT", expr, right)
-                else:
-                    self.expect("KEYWORD", "is")
-                    right = self.parse_bitwise_or_expr()
-                    expr = ("IS", expr, right)
-            else:
-                op = self.current_token.value
-                self.advance()
-                right = self.parse_bitwise_or_expr()
-                expr = ("COMPARISON", expr, op, right)
-            iteration_count += 1
-        return expr
-
-    def parse_bitwise_or_expr(self):
-        expr = self.parse_bitwise_xor_expr()
-        iteration_count = 0
-        while self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == "|" and iteration_count < self.max_iterations:
-            self.expect("OPERATOR", "|")
-            right = self.parse_bitwise_xor_expr()
-            expr = ("BITWISE_OR", expr, right)
-            iteration_count += 1
-        return expr
-
-    def parse_bitwise_xor_expr(self):
-        expr = self.parse_bitwise_and_expr()
-        iteration_count = 0
-        while self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == "^" and iteration_count < self.max_iterations:
-            self.expect("OPERATOR", "^")
-            right = self.parse_bitwise_and_expr()
-            expr = ("BITWISE_XOR", expr, right)
-            iteration_count += 1
-        return expr
-
-    def parse_bitwise_and_expr(self):
-        expr = self.parse_shift_expr()
-        iteration_count = 0
-        while self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == "&" and iteration_count < self.max_iterations:
-            self.expect("OPERATOR", "&")
-            right = self.parse_shift_expr()
-            expr = ("BITWISE_AND", expr, right)
-            iteration_count += 1
-        return expr
-
-    def parse_shift_expr(self):
-        expr = self.parse_arith_expr()
-        iteration_count = 0
-        while self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value in ["<<", ">>"] and iteration_count < self.max_iterations:
-            op = self.current_token.value
-            self.expect("OPERATOR", op)
-            right = self.parse_arith_expr()
-            expr = ("SHIFT", expr, op, right)
-            iteration_count += 1
-        return expr
-
-    def parse_arith_expr(self):
-        expr = self.parse_term()
-        iteration_count = 0
-        while self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value in ["+", "-"] and iteration_count < self.max_iterations:
-            op = self.current_token.value
-            self.expect("OPERATOR", op)
-            right = self.parse_term()
-            expr = ("ARITH", expr, op, right)
-            iteration_count += 1
-        return expr
-
-    def parse_term(self):
-        expr = self.parse_factor()
-        iteration_count = 0
-        while self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value in ["*", "/", "//", "%"] and iteration_count < self.max_iterations:
-            op = self.current_token.value
-            self.expect("OPERATOR", op)
-            right = self.parse_factor()
-            expr = ("TERM", expr, op, right)
-            iteration_count += 1
-        return expr
-
-    def parse_factor(self):
-        if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value in ["+", "-", "~"]:
-            op = self.current_token.value
-            self.expect("OPERATOR", op)
-            expr = self.parse_factor()
-            return ("UNARY", op, expr)
-        return self.parse_power()
-
-    def parse_power(self):
-        expr = self.parse_primary()
-        if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == "**":
-            self.expect("OPERATOR", "**")
-            right = self.parse_factor()
-            expr = ("POWER", expr, right)
-        return expr
-
-    def parse_primary(self):
-        if self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "lambda":
-            return self.parse_lambda_expr()
-        elif self.current_token and self.current_token.type in ["NUMBER", "STRING", "FSTRING"]:
-            value = self.current_token.value
-            self.advance()
-            return ("LITERAL", value)
-        elif self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value in ["True", "False", "None"]:
-            value = self.current_token.value
-            self.advance()
-            return ("LITERAL", value)
-        elif self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == "[":
-            self.expect("OPERATOR", "[")
-            peek_token = self.peek()
-            if peek_token and peek_token.type == "KEYWORD" and peek_token.value == "for":
-                comp = self.parse_comprehension()
-                self.expect("OPERATOR", "]")
-                return ("LIST_COMP", comp)
-            exprs = self.parse_expression_list()
-            self.expect("OPERATOR", "]")
-            return ("LIST", exprs)
-        elif self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == "{":
-            self.expect("OPERATOR", "{")
-            peek_token = self.peek()
-            if peek_token and peek_token.type == "OPERATOR" and peek_token.value == ":":
-                items = self.parse_dict_item_list()
-                self.expect("OPERATOR", "}")
-                return ("DICT", items)
-            elif peek_token and peek_token.type == "KEYWORD" and peek_token.value == "for":
-                comp = self.parse_dict_comprehension()
-                self.expect("OPERATOR", "}")
-                return ("DICT_COMP", comp)
-            else:
-                exprs = self.parse_expression_list()
-                self.expect("OPERATOR", "}")
-                return ("SET", exprs)
-        elif self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == "(":
-            self.expect("OPERATOR", "(")
-            if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ")":
-                self.expect("OPERATOR", ")")
-                return ("TUPLE", [])
-            expr = self.parse_expression()
-            if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ",":
-                self.expect("OPERATOR", ",")
-                exprs = [expr] + self.parse_expression_list()
-                self.expect("OPERATOR", ")")
-                return ("TUPLE", exprs)
-            self.expect("OPERATOR", ")")
-            return expr
-        elif self.current_token and self.current_token.type == "IDENTIFIER":
-            identifier = self.current_token.value
-            self.advance()
-            if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == "(":
-                self.expect("OPERATOR", "(")
-                args = self.parse_expression_list()
-                self.expect("OPERATOR", ")")
-                return ("CALL", identifier, args)
-            return ("IDENTIFIER", identifier)
-        elif self.current_token and self.current_token.type == "ERROR":
-            value = self.current_token.value
-            self.advance()
-            return ("ERROR", value)
-        else:
-            return ("EXPRESSION", None)
-
-    def parse_lambda_expr(self):
-        self.expect("KEYWORD", "lambda")
-        params = self.parse_param_list()
-        self.expect("OPERATOR", ":")
-        expr = self.parse_expression()
-        return ("LAMBDA", params, expr)
-
-    def parse_comprehension(self):
-        expr = self.parse_expression()
-        self.expect("KEYWORD", "for")
-        identifier = self.current_token.value if self.current_token and self.current_token.type == "IDENTIFIER" else ""
-        self.expect("IDENTIFIER")
-        self.expect("KEYWORD", "in")
-        iterable = self.parse_expression()
-        conds = []
-        iteration_count = 0
-        while self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "if" and iteration_count < self.max_iterations:
-            self.expect("KEYWORD", "if")
-            conds.append(self.parse_expression())
-            iteration_count += 1
-        return ("COMP", expr, identifier, iterable, conds)
-
-    def parse_dict_comprehension(self):
-        key = self.parse_expression()
-        self.expect("OPERATOR", ":")
-        value = self.parse_expression()
-        self.expect("KEYWORD", "for")
-        identifier = self.current_token.value if self.current_token and self.current_token.type == "IDENTIFIER" else ""
-        self.expect("IDENTIFIER")
-        self.expect("KEYWORD", "in")
-        iterable = self.parse_expression()
-        conds = []
-        iteration_count = 0
-        while self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "if" and iteration_count < self.max_iterations:
-            self.expect("KEYWORD", "if")
-            conds.append(self.parse_expression())
-            iteration_count += 1
-        return ("DICT_COMP", key, value, identifier, iterable, conds)
-
-    def parse_expression_list(self):
-        exprs = []
-        iteration_count = 0
-        while self.current_token and (
-            self.current_token.type not in ["OPERATOR"] or
-            self.current_token.value not in ["]", ")", "}", ":"]
-        ) and iteration_count < self.max_iterations:
-            exprs.append(self.parse_expression())
-            if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ",":
-                self.expect("OPERATOR", ",")
-            else:
-                break
-            iteration_count += 1
-        return exprs
-
-    def parse_dict_item_list(self):
-        items = []
-        iteration_count = 0
-        while self.current_token and (self.current_token.type not in ["OPERATOR"] or self.current_token.value != "}") and iteration_count < self.max_iterations:
-            key = self.parse_expression()
-            self.expect("OPERATOR", ":")
-            value = self.parse_expression()
-            items.append((key, value))
-            if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ",":
-                self.expect("OPERATOR", ",")
-            else:
-                break
-            iteration_count += 1
-        return items
-
-    def parse_expression_stmt(self):
-        expr = self.parse_expression()
-        return ("EXPR_STMT", expr)
+def text_position(index):
+    """Tk'nin "satır.sütun" indeksini karşılaştırılabilir (satır, sütun) ikilisine çevirir."""
+    line, column = index.split(".")
+    return int(line), int(column)
 
 class SyntaxHighlighterGUI:
-    def __init__(self, root):
+    def __init__(self, root, background=False):
         self.root = root
         self.root.title("PySyntaxHighlight")
-        self.lexer = Lexer()
+        self.lexer = Lexer(engine="regex", compact=True)
         self.parser = None
+        self.parse_cache = ParseCache()  # Deyim sonuçları; geri alma ve yeniden açmada tekrar kullanılır
         self.is_dark_mode = False
         self.current_file = None
-        self.last_text = ""  # Performans için son metni sakla
-        self.last_changed_line = 0  # Son değişen satır
-
-        # Tema renkleri 
-        self.light_theme = {
-            "bg": "#FFFFFF",  # Beyaz zemin
-            "fg": "#000000",  # Siyah yazı
-            "keyword": "#0033A0",        # Koyu mavi
-            "operator": "#000000",       # Siyah
-            "number": "#D32F2F",         # Canlı kırmızı
-            "string": "#388E3C",         # Koyu yeşil
-            "fstring": "#388E3C",
-            "fstring_expr": "#00796B",   # Teal
-            "comment": "#9E9E9E",        # Gri
-            "identifier": "#000000",     # Siyah
-            "constant": "#6A1B9A",       # Mor
-            "error": "#C62828",          # Kırmızı
-            "decorator": "#EF6C00",      # Turuncu
-            "function_def": "#00695C",   # Camgöbeği
-            "class_def": "#1E88E5",      # Parlak mavi
-            "call": "#1565C0",           # Mavi ton
-            "lambda": "#00838F",         # Camgöbeği
-            "loop_var": "#512DA8",       # Mor
-            "conditional": "#3949AB",    # Koyu mavi
-            "parameter": "#5D4037",      # Kahverengi
-            "attribute": "#F57C00",      # Turuncu
-            "line_numbers_bg": "#F0F0F0",
-            "line_numbers_fg": "#888888"
-        }
-
-        self.dark_theme = {
-            "bg": "#1E1E1E",
-            "fg": "#D4D4D4",
-            "keyword": "#569CD6",        # Mavi
-            "operator": "#D4D4D4",       # Açık gri
-            "number": "#B5CEA8",         # Açık yeşil
-            "string": "#CE9178",         # Somon
-            "fstring": "#CE9178",
-            "fstring_expr": "#4EC9B0",   # Turkuaz
-            "comment": "#6A9955",        # Yumuşak yeşil
-            "identifier": "#D4D4D4",
-            "constant": "#C586C0",       # Mor
-            "error": "#F44747",          # Parlak kırmızı
-            "decorator": "#DCDCAA",      # Sarımsı
-            "function_def": "#DCDCAA",
-            "class_def": "#4EC9B0",      # Camgöbeği
-            "call": "#9CDCFE",           # Açık mavi
-            "lambda": "#569CD6",
-            "loop_var": "#C586C0",
-            "conditional": "#569CD6",
-            "parameter": "#9CDCFE",
-            "attribute": "#D7BA7D",      # Sarımsı
-            "line_numbers_bg": "#2D2D2D",
-            "line_numbers_fg": "#858585"
-        }
+        self.dirty = None  # Son geçişten beri birleştirilen düzenleme: yarı açık satır aralığı (ilk, eski bitiş, yeni bitiş)
+        self.dirty_chars = 0  # Aynı düzenlemelerin karakter sayısına net etkisi
+        self.edit = None  # before_edit()'in hesaplayıp after_edit()'in kaydedeceği düzenleme
+        self.document = PieceTable()  # Metin alanının vekil üzerinden eşitlenen kopyası
+        self.length = 0  # Son geçişteki metnin karakter sayısı
+        self.line_count = 1
+        self.semantic = {}  # Son ayrıştırmadan gelen semantic_tags() çıktısı
+        self.semantic_tokens = None  # semantic'in konumlarının ait olduğu token dizisi
+        self.needs_parse = False  # Token'lar son ayrıştırmadan sonra değişti mi
+        self.pending = set()  # Henüz renklendirilmemiş satır blokları
+        self.highlight_job = None  # Boşta çalışan vurgulama adımının kimliği
+        self.generation = 0  # Her düzenlemede artar; eski nesle ait işçi sonuçları atılır
+        self.workers = {}  # "thread" / "process" -> yürütücü (ilk kullanımda oluşturulur)
+        self.worker_job = None  # (nesil, Future) - bekleyen işçi işi
+        self.worker_ranges = None  # İşçiden gelen TagRanges; None ise ana iş parçacığında hesaplanır
+        self.worker_edit = None  # worker_ranges'in metninden beri birleşik (ilk satır, eski bitiş, yeni bitiş)
+        self.load_source = None  # Parça parça yüklenen büyük dosyanın (dosya, mmap, artımlı UTF-8 çözücü); yükleme yoksa None
+        self.load_position = 0  # mmap'ten çözülüp metin alanına eklenmiş bayt sayısı
+        self.load_end = 0  # Sondaki satır sonları hariç yüklenecek bayt sayısı
+        self.load_lexing = False  # Yüklenen parçalar ana lexer'a da veriliyor mu (arka plan kipinde değil)
+        self.load_job = None  # Boşta çalışan yükleme adımının kimliği
+        self.gutter_view = None  # Kenar çubuğunun son çizildiği (ilk satır, son satır, ilk satırın y'si, yükseklik)
+        self.gutter_items = []  # Yeniden kullanılan numara öğeleri; fazlası boş metinle gizlenir
+        self.gutter_job = None  # Boşta çalışan kenar çubuğu güncellemesinin kimliği
+        self.pass_times = deque(maxlen=PASS_HISTORY)  # Son vurgulama geçişlerinin süreleri (saniye)
+        self.highlight_delay = DEBOUNCE_MIN_MS  # schedule_highlight()'ın son seçtiği gecikme (ms)
+        self.stats = PassStats()  # Geçiş başına aşama süreleri ve sayaçlar; varsayılan olarak kapalı
+        self.save_executor = None  # Kaydetme ve önbellek yazımlarının iş parçacığı; bkz. writer()
+        self.save_jobs = []  # (yol, Future, farklı kaydet mi) - sırayla yazılan kaydetme işleri
+        self.token_cache = TokenCache()  # Açılan dosyaların token'ları ve rolleri (~/.cache altında)
+        self.cache_text = None  # Tamamı ayrıştırılınca disk önbelleğine yazılacak dosya metni
+
+        # Tema renkleri
+        self.light_theme = LIGHT_THEME
+        self.dark_theme = DARK_THEME
 
         self.current_theme = self.light_theme
 
@@ -992,12 +158,23 @@ class SyntaxHighlighterGUI:
         self.file_menu.add_command(label="Kaydet", command=self.save_file)
         self.file_menu.add_command(label="Farklı Kaydet", command=self.save_file_as)
         self.menubar.add_command(label="Tema Değiştir", command=self.toggle_theme)
-
-        # Satır numaraları için metin alanı
-        self.line_numbers = tk.Text(self.main_frame, width=4, padx=3, takefocus=0, border=0,
-                                   background=self.current_theme["line_numbers_bg"],
-                                   foreground=self.current_theme["line_numbers_fg"],
-                                   state='disabled')
+        self.settings_menu = tk.Menu(self.menubar, tearoff=0)
+        self.menubar.add_cascade(label="Ayarlar", menu=self.settings_menu)
+        self.background_var = tk.BooleanVar(value=background)
+        self.settings_menu.add_checkbutton(label="Arka Planda Vurgula", variable=self.background_var,
+                                           command=self.toggle_background)
+        self.settings_menu.add_separator()
+        self.stats_var = tk.BooleanVar(value=False)
+        self.settings_menu.add_checkbutton(label="Ölçümleri Kaydet", variable=self.stats_var,
+                                           command=self.toggle_stats)
+        self.settings_menu.add_command(label="Ölçümleri Göster", command=self.show_stats)
+        self.settings_menu.add_command(label="Ölçümleri JSON Olarak Kaydet", command=self.dump_stats)
+        self.settings_menu.add_command(label=f"Sonraki {PROFILE_PASSES} Geçişi Profille",
+                                       command=self.start_profile)
+
+        # Satır numaraları için tuval; yalnızca görünür satırların numaraları çizilir
+        self.line_numbers = tk.Canvas(self.main_frame, width=0, takefocus=0, border=0, highlightthickness=0,
+                                      background=self.current_theme["line_numbers_bg"])
         self.line_numbers.pack(side=tk.LEFT, fill=tk.Y)
 
         # Metin alanı ve kaydırma çubuğu
@@ -1005,43 +182,38 @@ class SyntaxHighlighterGUI:
                                  fg=self.current_theme["fg"], insertbackground=self.current_theme["fg"],
                                  wrap=tk.NONE)
         self.text_area.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.gutter_font = font.Font(font=self.text_area.cget("font"))
 
         self.scrollbar = tk.Scrollbar(self.main_frame, orient=tk.VERTICAL)
         self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
         # Metin alanı ve satır numaralarını kaydırma çubuğuyla bağla
         self.text_area.config(yscrollcommand=self.sync_scroll)
-        self.line_numbers.config(yscrollcommand=self.line_numbers.yview)
         self.scrollbar.config(command=self.on_scrollbar)
 
         # Renk ayarları
         self.update_tag_configurations()
+        self.tag_batcher = TagBatcher(self.text_area)
+        self.intercept_edits()
 
         # Olay bağlamaları
+        # Vurgulama tuş olaylarına değil düzenlemelere bağlıdır: record_edit() her
+        # değişiklikte (yazma, fareyle yapıştırma, sürükle-bırak, geri alma) planlar
         self.highlight_timer = None
-        self.text_area.bind("<KeyRelease>", self.schedule_highlight)
         self.text_area.bind("<Return>", self.handle_return)
-        self.text_area.bind("<MouseWheel>", self.update_line_numbers)
-        self.text_area.bind("<Button-4>", self.update_line_numbers)  # Linux için
-        self.text_area.bind("<Button-5>", self.update_line_numbers)  # Linux için
+        self.text_area.bind("<Configure>", self.schedule_line_numbers)
 
         # Başlangıçta satır numaralarını güncelle
         self.update_line_numbers()
 
     def update_tag_configurations(self):
         """Metin alanı için tema renklerini günceller."""
-        token_types = [
-            "KEYWORD", "OPERATOR", "NUMBER", "STRING", "FSTRING", "FSTRING_EXPR",
-            "COMMENT", "IDENTIFIER", "CONSTANT", "ERROR", "DECORATOR",
-            "FUNCTION_DEF", "CLASS_DEF", "CALL", "LAMBDA", "LOOP_VAR",
-            "CONDITIONAL", "PARAMETER", "ATTRIBUTE"
-        ]
-        for token_type in token_types:
+        for token_type in TAG_NAMES:
             self.text_area.tag_configure(token_type, foreground=self.current_theme[token_type.lower()])
         self.text_area.config(bg=self.current_theme["bg"], fg=self.current_theme["fg"],
                             insertbackground=self.current_theme["fg"])
-        self.line_numbers.config(background=self.current_theme["line_numbers_bg"],
-                                foreground=self.current_theme["line_numbers_fg"])
+        self.line_numbers.config(background=self.current_theme["line_numbers_bg"])
+        self.line_numbers.itemconfigure("number", fill=self.current_theme["line_numbers_fg"])
         self.main_frame.config(bg=self.current_theme["bg"])
         
     def toggle_theme(self):
@@ -1052,220 +224,683 @@ class SyntaxHighlighterGUI:
         self.highlight_syntax()
         self.update_line_numbers()
 
+    def toggle_background(self):
+        """Lex ve ayrıştırmayı arka plan işçisine taşır veya ana iş parçacığına geri alır."""
+        self.generation += 1  # Bekleyen işçi sonucu artık uygulanmaz
+        if not self.background_var.get():
+            for executor in self.workers.values():
+                executor.shutdown(wait=False, cancel_futures=True)
+            self.workers = {}
+            self.worker_job = None
+            self.worker_edit = None
+            if self.worker_ranges is not None:
+                # Lexer işçi kipinde güncellenmedi; metni baştan parça parça tokenlaştır
+                self.worker_ranges = None
+                self.lexer.set_text("")
+                self.needs_parse = True
+        elif self.dirty is None and self.load_source is None:
+            # Ana iş parçacığındaki (belki yarım) model bırakılır; metnin tamamı işçiye gider
+            self.cancel_highlight_job()
+            self.lexer.set_text("")
+            self.pending = set()
+            self.submit_highlight(self.document.text())
+            return
+        self.highlight_syntax()
+
+    def toggle_stats(self):
+        """Geçiş ölçümlerinin kaydını açar veya kapatır."""
+        self.stats.enabled = self.stats_var.get()
+
+    def start_profile(self):
+        """Sonraki PROFILE_PASSES geçişi cProfile ile kaydeder; rapor ölçümlerde görünür."""
+        self.stats.start_profile(PROFILE_PASSES)
+        self.stats_var.set(True)
+
+    def show_stats(self):
+        """Ölçüm özetini salt okunur bir pencerede gösterir."""
+        window = tk.Toplevel(self.root)
+        window.title("Vurgulama Ölçümleri")
+        view = tk.Text(window, width=120, height=30, wrap=tk.NONE)
+        view.pack(fill=tk.BOTH, expand=True)
+        view.insert("1.0", self.stats.summary())
+        view.config(state='disabled')
+
+    def dump_stats(self):
+        """Ölçüm tamponunu JSON dosyasına yazar."""
+        file_path = filedialog.asksaveasfilename(defaultextension=".json",
+                                                 filetypes=[("JSON Dosyaları", "*.json"), ("Tüm Dosyalar", "*.*")])
+        if file_path:
+            try:
+                with open(file_path, 'w', encoding='utf-8') as file:
+                    file.write(self.stats.to_json())
+            except Exception as e:
+                messagebox.showerror("Hata", f"Ölçümler kaydedilemedi: {str(e)}")
+
+    def end_pass(self, tag_calls):
+        """Açık ölçüm geçişini token, deyim ve Tcl etiket çağrısı sayılarıyla kapatır."""
+        if self.stats.current is None:
+            return
+        self.stats.end(tokens=len(self.lexer.tokens),
+                       statements=len(self.parser.statements) if self.parser is not None else 0,
+                       tag_calls=self.tag_batcher.calls - tag_calls)
+
     def sync_scroll(self, *args):
-        """Metin alanı ve satır numaralarını senkronize eder."""
+        """Metin alanı ve satır numaralarını senkronize eder.
+
+        Tk görünüm her değiştiğinde (tekerlek, kaydırma çubuğu, klavye, düzenleme)
+        burayı çağırır; kenar çubuğu da yalnızca buradan izlenir."""
         self.scrollbar.set(*args)
+        self.update_line_numbers()
+        self.color_visible()  # Kaydırmayla açığa çıkan satırları renklendir
 
     def on_scrollbar(self, *args):
         """Kaydırma çubuğu hareket ettiğinde her iki widget'ı kaydırır."""
         self.text_area.yview(*args)
-        self.line_numbers.yview(*args)
 
-    def update_line_numbers(self, event=None):
-        self.line_numbers.config(state='normal')
-        self.line_numbers.delete("1.0", tk.END)
+    def visible_lines(self):
+        """Ekranda görünen ilk ve son satır numaralarını döndürür."""
         start_index = self.text_area.index("@0,0")
         end_index = self.text_area.index(f"@0,{self.text_area.winfo_height()}")
         start_line = int(start_index.split('.')[0])
         end_line = int(end_index.split('.')[0])
         total_lines = int(self.text_area.index("end-1c").split('.')[0])
-        end_line = min(end_line, total_lines)
-        line_numbers = "\n".join(str(i) for i in range(start_line, end_line + 1))
-        self.line_numbers.insert("1.0", line_numbers)
-        self.line_numbers.config(state='disabled')
+        return start_line, min(end_line, total_lines)
+
+    def update_line_numbers(self, event=None):
+        """Kenar çubuğunu görünür satırlara göre çizer.
+
+        İlk görünür satır, son satır ve görünür alanın yüksekliği değişmediyse hiçbir
+        şey yapılmaz. Çizimde tuval öğeleri silinmez; mevcut öğelerin yalnızca
+        değişen metni ve konumu güncellenir."""
+        self.gutter_job = None
+        start_line, end_line = self.visible_lines()
+        first = self.text_area.dlineinfo(f"{start_line}.0")
+        view = (start_line, end_line, first and first[1], self.text_area.winfo_height())
+        if view == self.gutter_view:
+            return
+        self.gutter_view = view
+        width = self.gutter_font.measure("9" * max(GUTTER_MIN_DIGITS, len(str(end_line)))) + 2 * GUTTER_PADDING
+        if int(self.line_numbers.cget("width")) != width:
+            self.line_numbers.config(width=width)
+        shown = 0
+        for line in range(start_line, end_line + 1):
+            info = self.text_area.dlineinfo(f"{line}.0")
+            if info is None:
+                continue  # Satır görünür alanın dışında kaldı
+            if shown == len(self.gutter_items):
+                self.gutter_items.append(self.line_numbers.create_text(
+                    0, 0, anchor=tk.NE, font=self.gutter_font, tags="number",
+                    fill=self.current_theme["line_numbers_fg"]))
+            item = self.gutter_items[shown]
+            self.line_numbers.coords(item, width - GUTTER_PADDING, info[1])
+            self.line_numbers.itemconfigure(item, text=str(line))
+            shown += 1
+        for item in self.gutter_items[shown:]:
+            self.line_numbers.itemconfigure(item, text="")
+
+    def schedule_line_numbers(self, event=None):
+        """Kenar çubuğu güncellemesini bir sonraki boşta adıma bırakır.
+
+        Görünüm oranları değişmeyen düzenlemeler (ör. kısa bir metne satır eklemek)
+        ve pencere boyutu değişiklikleri sync_scroll'u tetiklemez."""
+        if self.gutter_job is None:
+            self.gutter_job = self.root.after_idle(self.update_line_numbers)
 
     def handle_return(self, event):
         self.text_area.insert("insert", "\n")
         self.text_area.see("insert")
-        self.root.after(10, self.update_line_numbers)
-        self.last_changed_line = int(self.text_area.index("insert").split('.')[0])
         return "break"
 
+    def intercept_edits(self):
+        """Metin alanının Tcl komutunu, eklemeleri ve silmeleri kaydeden bir vekille değiştirir.
+
+        Tk'nin kendi tuş bağlamaları dahil her değişiklik bu komuttan geçer ve
+        self.document'e de uygulanır; vurgulama kirlenen satırları metin alanından
+        değil belgeden okur. Vekil bir Tcl yordamıdır: asıl komutun hataları Tk'nin
+        bağlamalarındaki catch bloklarına olduğu gibi ulaşır (ör. seçim yokken
+        Ctrl+X). Python yalnızca değişiklikten önce ve başarılı değişiklikten sonra çağrılır."""
+        widget = self.text_area._w
+        self.text_command = widget + "_asil"
+        self.text_area.tk.call("rename", widget, self.text_command)
+        before = self.text_area.register(self.before_edit)
+        after = self.text_area.register(self.after_edit)
+        self.text_area.tk.call("proc", widget, "operation args", f"""
+            if {{$operation in {{insert delete replace}}}} {{
+                {before} $operation {{*}}$args
+                set result [{self.text_command} $operation {{*}}$args]
+                {after}
+                return $result
+            }}
+            {self.text_command} $operation {{*}}$args
+        """)
+
+    def before_edit(self, operation, *args):
+        """Bir ekleme, silme veya değiştirmenin etkisini değişiklikten önce hesaplar."""
+        self.edit = None
+        try:
+            if str(self.text_area.cget("state")) == tk.NORMAL:
+                self.edit = self.edit_extent(operation, args)
+        except tk.TclError:
+            pass  # Geçersiz indeks: asıl komut da aynı hatayı verir ve çağırana ulaşır
+
+    def after_edit(self):
+        """Asıl komut başarılı olduysa before_edit()'in hesapladığı düzenlemeyi kaydeder."""
+        edit, self.edit = self.edit, None
+        if edit is not None:
+            self.record_edit(*edit)
+
+    def edit_extent(self, operation, args):
+        """Bir ekleme, silme veya değiştirme çağrısının etkisini değişiklikten önce hesaplar.
+
+        (ilk satır, eski bitiş, yeni bitiş, silinen ilk ofset, silinen son ofset,
+        eklenen metin) döndürür; satır ve ofset aralıkları yarı açıktır. Metni
+        değiştirmeyecek çağrılar için None döner."""
+        last = text_position(self.text_area.index("end-1c"))
+        start = min(text_position(self.text_area.index(args[0])), last)
+        if operation == "insert":
+            chars = "".join(args[1::2])
+            if not chars:
+                return None
+            offset = self.document.offset(*start)
+            return start[0], start[0] + 1, start[0] + 1 + chars.count("\n"), offset, offset, chars
+        stop = text_position(self.text_area.index(args[1] if len(args) > 1 else f"{args[0]}+1c"))
+        chars = "".join(args[2::2]) if operation == "replace" else ""
+        if stop > last and start < stop:
+            # Tk son satır sonunu silmez; "end"e kadar silinen tam satırlarda
+            # önceki satır sonu yeni son satır sonu olur ve o silinir
+            stop = last
+            if start[1] == 0 and start[0] > 1:
+                start = text_position(self.text_area.index(f"{start[0] - 1}.end"))
+        first = self.document.offset(*start)
+        last = self.document.offset(*stop) if start < stop else first
+        if first == last and not chars:
+            return None
+        return start[0], stop[0] + 1, start[0] + 1 + chars.count("\n"), first, last, chars
+
+    def record_edit(self, first_line, old_stop, new_stop, first, last, chars):
+        """Bir düzenlemeyi belgeye uygular ve son geçişten beri birikenlerle birleştirir."""
+        self.document.delete(first, last)
+        self.document.insert(first, chars)
+        self.dirty = merge_edits(self.dirty, (first_line, old_stop, new_stop))
+        self.dirty_chars += len(chars) - (last - first)
+        if new_stop != old_stop:
+            self.schedule_line_numbers()
+        self.schedule_highlight()
+
     def open_file(self):
         """Dosya açma işlemi."""
         file_path = filedialog.askopenfilename(filetypes=[("Python Dosyaları", "*.py"), ("Tüm Dosyalar", "*.*")])
         if file_path:
             try:
+                self.cancel_load()
+                if os.path.getsize(file_path) > LARGE_FILE_BYTES:
+                    self.load_large_file(file_path)
+                    return
                 with open(file_path, 'r', encoding='utf-8') as file:
                     content = file.read()
                     self.text_area.delete("1.0", tk.END)
                     self.text_area.insert("1.0", content)
+                    self.tag_batcher.reset()  # Silinen metinle birlikte tüm etiketler gitti
                     self.current_file = file_path
                     self.root.title(f"Python Sözdizimi Vurgulayıcı - {os.path.basename(file_path)}")
-                    self.last_text = ""  # Vurgulamayı zorla tetiklemek için sıfırla
-                    self.highlight_syntax()  # Vurgulamayı hemen uygula
+                    self.cache_text = None
+                    if self.background_var.get() or not self.restore_cached(content):
+                        self.highlight_syntax()  # Görünür alanı hemen, kalanını boşta renklendir
                     self.update_line_numbers()
             except Exception as e:
                     messagebox.showerror("Hata", f"Dosya açılamadı: {str(e)}")
 
+    def restore_cached(self, text):
+        """Açılan dosyanın token'larını ve anlamsal rollerini disk önbelleğinden yükler.
+
+        İsabette metin hiç tokenlaştırılmaz; ayrıştırıcı sonraki düzenlemeler için
+        boşta kurulur. Iskalamada metin, tamamı ayrıştırılınca önbelleğe yazılmak
+        üzere saklanır ve False döner."""
+        cached = self.token_cache.load(text)
+        if cached is None:
+            self.cache_text = text
+            return False
+        tokens, line_offsets, line_states, roles = cached
+        self.cancel_highlight_job()
+        self.take_edit()
+        self.lexer.restore(text, tokens, line_offsets, line_states)
+        self.parser = None
+        self.semantic = roles
+        self.semantic_tokens = tokens
+        self.needs_parse = True
+        self.pending = set(range(self.line_count // HIGHLIGHT_CHUNK_LINES + 1))
+        self.color_visible()
+        return True
+
+    def store_cache(self):
+        """Açıldığından beri düzenlenmemiş dosyanın tam ayrıştırmasını disk önbelleğine yazar.
+
+        Kayıt ana iş parçacığında baytlara çevrilir, dosyaya yazma kaydetme iş
+        parçacığında yapılır."""
+        text, self.cache_text = self.cache_text, None
+        if self.lexer.text != text:
+            return  # Dosya tamamen ayrıştırılmadan düzenlendi
+        data = self.token_cache.encode(self.lexer, self.semantic)
+        self.writer().submit(self.token_cache.store, text, data)
+
+    def load_large_file(self, file_path):
+        """Büyük dosyayı mmap ile açar ve boşta çalışan adımlarla parça parça yükler.
+
+        Eşlenmiş tampon satır sonunda biten dilimler halinde artımlı bir UTF-8
+        çözücüden geçirilir ve satır sonları her parçada ayrı ayrı normalleştirilir;
+        dosyanın tamamı hiçbir zaman tek bir bayt veya metin kopyası olarak çözülmez.
+        Her parça metin alanına (düzenleme vekili üzerinden belgeye de) eklenir ve
+        lexer'a tokenize_lines() ile verilir. Yükleme bitene kadar metin alanı salt okunurdur."""
+        file = open(file_path, 'rb')
+        try:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            file.close()
+            raise
+        # Sondaki satır sonları zaten vurgulanan ve kaydedilen metne girmez
+        end = len(mapped)
+        while end and mapped[end - 1] in b"\r\n":
+            end -= 1
+        self.generation += 1
+        self.cancel_highlight_job()
+        if self.highlight_timer:
+            self.root.after_cancel(self.highlight_timer)
+            self.highlight_timer = None
+        self.text_area.delete("1.0", tk.END)
+        self.tag_batcher.reset()
+        self.current_file = file_path
+        self.cache_text = None
+        self.pending = set()
+        self.needs_parse = False
+        self.worker_ranges = None
+        self.worker_edit = None
+        self.lexer.set_text("")
+        self.load_source = (file, mapped, codecs.getincrementaldecoder('utf-8')())
+        self.load_position = 0
+        self.load_end = end
+        # Arka plan kipinde işçi metnin tamamını alır; ana lexer kullanılmaz
+        self.load_lexing = not self.background_var.get()
+        self.text_area.config(state='disabled')
+        self.load_job = self.root.after_idle(self.load_step)
+
+    def load_step(self):
+        """mmap'in sıradaki dilimini çözüp metin alanına ekler, lexer'ı aynı parçayla
+        ilerletir ve ilerlemeyi başlıkta gösterir."""
+        self.load_job = None
+        _, mapped, decoder = self.load_source
+        position = self.load_position
+        # Dilim bir satır sonunda biter; "\r\n" iki parçaya bölünmez
+        stop = mapped.find(b"\n", position + LOAD_CHUNK_BYTES, self.load_end) + 1 or self.load_end
+        try:
+            chunk = decoder.decode(mapped[position:stop], stop == self.load_end)
+        except UnicodeDecodeError as e:
+            self.cancel_load()
+            self.text_area.delete("1.0", tk.END)
+            messagebox.showerror("Hata", f"Dosya açılamadı: {str(e)}")
+            return
+        if "\r" in chunk:
+            chunk = chunk.replace("\r\n", "\n").replace("\r", "\n")  # open()'ın evrensel satır sonları gibi
+        self.text_area.config(state='normal')
+        self.text_area.insert("end-1c", chunk)
+        self.text_area.config(state='disabled')
+        self.load_position = stop
+        if self.load_lexing:
+            self.lexer.tokenize_lines(chunk.count("\n") + 1, chunk)
+        if position == 0:
+            self.update_line_numbers()
+        if stop < self.load_end:
+            self.root.title(f"Python Sözdizimi Vurgulayıcı - {os.path.basename(self.current_file)}"
+                            f" (yükleniyor %{stop * 100 // self.load_end})")
+            self.load_job = self.root.after_idle(self.load_step)
+        else:
+            self.finish_load()
+
+    def close_load(self):
+        """Yüklemenin mmap'ini ve dosyasını kapatır."""
+        file, mapped, _ = self.load_source
+        self.load_source = None
+        mapped.close()
+        file.close()
+        self.text_area.config(state='normal')
+
+    def finish_load(self):
+        """Yüklenen metni her zamanki vurgulama akışına devreder."""
+        self.close_load()
+        self.root.title(f"Python Sözdizimi Vurgulayıcı - {os.path.basename(self.current_file)}")
+        self.update_line_numbers()
+        if self.background_var.get() or not self.load_lexing:
+            self.highlight_syntax()
+            return
+        # highlight_syntax()'in tam geçişi; metin zaten (neredeyse tamamen) tokenlaştırıldı
+        self.take_edit()
+        self.lexer.tokenize_lines(self.line_count)
+        self.parse_tokens()
+        self.color_visible()
+
+    def cancel_load(self):
+        """Süren büyük dosya yüklemesini bırakır."""
+        if self.load_job:
+            self.root.after_cancel(self.load_job)
+            self.load_job = None
+        if self.load_source is not None:
+            self.close_load()
+            self.lexer.set_text("")  # Yarım kalan metin artık belgenin öneki değil
+
     def save_file(self):
         """Dosya kaydetme işlemi."""
+        if self.load_source is not None:
+            messagebox.showinfo("Bilgi", "Dosya henüz yükleniyor.")
+            return
         if self.current_file:
-            try:
-                with open(self.current_file, 'w', encoding='utf-8') as file:
-                    file.write(self.text_area.get("1.0", tk.END).rstrip("\n"))
-                messagebox.showinfo("Başarılı", "Dosya kaydedildi.")
-            except Exception as e:
-                messagebox.showerror("Hata", f"Dosya kaydedilemedi: {str(e)}")
+            self.start_save(self.current_file)
         else:
             self.save_file_as()
 
     def save_file_as(self):
         """Farklı kaydet işlemi."""
+        if self.load_source is not None:
+            messagebox.showinfo("Bilgi", "Dosya henüz yükleniyor.")
+            return
         file_path = filedialog.asksaveasfilename(defaultextension=".py",
                                                  filetypes=[("Python Dosyaları", "*.py"), ("Tüm Dosyalar", "*.*")])
         if file_path:
-            try:
-                with open(file_path, 'w', encoding='utf-8') as file:
-                    file.write(self.text_area.get("1.0", tk.END).rstrip("\n"))
+            self.start_save(file_path, rename=True)
+
+    def start_save(self, file_path, rename=False):
+        """Metnin anlık görüntüsünü arka plan iş parçacığında atomik olarak diske yazar.
+
+        Yazma sürerken düzenleme devam eder; işler tek bir iş parçacığında sırayla
+        yazılır, sonuçları poll_save() ana döngüde bildirir."""
+        text = self.document.text().rstrip("\n")
+        if not self.save_jobs:
+            self.root.after(WORKER_POLL_MS, self.poll_save)
+        self.save_jobs.append((file_path, self.writer().submit(write_atomic, file_path, text), rename))
+
+    def writer(self):
+        """Kaydetme ve önbellek yazımlarının sırayla çalıştığı iş parçacığı (ilk kullanımda oluşturulur)."""
+        if self.save_executor is None:
+            self.save_executor = ThreadPoolExecutor(max_workers=1)
+        return self.save_executor
+
+    def poll_save(self):
+        """Biten kaydetme işlerini sırayla bildirir; bekleyen varsa yeniden yoklar."""
+        while self.save_jobs and self.save_jobs[0][1].done():
+            file_path, future, rename = self.save_jobs.pop(0)
+            error = future.exception()
+            if error is not None:
+                messagebox.showerror("Hata", f"Dosya kaydedilemedi: {str(error)}")
+                continue
+            if rename:
                 self.current_file = file_path
                 self.root.title(f"Python Sözdizimi Vurgulayıcı - {os.path.basename(file_path)}")
-                messagebox.showinfo("Başarılı", "Dosya kaydedildi.")
-            except Exception as e:
-                messagebox.showerror("Hata", f"Dosya kaydedilemedi: {str(e)}")
+            messagebox.showinfo("Başarılı", "Dosya kaydedildi.")
+        if self.save_jobs:
+            self.root.after(WORKER_POLL_MS, self.poll_save)
+
+    def schedule_highlight(self):
+        """Vurgulamayı gecikmeli planlar; her düzenlemede record_edit() çağırır.
 
-    def schedule_highlight(self, event=None):
-        """Vurgulamayı gecikmeli planlar."""
+        Gecikme son geçişlerin süresine göre seçilir: küçük metinlerde neredeyse
+        hemen, büyüklerde yazarken geçişler birikmesin diye daha geç vurgulanır."""
+        self.generation += 1
+        self.cancel_highlight_job()  # Yarım kalan parça parça vurgulama eski metne ait
         if self.highlight_timer:
             self.root.after_cancel(self.highlight_timer)
-        self.highlight_timer = self.root.after(300, self.highlight_syntax)
+        self.highlight_delay = self.debounce_delay()
+        self.highlight_timer = self.root.after(self.highlight_delay, self.highlight_syntax)
+
+    def debounce_delay(self):
+        """Son vurgulama geçişlerinin ortalama süresinden gecikmeyi (ms) hesaplar."""
+        if not self.pass_times:
+            return DEBOUNCE_MIN_MS
+        average = sum(self.pass_times) / len(self.pass_times)
+        return int(min(DEBOUNCE_MAX_MS, max(DEBOUNCE_MIN_MS, average * 1000 * DEBOUNCE_FACTOR)))
+
+    def cancel_highlight_job(self):
+        if self.highlight_job:
+            self.root.after_cancel(self.highlight_job)
+            self.highlight_job = None
+
+    def schedule_highlight_job(self):
+        """Yapılacak iş varsa bir sonraki boşta vurgulama adımını planlar."""
+        if self.highlight_job is None and self.worker_job is None and (self.pending or self.needs_parse or self.lexing()):
+            self.highlight_job = self.root.after_idle(self.highlight_step)
+
+    def lexing(self):
+        """Ana iş parçacığındaki lexer metnin yalnızca bir önekini mi tutuyor?"""
+        return (self.worker_ranges is None and not self.background_var.get()
+                and len(self.lexer.text) < self.length)
+
+    def highlight_step(self):
+        """Boşta çalışan tek adım: tokenlaştırmayı bir parça ilerletir, tamamlanan
+        metni ayrıştırır ya da bekleyen bir satır bloğunu renklendirir."""
+        self.highlight_job = None
+        if self.dirty is not None:
+            return  # Metin değişti; yeni geçiş yeniden planlayacak
+        tag_calls = self.tag_batcher.calls
+        self.stats.begin("idle")
+        if self.lexing():
+            self.lex_until(len(self.lexer.line_offsets) + LEX_CHUNK_LINES)
+        elif self.needs_parse and self.worker_ranges is None:
+            # Tüm metin tokenlaştırıldı; değişen bloklar bekleyenlere eklenir
+            self.parse_tokens()
+        elif self.pending:
+            self.color_block(min(self.pending))
+        self.end_pass(tag_calls)
+        self.schedule_highlight_job()
+
+    def lex_until(self, line):
+        """Metnin tokenlaştırılmış önekini en az verilen satırın sonuna kadar uzatır."""
+        lexed = len(self.lexer.text)
+        if not self.lexing() or len(self.lexer.line_offsets) > line:
+            return
+        self.lexer.update(lexed, lexed, self.line_text(len(self.lexer.line_offsets), line))
+        self.needs_parse = True
+        self.stats.phase("lex")
+
+    def line_text(self, first_line, last_line):
+        """Belgeden yalnızca verilen satırları (son satır sonu dahil) okur."""
+        return self.document.lines(first_line, last_line)
+
+    def parse_tokens(self):
+        """Token'ları ayrıştırır; lexer aynı token dizisini yerinde güncellediyse
+        yalnızca düzenlemenin dokunduğu üst düzey deyimler yeniden ayrıştırılır.
+
+        Yeniden tokenlaştırılan satırların ve rolü değişen token'ların blokları
+        bekleyenlere eklenir; token dizisi baştan kurulduysa tüm bloklar beklemeye alınır."""
+        tokens, edit, lines = self.lexer.tokens, self.lexer.token_edit, self.lexer.line_edit
+        if self.parser is not None and self.parser.tokens is tokens and edit is not None:
+            self.parser.update(*edit)
+        else:
+            self.parser = Parser(tokens, engine="precedence", cache=self.parse_cache)
+            self.parser.parse()
+        self.lexer.token_edit = self.lexer.line_edit = None
+        self.stats.phase("parse")
+        old_roles, self.semantic = self.semantic, semantic_tags(self.parser)
+        self.needs_parse = False
+        self.stats.phase("semantic")
+        if self.semantic_tokens is not tokens:
+            self.pending = set(range(self.line_count // HIGHLIGHT_CHUNK_LINES + 1))
+            self.semantic_tokens = tokens
+        else:
+            if lines is not None:
+                self.pending.update(range(lines[0] // HIGHLIGHT_CHUNK_LINES, (lines[2] - 1) // HIGHLIGHT_CHUNK_LINES + 1))
+            count = len(tokens)
+            self.pending.update(tokens[position].line // HIGHLIGHT_CHUNK_LINES
+                                for position in changed_roles(old_roles, self.semantic, edit) if position < count)
+        self.stats.phase("pending")
+        if self.cache_text is not None and not self.lexing():
+            self.store_cache()
+
+    def color_block(self, block):
+        """Bir satır bloğunu tokenlaştırılmışsa renklendirir ve bekleyenlerden çıkarır."""
+        first_line = block * HIGHLIGHT_CHUNK_LINES or 1
+        last_line = (block + 1) * HIGHLIGHT_CHUNK_LINES - 1
+        if self.lexing() and last_line >= len(self.lexer.line_offsets) - 1:
+            return  # Son satır sonraki parçayla yeniden tokenlaştırılabilir
+        self.pending.discard(block)
+        if self.worker_ranges is not None:
+            ranges = self.worker_ranges.window(first_line, last_line)
+        else:
+            ranges = collect_tag_ranges(self.lexer.tokens, self.semantic, first_line, last_line)
+        self.stats.phase("ranges")
+        self.tag_batcher.apply(ranges, first_line, last_line)
+        self.stats.phase("tags")
+
+    def visible_blocks(self):
+        """Görünür satırları ve kenar payını kapsayan ilk ve son blok numarası."""
+        start_line, end_line = self.visible_lines()
+        return (max(start_line - VIEWPORT_MARGIN, 1) // HIGHLIGHT_CHUNK_LINES,
+                (end_line + VIEWPORT_MARGIN) // HIGHLIGHT_CHUNK_LINES)
+
+    def color_visible(self):
+        """Görünür satırları ve kenar payını bekleyen bloklar arasından hemen renklendirir."""
+        if self.dirty is not None or self.worker_job is not None:
+            return  # Metin son geçişten beri değişti veya işçi sonucu bekleniyor; eldeki aralıklar eski
+        if self.pending:
+            first_block, last_block = self.visible_blocks()
+            self.lex_until((last_block + 1) * HIGHLIGHT_CHUNK_LINES)
+            for block in range(first_block, last_block + 1):
+                if block in self.pending:
+                    self.color_block(block)
+        self.schedule_highlight_job()
 
     def highlight_syntax(self, event=None):
-        """Sözdizimi vurgulama işlemini gerçekleştirir."""
-        self.highlight_timer = None
-        text = self.text_area.get("1.0", tk.END).rstrip("\n")
-        if text == self.last_text:
-            return  # Metin değişmediyse tekrar vurgulama
-        self.last_text = text
-
-        # Tüm metni tokenlaştır
-        self.lexer.set_text(text)
-        tokens = self.lexer.tokenize()
-        self.parser = Parser(tokens)
-        statements = self.parser.parse()
-
-        # Önceki vurgulama etiketlerini kaldır
-        for tag in self.text_area.tag_names():
-            self.text_area.tag_remove(tag, "1.0", tk.END)
-
-        # Lexer token’larını vurgulama
-        for token in tokens:
-            start_pos = f"{token.line}.{token.column - 1}"
-            end_pos = f"{token.line}.{token.column - 1 + len(token.value)}"
-            try:
-                tag = "CONSTANT" if token.type == "LITERAL" else token.type
-                self.text_area.tag_add(tag, start_pos, end_pos)
-            except tk.TclError:
-                continue  # Geçersiz pozisyonları atla
-
-        # Ayrıştırıcı çıktılarını kullanarak ek yapıları vurgulama
-        for stmt in statements:
-            if stmt[0] == "FUNCTION_DEF":
-                identifier, params, suite, decorators, is_async = stmt[1], stmt[2], stmt[3], stmt[4], stmt[5]
-                for token in tokens:
-                    if token.type == "IDENTIFIER" and token.value == identifier:
-                        start_pos = f"{token.line}.{token.column - 1}"
-                        end_pos = f"{token.line}.{token.column - 1 + len(token.value)}"
-                        try:
-                            self.text_area.tag_add("FUNCTION_DEF", start_pos, end_pos)
-                        except tk.TclError:
-                            continue
-                    # Parametreleri renklendirme
-                    for param in params:
-                        if token.type == "IDENTIFIER" and token.value == param:
-                            start_pos = f"{token.line}.{token.column - 1}"
-                            end_pos = f"{token.line}.{token.column - 1 + len(token.value)}"
-                            try:
-                                self.text_area.tag_add("PARAMETER", start_pos, end_pos)
-                            except tk.TclError:
-                                continue
-            elif stmt[0] == "CLASS_DEF":
-                identifier, bases, suite = stmt[1], stmt[2], stmt[3]
-                for token in tokens:
-                    if token.type == "IDENTIFIER" and token.value == identifier:
-                        start_pos = f"{token.line}.{token.column - 1}"
-                        end_pos = f"{token.line}.{token.column - 1 + len(token.value)}"
-                        try:
-                            self.text_area.tag_add("CLASS_DEF", start_pos, end_pos)
-                        except tk.TclError:
-                            continue
-            elif stmt[0] == "DECORATOR":
-                identifier = stmt[1]
-                for token in tokens:
-                    if token.type == "IDENTIFIER" and token.value == identifier:
-                        start_pos = f"{token.line}.{token.column - 1}"
-                        end_pos = f"{token.line}.{token.column - 1 + len(token.value)}"
-                        try:
-                            self.text_area.tag_add("DECORATOR", start_pos, end_pos)
-                        except tk.TclError:
-                            continue
-            elif stmt[0] == "CALL":
-                identifier, args = stmt[1], stmt[2]
-                for token in tokens:
-                    if token.type == "IDENTIFIER" and token.value == identifier:
-                        start_pos = f"{token.line}.{token.column - 1}"
-                        end_pos = f"{token.line}.{token.column - 1 + len(token.value)}"
-                        try:
-                            self.text_area.tag_add("CALL", start_pos, end_pos)
-                        except tk.TclError:
-                            continue
-            elif stmt[0] == "LAMBDA":
-                params, expr = stmt[1], stmt[2]
-                for token in tokens:
-                    if token.type == "KEYWORD" and token.value == "lambda":
-                        start_pos = f"{token.line}.{token.column - 1}"
-                        end_pos = f"{token.line}.{token.column - 1 + len(token.value)}"
-                        try:
-                            self.text_area.tag_add("LAMBDA", start_pos, end_pos)
-                        except tk.TclError:
-                            continue
-                    # Lambda parametrelerini renklendirme
-                    for param in params:
-                        if token.type == "IDENTIFIER" and token.value == param:
-                            start_pos = f"{token.line}.{token.column - 1}"
-                            end_pos = f"{token.line}.{token.column - 1 + len(token.value)}"
-                            try:
-                                self.text_area.tag_add("PARAMETER", start_pos, end_pos)
-                            except tk.TclError:
-                                continue
-            elif stmt[0] == "FOR_STMT":
-                identifier, expr, suite, is_async = stmt[1], stmt[2], stmt[3], stmt[4]
-                for token in tokens:
-                    if token.type == "IDENTIFIER" and token.value == identifier:
-                        start_pos = f"{token.line}.{token.column - 1}"
-                        end_pos = f"{token.line}.{token.column - 1 + len(token.value)}"
-                        try:
-                            self.text_area.tag_add("LOOP_VAR", start_pos, end_pos)
-                        except tk.TclError:
-                            continue
-            elif stmt[0] == "IF_STMT":
-                expr, suite, elif_stmts, else_suite = stmt[1], stmt[2], stmt[3], stmt[4]
-                def highlight_expr(expr, tag="CONDITIONAL"):
-                    if isinstance(expr, tuple):
-                        for sub_expr in expr[1:]:
-                            highlight_expr(sub_expr, tag)
-                    elif isinstance(expr, str):
-                        for token in tokens:
-                            if token.type in ["IDENTIFIER", "NUMBER", "STRING", "CONSTANT"] and token.value == expr:
-                                start_pos = f"{token.line}.{token.column - 1}"
-                                end_pos = f"{token.line}.{token.column - 1 + len(token.value)}"
-                                try:
-                                    self.text_area.tag_add(tag, start_pos, end_pos)
-                                except tk.TclError:
-                                    continue
-                highlight_expr(expr)
-                for elif_stmt in elif_stmts:
-                    highlight_expr(elif_stmt[1])  # ELIF ifadeleri için
-            elif stmt[0] == "EXPRESSION" and isinstance(stmt[1], tuple) and stmt[1][0] == "ATTRIBUTE":
-                attr = stmt[1][2]  # Nitelik adı
-                for token in tokens:
-                    if token.type == "IDENTIFIER" and token.value == attr:
-                        start_pos = f"{token.line}.{token.column - 1}"
-                        end_pos = f"{token.line}.{token.column - 1 + len(token.value)}"
-                        try:
-                            self.text_area.tag_add("ATTRIBUTE", start_pos, end_pos)
-                        except tk.TclError:
-                            continue
+        """Sözdizimi vurgulama işlemini gerçekleştirir.
+
+        Yalnızca görünür satırlar hemen renklendirilir; metnin geri kalanı
+        boşta çalışan küçük adımlarla tamamlanır ve yeni bir düzenleme bu
+        adımları iptal eder. Arka plan kipinde lex ve ayrıştırma işçiye gider."""
+        if self.highlight_timer:
+            self.root.after_cancel(self.highlight_timer)  # Doğrudan çağrıldıysa bekleyen geçiş gereksiz
+            self.highlight_timer = None
+        if self.load_source is not None:
+            return  # Büyük dosya yükleniyor; bitince finish_load() vurgular
+        self.cancel_highlight_job()
+        started, tag_calls = time.perf_counter(), self.tag_batcher.calls
+        edit = self.take_edit()
+        if edit is None:
+            self.color_visible()  # Metin değişmediyse tekrar vurgulama
+            return
+        self.stats.begin("background" if self.background_var.get() else "edit", started)
+        self.stats.phase("invalidate")
+        if self.background_var.get():
+            self.lexer.set_text("")  # Lexer arka plan kipinde güncellenmez; sonra baştan kurulur
+            first_line, old_last_line, new_last_line, _ = edit
+            self.worker_edit = merge_edits(self.worker_edit, (first_line, old_last_line + 1, new_last_line + 1))
+            text = self.document.text()
+            self.stats.phase("snapshot")
+            self.submit_highlight(text)
+            self.stats.phase("submit")
+            self.end_pass(tag_calls)
+            self.pass_times.append(time.perf_counter() - started)
+            return
+        first_line, old_last_line, new_last_line, old_length = edit
+
+        # Yalnızca değişen satırları yeniden tokenlaştır. Lexer metnin bir önekini
+        # tutabilir; önekin ötesindeki düzenlemeler sonraki adımlara kalır.
+        lexed, offsets = len(self.lexer.text), self.lexer.line_offsets
+        if first_line <= len(offsets) and (offsets[first_line - 1] < lexed or lexed == old_length):
+            start = offsets[first_line - 1]
+            if new_last_line - first_line > LEX_CHUNK_LINES:
+                # Dosya açma veya büyük yapıştırma: bir parça tokenlaştır, kalanı öneke eklenir
+                self.lexer.update(start, lexed, self.line_text(first_line, first_line + LEX_CHUNK_LINES - 1))
+            else:
+                old_end = offsets[old_last_line] if old_last_line < len(offsets) else lexed
+                self.lexer.update(start, old_end, self.line_text(first_line, new_last_line))
+            self.stats.phase("lex")
+
+        # Görünür alanı hemen renklendir, kalan bloklar boşta işlenir
+        first_block, last_block = self.visible_blocks()
+        self.lex_until((last_block + 1) * HIGHLIGHT_CHUNK_LINES)
+        self.parse_tokens()
+        self.color_visible()
+        self.end_pass(tag_calls)
+        self.pass_times.append(time.perf_counter() - started)
+
+    def take_edit(self):
+        """Son geçişten beri biriken düzenlemeyi alır ve etiket modelini ona göre hizalar.
+
+        (ilk satır, eski son satır, yeni son satır, eski uzunluk) döndürür; metin
+        değişmediyse None döner. Düzenlenen satırların etiketleri silinir; Tk'nin
+        yazılan karakterlere komşulardan taşıdığı etiketler de böylece gider."""
+        if self.dirty is None:
+            return None
+        first_line, old_stop, new_stop = self.dirty
+        old_length = self.length
+        self.dirty = None
+        self.length += self.dirty_chars
+        self.dirty_chars = 0
+        self.line_count += new_stop - old_stop
+        self.tag_batcher.invalidate(first_line, old_stop - 1, new_stop - 1)
+        self.shift_pending(first_line, old_stop - 1, new_stop - 1)
+        return first_line, old_stop - 1, new_stop - 1, old_length
+
+    def shift_pending(self, first_line, old_last_line, new_last_line):
+        """Bekleyen blokları düzenlemenin satır farkı kadar kaydırır ve etiketleri
+        silinen satırların bloklarını ekler."""
+        delta = new_last_line - old_last_line
+        pending = set(range(first_line // HIGHLIGHT_CHUNK_LINES, new_last_line // HIGHLIGHT_CHUNK_LINES + 1))
+        for block in self.pending:
+            start = block * HIGHLIGHT_CHUNK_LINES
+            stop = start + HIGHLIGHT_CHUNK_LINES - 1
+            if stop < first_line:
+                pending.add(block)
+            elif start > old_last_line:
+                pending.update(range((start + delta) // HIGHLIGHT_CHUNK_LINES,
+                                     (stop + delta) // HIGHLIGHT_CHUNK_LINES + 1))
+        self.pending = pending
+
+    def submit_highlight(self, text):
+        """Metnin anlık görüntüsünü nesil numarasıyla arka plan işçisine gönderir.
+
+        Küçük metinler bir iş parçacığında, büyükleri GIL'e takılmamak için ayrı
+        bir süreçte işlenir."""
+        self.generation += 1
+        kind = "process" if len(text) > WORKER_PROCESS_THRESHOLD else "thread"
+        if kind not in self.workers:
+            self.workers[kind] = ProcessPoolExecutor(max_workers=1) if kind == "process" \
+                else ThreadPoolExecutor(max_workers=1)
+        polling = self.worker_job is not None
+        if polling:
+            self.worker_job[1].cancel()  # Henüz başlamadıysa eski iş hiç çalışmaz
+        self.worker_job = (self.generation, self.workers[kind].submit(analyze, text))
+        if not polling:
+            self.root.after(WORKER_POLL_MS, self.poll_worker)
+
+    def poll_worker(self):
+        """İşçi sonucunu ana iş parçacığında yoklar; güncel nesle aitse uygular."""
+        if self.worker_job is None:
+            return  # Arka plan kipi kapatıldı
+        generation, future = self.worker_job
+        if not future.done():
+            self.root.after(WORKER_POLL_MS, self.poll_worker)
+            return
+        self.worker_job = None
+        if generation != self.generation or future.cancelled():
+            return  # Eski nesil; yeni düzenleme kendi işini gönderecek
+        try:
+            ranges = future.result()
+        except Exception as error:  # BrokenProcessPool dahil: işçi süreci çöktü veya analiz hata verdi
+            self.worker_failed(error)
+            return
+        if self.dirty is not None:
+            return  # Metin değişti; record_edit() yeni geçişi zaten planladı
+        if self.worker_ranges is None or self.worker_edit is None:
+            self.pending = set(range(self.line_count // HIGHLIGHT_CHUNK_LINES + 1))
+        else:
+            self.pending.update(ranges.changed_blocks(self.worker_ranges, self.worker_edit, HIGHLIGHT_CHUNK_LINES))
+        self.worker_ranges = ranges
+        self.worker_edit = None
+        self.color_visible()
+
+    def worker_failed(self, error):
+        """İşçi hatasını başlıkta bildirir ve vurgulamayı ana iş parçacığına geri alır."""
+        self.background_var.set(False)
+        self.toggle_background()  # İşçileri kapatır, lexer'ı baştan kurar ve highlight_syntax'i çağırır
+        name = os.path.basename(self.current_file) if self.current_file else "PySyntaxHighlight"
+        self.root.title(f"Python Sözdizimi Vurgulayıcı - {name}"
+                        f" (arka plan vurgulama başarısız: {type(error).__name__}; ana iş parçacığında sürüyor)")
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -0,0 +1,2416 @@
+import copy
+import logging
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+
+# Ayrıştırıcı uyarıları; yapılandırılmamışsa standart hataya yazılır, iş parçacıklarından güvenle çağrılır
+logger = logging.getLogger(__name__)
+
+BRACE_PATTERN = re.compile(r"[\n{}]")  # f-string ifadelerindeki süslü parantezler ve satır sonları
+# Dize gövdesinde durulması gereken karakterler: (tırnak, f-string mi) -> desen
+STRING_PATTERNS = {
+    (quote, is_f_string): re.compile("[\n" + quote + ("{" if is_f_string else "") + "]")
+    for quote in "\"'" for is_f_string in (False, True)
+}
+
+# TokenBuffer'da saklanan tür kodları
+TOKEN_TYPES = [
+    "KEYWORD", "OPERATOR", "IDENTIFIER", "LITERAL", "NUMBER", "STRING",
+    "FSTRING", "FSTRING_EXPR", "COMMENT", "ERROR"
+]
+TOKEN_CODES = {token_type: code for code, token_type in enumerate(TOKEN_TYPES)}
+# Regex motorunun token beşlilerine doğrudan yazdığı kodlar
+(KEYWORD_CODE, OPERATOR_CODE, IDENTIFIER_CODE, LITERAL_CODE, NUMBER_CODE, STRING_CODE,
+ FSTRING_CODE, FSTRING_EXPR_CODE, COMMENT_CODE, ERROR_CODE) = range(len(TOKEN_TYPES))
+
+# Vurgulama etiketleri; Tk'deki gibi listede sonra gelen etiket çakışmada baskın çıkar
+TAG_NAMES = [
+    "KEYWORD", "OPERATOR", "NUMBER", "STRING", "FSTRING", "FSTRING_EXPR",
+    "COMMENT", "IDENTIFIER", "CONSTANT", "ERROR", "DECORATOR",
+    "FUNCTION_DEF", "CLASS_DEF", "CALL", "LAMBDA", "LOOP_VAR",
+    "CONDITIONAL", "PARAMETER", "ATTRIBUTE"
+]
+TAG_PRIORITY = {tag: priority for priority, tag in enumerate(TAG_NAMES)}
+
+# Bir deyim ayrıştırılırken bitiş konumunun ötesinde bakılabilecek token sayısı
+# (bitişteki current_token ve güvenlik payı olarak bir peek)
+PARSER_LOOKAHEAD = 2
+STREAM_CHUNK_SIZE = 1 << 16  # Lexer.iter_tokens'ın akıştan tek seferde okuduğu karakter
+# Satır sonundaki lexer durumuna göre açık yapıyı kapatabilecek ayraçlar (Lexer.iter_tokens)
+CLOSING_DELIMITERS = {"TRIPLE_STRING": ('"""', "'''"), "STRING": ('"', "'"), "FSTRING_EXPR": ("}",)}
+PARSE_CACHE_SIZE = 65536  # ParseCache'in varsayılan girdi sınırı
+PARSE_CACHE_HEAD = 32  # Önbellekte deyim aranırken özeti alınan en fazla ilk satır token'ı
+PARSE_CACHE_SPANS = 4  # Aynı ilk satır için hatırlanan farklı dilim uzunlukları
+# Satır sonu içerebilen token türleri; etiket aralıkları bunlar için satır satır bölünür
+MULTILINE_CODES = frozenset(TOKEN_CODES[token_type] for token_type in ("STRING", "FSTRING", "COMMENT", "ERROR"))
+
+# Öncelik tablosu (engine="precedence"): (token türü, değer) -> (öncelik, düğüm türü,
+# işleç düğümde saklanır mı). Özyinelemeli ayrıştırıcıdaki parse_*_expr katmanlarıyla
+# birebir aynıdır; "in"/"is" sonraki "not" token'ına göre ayrıca çözülür.
+BINARY_OPERATORS = {
+    ("KEYWORD", "or"): (1, "LOGICAL_OR", False),
+    ("KEYWORD", "and"): (2, "LOGICAL_AND", False),
+    ("OPERATOR", "|"): (5, "BITWISE_OR", False),
+    ("OPERATOR", "^"): (6, "BITWISE_XOR", False),
+    ("OPERATOR", "&"): (7, "BITWISE_AND", False),
+    ("OPERATOR", "**"): (12, "POWER", False),
+}
+BINARY_OPERATORS.update({("OPERATOR", op): (4, "COMPARISON", True) for op in ("<", ">", "==", ">=", "<=", "!=")})
+BINARY_OPERATORS.update({("OPERATOR", op): (8, "SHIFT", True) for op in ("<<", ">>")})
+BINARY_OPERATORS.update({("OPERATOR", op): (9, "ARITH", True) for op in ("+", "-")})
+BINARY_OPERATORS.update({("OPERATOR", op): (10, "TERM", True) for op in ("*", "/", "//", "%")})
+COMPARISON_PRECEDENCE = 4  # in, not in, is, is not
+NOT_PRECEDENCE = 3  # Önek "not"; yalnızca or/and/not işlenenlerinin başında geçerlidir
+UNARY_PRECEDENCE = 11  # Önek + - ~
+POWER_PRECEDENCE = 12  # Sağdan birleşen tek ikili işleç
+# İfade çerçevesinin giriş katmanı: tam ifade (nitelik soneki dahil), koşullu ifade, or ifadesi
+EXPRESSION, IF_EXPRESSION, OR_EXPRESSION = range(3)
+
+class Token:
+    __slots__ = ("type", "value", "line", "column")
+
+    def __init__(self, type, value, line, column):
+        self.type = type  # "KEYWORD", "OPERATOR", "IDENTIFIER", "LITERAL", "ERROR" vb.
+        self.value = value
+        self.line = line
+        self.column = column
+
+class TokenView:
+    """TokenBuffer içindeki bir token'a Token ile aynı arayüzü sunan hafif görünüm."""
+    __slots__ = ("buffer", "index")
+
+    def __init__(self, buffer, index):
+        self.buffer = buffer
+        self.index = index
+
+    @property
+    def type(self):
+        return TOKEN_TYPES[self.buffer.types[self.index]]
+
+    @property
+    def value(self):
+        return self.buffer.value(self.index)
+
+    @property
+    def line(self):
+        return self.buffer.lines[self.index]
+
+    @property
+    def column(self):
+        return self.buffer.columns[self.index]
+
+class TokenBuffer:
+    """Token'ları paralel array.array sütunlarında saklar.
+
+    Her token için tür kodu, başlangıç ofseti, uzunluk, satır ve sütun tutulur;
+    değerler kaynak metinden yalnızca istendiğinde kesilir. İndeksleme Token
+    yerine geçici TokenView nesneleri döndürür, böylece Parser değişmeden çalışır."""
+
+    def __init__(self, text=""):
+        self.text = text
+        self.types = array("B")
+        self.starts = array("q")
+        self.lengths = array("l")
+        self.lines = array("l")
+        self.columns = array("l")
+
+    @classmethod
+    def from_tokens(cls, tokens, text, line_offsets):
+        """Token listesinden tampon oluşturur; ofsetler satır başlangıçlarından hesaplanır."""
+        buffer = cls(text)
+        for token in tokens:
+            start = line_offsets[token.line - 1] + token.column - 1
+            buffer.append(token.type, start, start + len(token.value), token.line, token.column)
+        return buffer
+
+    @classmethod
+    def from_values(cls, text, values):
+        """(tür kodu, başlangıç, uzunluk, satır, sütun) beşlilerinin düz listesinden
+        tampon oluşturur; sütunlar liste dilimlerinden tek seferde kurulur."""
+        buffer = cls(text)
+        buffer.types = array("B", values[0::5])
+        buffer.starts = array("q", values[1::5])
+        buffer.lengths = array("l", values[2::5])
+        buffer.lines = array("l", values[3::5])
+        buffer.columns = array("l", values[4::5])
+        return buffer
+
+    def append(self, type, start, end, line, column):
+        self.types.append(TOKEN_CODES[type])
+        self.starts.append(start)
+        self.lengths.append(end - start)
+        self.lines.append(line)
+        self.columns.append(column)
+
+    def value(self, index):
+        start = self.starts[index]
+        return self.text[start:start + self.lengths[index]]
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.types)
+        if not 0 <= index < len(self.types):
+            raise IndexError("token index out of range")
+        return TokenView(self, index)
+
+    def __iter__(self):
+        for index in range(len(self.types)):
+            yield TokenView(self, index)
+
+    def to_tokens(self):
+        """Token nesnesi bekleyen çağıranlar için tam bir Token listesi üretir."""
+        text = self.text
+        return [
+            Token(TOKEN_TYPES[code], text[start:start + length], line, column)
+            for code, start, length, line, column in zip(self.types, self.starts, self.lengths, self.lines, self.columns)
+        ]
+
+    def splice(self, start, stop, other, line_delta=0, offset_delta=0):
+        """[start, stop) aralığını other tamponuyla değiştirir; sonraki token'ları kaydırır."""
+        self.text = other.text
+        if line_delta:
+            self.lines[stop:] = array("l", [line + line_delta for line in self.lines[stop:]])
+        if offset_delta:
+            self.starts[stop:] = array("q", [offset + offset_delta for offset in self.starts[stop:]])
+        self.types[start:stop] = other.types
+        self.starts[start:stop] = other.starts
+        self.lengths[start:stop] = other.lengths
+        self.lines[start:stop] = other.lines
+        self.columns[start:stop] = other.columns
+
+def first_token_on_line(tokens, line):
+    """Satır numarası line veya sonrası olan ilk token'ın indeksini ikili arama ile bulur."""
+    if isinstance(tokens, TokenBuffer):
+        return bisect_left(tokens.lines, line)
+    lo, hi = 0, len(tokens)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if tokens[mid].line < line:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+def merge_edits(first, second):
+    """Ardışık iki (start, old_end, new_end) düzenlemesini tek düzenlemede birleştirir.
+
+    first None ise second döner; second, first uygulandıktan sonraki konumlarla verilir."""
+    if first is None:
+        return second
+    start, old_end, new_end = first
+    second_start, second_old_end, second_new_end = second
+    return (min(start, second_start),
+            old_end + max(0, second_old_end - new_end),
+            max(second_new_end, new_end + second_new_end - second_old_end))
+
+class Lexer:
+    def __init__(self, engine="char", compact=False):
+        self.engine = engine  # "char": karakter karakter tarama, "regex": derlenmiş ana desen
+        self.compact = compact  # True ise token'lar TokenBuffer olarak döndürülür
+        self.keywords = {
+            "def", "for", "if", "else", "while", "elif", "try", "except", "finally",
+            "class", "None", "lambda", "with", "as", "import", "from", "async",
+            "await", "break", "continue", "pass", "return", "True", "False",
+            "global", "nonlocal", "assert", "raise", "del", "match", "case",
+            "and", "or", "not", "in", "is"
+        }
+        self.operators = {
+            "+", "-", "*", "/", "=", "==", "<", ">", "<=", ">=", "%", "//", "**",
+            "&", "|", "^", "~", "<<", ">>", "@", ":=", "!=", ":", ",", "(", ")",
+            "[", "]", "{", "}", ".", ";"
+        }
+        self.literals = {"True", "False", "None"}  # Özel literaller
+        self.current_char = ""
+        self.pos = -1
+        self.line = 1
+        self.column = 0
+        self.text = ""
+        self.tokens = TokenBuffer() if compact else []
+        self.line_states = []  # Her satır sonundaki lexer durumu
+        self.line_offsets = [0]  # Her satırın metin içindeki başlangıç ofseti
+        self.resync = None  # Artımlı lexing için senkronizasyon kontrolü
+        self.token_edit = None  # Son tokenize()'dan beri update()'lerin birleşik token aralığı
+        self.line_edit = None  # Aynı düzenlemelerin yeniden tokenlaştırdığı (ilk satır, eski bitiş, yeni bitiş)
+        self.pattern = self.build_pattern()
+        # Regex motorunda ad -> token tür kodu; listede olmayanlar IDENTIFIER'dır
+        self.name_codes = dict.fromkeys(self.keywords, KEYWORD_CODE)
+        self.name_codes.update(dict.fromkeys(self.literals, LITERAL_CODE))
+
+    def build_pattern(self):
+        """Regex motoru için tüm token türlerini tek bir ana desende birleştirir."""
+        singles = sorted(op for op in self.operators if len(op) == 1)
+        # Karakter motoru tek karakterlik bir operatörü yalnızca bir karakter uzatabilir;
+        # ikinci karakter isteğe bağlı bir sınıf olarak ilk karakterin dalına eklenir
+        seconds = {op: "".join(sorted(re.escape(double[1]) for double in self.operators
+                                      if len(double) == 2 and double[0] == op)) for op in singles}
+        operator = "|".join([re.escape(op) + "[" + seconds[op] + "]?" for op in singles if seconds[op]]
+                            + ["[" + "".join(re.escape(op) for op in singles if not seconds[op]) + "]"])
+        # Token'dan önceki boşluklar aynı eşleşmede atlanır
+        return re.compile(
+            r"[^\S\n]*(?:"
+            r"(?P<newline>\n)"
+            r"|(?P<name>[A-Za-z_]\w*)"
+            r"|(?P<operator>" + operator + ")"
+            r"|(?P<number>\d+(?:\.\d*)?)"
+            r"|(?P<comment>#[^\n]*)"
+            r"|(?P<triple>\"\"\"|''')"
+            r"|(?P<string>[\"'])"
+            r"|(?P<uname>[^\W\d]\w*)"
+            r"|(?P<other>\S))"
+        )
+
+    def set_text(self, text):
+        self.text = text
+        self.pos = -1
+        self.line = 1
+        self.column = 0
+        self.current_char = ""
+        self.tokens = TokenBuffer(text) if self.compact else []
+        self.token_edit = None
+        self.line_edit = None
+        self.line_states = []
+        self.line_offsets = [0]
+
+    def restore(self, text, tokens, line_offsets, line_states):
+        """Metnin daha önce kaydedilmiş tam tokenlaştırmasını (ör. disk önbelleğinden)
+        yükler; metin yeniden taranmaz ve sonraki update() çağrıları bunun üzerinden çalışır."""
+        self.set_text(text)
+        self.tokens = tokens
+        self.line_offsets = line_offsets
+        self.line_states = line_states
+
+    def advance(self):
+        self.pos += 1
+        self.column += 1
+        if self.pos < len(self.text):
+            self.current_char = self.text[self.pos]
+        else:
+            self.current_char = None
+
+    def new_line(self, state):
+        """Satır sonunu ve o noktadaki lexer durumunu kaydeder."""
+        self.line += 1
+        self.column = 0
+        self.line_states.append(state)
+        self.line_offsets.append(self.pos + 1)
+
+    def tokenize(self):
+        self.line_states = []
+        self.line_offsets = [0]
+        self.tokens = self.scan()
+        self.token_edit = None
+        self.line_edit = None
+        return self.tokens
+
+    def tokenize_lines(self, count, text=""):
+        """tokenize()'ın parça parça sürümü: set_text()'ten sonraki her çağrıda metni
+        kaldığı yerden en az count satır daha tokenlaştırır ve NORMAL durumla başlayan
+        bir satır başında durur. Metnin tamamı tokenlaştırıldıysa True döndürür.
+
+        text verilirse önce metnin sonuna eklenir (parça parça okunan dosya için).
+        Önceki çağrı metnin sonuna ulaştıysa, NORMAL durumla başlayan son satırdan
+        sonraki token'lar (ör. parçada kapanmayan bir üçlü tırnak) silinir ve o
+        satırdan yeniden taranır. str değiştirilemediğinden her ekleme metnin bir
+        kopyasını oluşturur."""
+        if text:
+            end = len(self.text)
+            self.text += text
+            if self.compact:
+                self.tokens.text = self.text
+            if self.pos + 1 >= end:
+                line_index = len(self.line_offsets) - 1
+                while line_index > 0 and self.line_states[line_index - 1] != "NORMAL":
+                    line_index -= 1
+                first = first_token_on_line(self.tokens, line_index + 1)
+                if self.compact:
+                    self.tokens.splice(first, len(self.tokens), TokenBuffer(self.text))
+                else:
+                    del self.tokens[first:]
+                del self.line_states[line_index:]
+                del self.line_offsets[line_index + 1:]
+                self.pos = self.line_offsets[-1] - 1
+                self.line = line_index + 1
+                self.column = 0
+                self.current_char = ""
+        target = len(self.line_offsets) + count
+        stopped = False
+
+        def resync():
+            nonlocal stopped
+            stopped = len(self.line_offsets) > target
+            return stopped
+
+        self.resync = resync
+        try:
+            new_tokens = self.scan()
+        finally:
+            self.resync = None
+        if self.compact:
+            self.tokens.splice(len(self.tokens), len(self.tokens), new_tokens)
+        else:
+            self.tokens.extend(new_tokens)
+        return not stopped
+
+    def iter_tokens(self, stream, chunk_size=STREAM_CHUNK_SIZE):
+        """Metin akışını chunk_size karakterlik parçalarla okuyup token'ları (Token
+        nesneleri, mutlak satır ve sütunlarla) tek tek üretir.
+
+        Okunan tam satırlar tokenlaştırılır, ancak yalnızca NORMAL durumda biten son
+        satıra kadarki token'lar verilir; sonrası (ör. kapanmamış üçlü tırnak veya
+        çok satırlı bir f-string ifadesi) açık kalır. Açık yapının durumu ve aramanın
+        kaldığı yer parçalar arasında taşınır: yeni parçalarda yalnızca olası kapanış
+        ayraçları aranır ve pencere ancak biri gelince yeniden taranır, böylece uzun
+        bir dize her parçada baştan taranmaz. Operatörler, yorumlar ve adlar satır
+        sonunu aşmadığından parça sınırında bölünmez. Bellekte yalnızca henüz
+        verilmemiş satırlar tutulur; lexer'ın metni ve satır durumları bu pencereyi gösterir."""
+        buffer = ""
+        line = 1  # buffer'ın ilk satırının numarası
+        closing = None  # Açık yapının olası kapanış ayraçları; None ise pencere her parçada taranır
+        waiting = []  # closing beklenirken okunan, henüz buffer'a eklenmemiş parçalar
+        tail = ""  # Parça sınırında bölünmüş bir ayraç için önceki verinin son iki karakteri
+        done = False
+        while not done:
+            chunk = stream.read(chunk_size)
+            done = not chunk
+            if closing is not None and not done:
+                window = tail + chunk
+                waiting.append(chunk)
+                tail = window[-2:]
+                if not any(delimiter in window for delimiter in closing):
+                    continue  # Açık yapı bu parçada da kapanmadı; yeniden tarama gereksiz
+                closing = None
+                chunk = "".join(waiting)
+                waiting = []
+            elif waiting:
+                chunk = "".join(waiting)  # Akış bitti; bekleyen veri son kez taranır
+                waiting = []
+            buffer += chunk
+            cut = len(buffer) if done else buffer.rfind("\n") + 1
+            if not cut:
+                continue  # Henüz tam bir satır yok
+            self.set_text(buffer[:cut])
+            self.line = line
+            if self.engine == "regex":
+                values = []
+                self.scan_regex_range(0, len(self.text), line, 0, values)
+                tokens = TokenBuffer.from_values(self.text, values).to_tokens()
+            else:
+                tokens = self.scan_chars()
+            if done:
+                yield from tokens
+                break
+            # NORMAL durumda biten son satırdan sonrası henüz kesinleşmedi
+            safe = len(self.line_states)
+            while safe and self.line_states[safe - 1] != "NORMAL":
+                safe -= 1
+            if safe < len(self.line_states):
+                delimiters = CLOSING_DELIMITERS[self.line_states[-1]]
+                if not any(delimiter in buffer[cut:] for delimiter in delimiters):
+                    closing, tail = delimiters, buffer[-2:]
+            if not safe:
+                continue
+            boundary = line + safe
+            for token in tokens:
+                if token.line >= boundary:
+                    break
+                yield token
+            buffer = buffer[self.line_offsets[safe]:]
+            line = boundary
+        self.set_text("")
+
+    def update(self, edit_start, edit_end, new_text):
+        """text[edit_start:edit_end] aralığını new_text ile değiştirir ve yalnızca
+        etkilenen satırları yeniden tokenlaştırır. Güncellenmiş token listesini döndürür."""
+        old_tokens = self.tokens
+        old_states = self.line_states
+        old_offsets = self.line_offsets
+        delta = len(new_text) - (edit_end - edit_start)
+        new_end = edit_start + len(new_text)
+
+        # Hasarlı satırdan geriye doğru, başında NORMAL durumda olunan ilk satırı bul
+        line_index = bisect_right(old_offsets, edit_start) - 1
+        while line_index > 0 and old_states[line_index - 1] != "NORMAL":
+            line_index -= 1
+        first = first_token_on_line(old_tokens, line_index + 1)
+
+        self.text = self.text[:edit_start] + new_text + self.text[edit_end:]
+        self.pos = old_offsets[line_index] - 1
+        self.line = line_index + 1
+        self.column = 0
+        self.current_char = ""
+        self.line_states = old_states[:line_index]
+        self.line_offsets = old_offsets[:line_index + 1]
+
+        synced = None
+
+        def resync():
+            # Düzenlemenin ötesinde, eski metinde de NORMAL durumla başlayan bir satıra ulaşıldı mı?
+            nonlocal synced
+            start = self.line_offsets[-1]
+            if start < new_end:
+                return False
+            old_start = start - delta
+            index = bisect_left(old_offsets, old_start)
+            if index == len(old_offsets) or old_offsets[index] != old_start:
+                return False
+            if index > 0 and old_states[index - 1] != "NORMAL":
+                return False
+            synced = index
+            return True
+
+        self.resync = resync
+        try:
+            new_tokens = self.scan()
+        finally:
+            self.resync = None
+
+        if synced is None:
+            edit = (first, len(old_tokens), first + len(new_tokens))
+            lines = (line_index + 1, len(old_offsets) + 1, len(self.line_offsets) + 1)
+            if self.compact:
+                old_tokens.splice(first, len(old_tokens), new_tokens)
+            else:
+                old_tokens[first:] = new_tokens
+        else:
+            # Eşleşme noktasından sonrası aynı; eski token'ları satır farkı kadar kaydır
+            line_delta = len(self.line_offsets) - 1 - synced
+            tail = first_token_on_line(old_tokens, synced + 1)
+            edit = (first, tail, first + len(new_tokens))
+            lines = (line_index + 1, synced + 1, len(self.line_offsets))
+            if self.compact:
+                old_tokens.splice(first, tail, new_tokens, line_delta, delta)
+            else:
+                if line_delta:
+                    for token in old_tokens[tail:]:
+                        token.line += line_delta
+                old_tokens[first:tail] = new_tokens
+            self.line_states.extend(old_states[synced:])
+            self.line_offsets.extend(offset + delta for offset in old_offsets[synced + 1:])
+        self.tokens = old_tokens
+        self.token_edit = merge_edits(self.token_edit, edit)
+        self.line_edit = merge_edits(self.line_edit, lines)
+        return self.tokens
+
+    def scan(self):
+        if self.engine == "regex":
+            return self.scan_regex()
+        if self.compact:
+            return TokenBuffer.from_tokens(self.scan_chars(), self.text, self.line_offsets)
+        return self.scan_chars()
+
+    def scan_chars(self):
+        tokens = []
+        self.advance()
+
+        while self.current_char is not None:
+            if self.current_char.isspace():
+                if self.current_char == "\n":
+                    self.new_line("NORMAL")
+                    if self.resync is not None and self.resync():
+                        break
+                self.advance()
+                continue
+
+            if self.current_char == "#":
+                comment = ""
+                start_column = self.column
+                while self.current_char is not None and self.current_char != "\n":
+                    comment += self.current_char
+                    self.advance()
+                tokens.append(Token("COMMENT", comment, self.line, start_column))
+                continue
+
+            if self.current_char in ['"', "'"] and self.pos + 2 < len(self.text) and self.text[self.pos:self.pos+3] in ['"""', "'''"]:
+                quote = self.text[self.pos:self.pos+3]
+                comment = quote
+                start_line = self.line
+                start_column = self.column
+                self.advance()
+                self.advance()
+                self.advance()
+                while self.current_char is not None and self.text[self.pos:self.pos+3] != quote:
+                    if self.current_char == "\n":
+                        self.new_line("TRIPLE_STRING")
+                    comment += self.current_char
+                    self.advance()
+                if self.current_char is not None:
+                    comment += self.text[self.pos:self.pos+3]
+                    self.advance()
+                    self.advance()
+                    self.advance()
+                tokens.append(Token("COMMENT", comment, start_line, start_column))
+                continue
+
+            if self.current_char in self.operators:
+                op = self.current_char
+                start_column = self.column
+                self.advance()
+                if self.current_char is not None and op + self.current_char in self.operators:
+                    op += self.current_char
+                    self.advance()
+                tokens.append(Token("OPERATOR", op, self.line, start_column))
+                continue
+
+            if self.current_char.isalpha() or self.current_char == "_":
+                identifier = ""
+                start_column = self.column
+                while self.current_char is not None and (self.current_char.isalnum() or self.current_char == "_"):
+                    identifier += self.current_char
+                    self.advance()
+                if identifier in self.literals:
+                    token_type = "LITERAL"
+                elif identifier in self.keywords:
+                    token_type = "KEYWORD"
+                else:
+                    token_type = "IDENTIFIER"
+                tokens.append(Token(token_type, identifier, self.line, start_column))
+                continue
+
+            if self.current_char.isdigit():
+                number = ""
+                start_column = self.column
+                is_float = False
+                while self.current_char is not None and (self.current_char.isdigit() or self.current_char == "."):
+                    if self.current_char == ".":
+                        if is_float:
+                            tokens.append(Token("ERROR", number, self.line, start_column))
+                            break
+                        is_float = True
+                    number += self.current_char
+                    self.advance()
+                tokens.append(Token("NUMBER", number, self.line, start_column))
+                continue
+
+            if self.current_char in ['"', "'"]:
+                tokens.extend(self.tokenize_string())
+                continue
+
+            # Hatalı karakter
+            tokens.append(Token("ERROR", self.current_char, self.line, self.column))
+            self.advance()
+
+        return tokens
+
+    def scan_chars_range(self, pos, stop, line, column):
+        """text[pos + 1:stop] aralığını (bir f-string ifadesini) scan_chars ile tokenlaştırır.
+
+        (line, column) pos'taki karakterin konumudur. Tarama, anahtar sözcük ve
+        işleç kümelerini paylaşan ayrı bir lexer'da yapılır; satır durumları
+        çağıran tarafından FSTRING_EXPR olarak kaydedilir ve senkronizasyon denenmez."""
+        nested = copy.copy(self)
+        nested.set_text(self.text[pos + 1:stop])
+        nested.line, nested.column, nested.resync = line, column, None
+        return nested.scan_chars()
+
+    def tokenize_string(self):
+        quote = self.current_char
+        string = ""
+        start_line = self.line
+        start_column = self.column
+        is_f_string = self.pos > 0 and self.text[self.pos - 1].lower() == 'f'
+        string += quote
+        self.advance()
+        tokens = []
+        while self.current_char is not None:
+            if self.current_char == quote and self.text[self.pos:self.pos+2] != quote * 2:
+                string += self.current_char
+                self.advance()
+                tokens.append(Token("FSTRING" if is_f_string else "STRING", string, start_line, start_column))
+                return tokens
+            if is_f_string and self.current_char == "{":
+                if string:
+                    tokens.append(Token("FSTRING", string, start_line, start_column))
+                    string = ""
+                start_line = self.line
+                start_column = self.column
+                expr_start = self.pos
+                self.advance()
+                expr = ""
+                brace_count = 1
+                while self.current_char is not None and brace_count > 0:
+                    if self.current_char == "\n":
+                        self.new_line("FSTRING_EXPR")
+                    if self.current_char == "{":
+                        brace_count += 1
+                    elif self.current_char == "}":
+                        brace_count -= 1
+                    expr += self.current_char
+                    self.advance()
+                if brace_count == 0 and self.current_char is not None:
+                    tokens.append(Token("FSTRING_EXPR", "{", start_line, start_column))
+                    tokens.extend(self.scan_chars_range(expr_start, self.pos - 1, start_line, start_column))
+                    tokens.append(Token("FSTRING_EXPR", "}", self.line, self.column - 1))
+                else:
+                    tokens.append(Token("ERROR", "{" + expr, start_line, start_column))
+                # Sonraki parça ifadenin hemen ardından başlar
+                start_line = self.line
+                start_column = self.column
+                continue
+            if self.current_char == "\n":
+                self.new_line("STRING")
+            string += self.current_char
+            self.advance()
+        # Kapanmamış dize için hata token'ı
+        tokens.append(Token("ERROR", string, start_line, start_column))
+        return tokens
+
+    def scan_regex(self):
+        """scan() ile aynı token'ları üretir; karakter karakter ilerlemek yerine
+        ana desenle eşleşen alt dizeleri doğrudan self.text'ten keser."""
+        values = []
+        pos, line, line_start = self.scan_regex_range(self.pos + 1, len(self.text), self.line,
+                                                      self.line_offsets[-1], values)
+        self.pos = pos - 1
+        self.line = line
+        tokens = TokenBuffer.from_values(self.text, values)
+        return tokens if self.compact else tokens.to_tokens()
+
+    def scan_regex_range(self, pos, stop, line, line_start, values, nested=False):
+        """text[pos:stop] aralığındaki token'ları values listesine (tür kodu, başlangıç,
+        uzunluk, satır, sütun) beşlileri olarak ekler; (pos, line, line_start) döndürür.
+
+        Eşleşmenin türü grup adıyla değil numarasıyla (lastindex) ayırt edilir; her
+        token tek bir extend çağrısıyla eklenir (beş ayrı dizi eklemesinden hızlıdır)
+        ve TokenBuffer.from_values sütunları sonunda dilimlerle kurar. nested True ise aralık bir
+        f-string ifadesinin içidir: satır durumları çağıran tarafından FSTRING_EXPR
+        olarak kaydedildiğinden burada kaydedilmez ve senkronizasyon denenmez."""
+        text = self.text
+        length = stop
+        line_states = self.line_states
+        line_offsets = self.line_offsets
+        resync = None if nested else self.resync
+        match = self.pattern.match
+        name_codes = self.name_codes
+        groups = self.pattern.groupindex
+        NEWLINE, NAME, OPERATOR, NUMBER, COMMENT, TRIPLE, STRING, UNAME = (
+            groups[name] for name in ("newline", "name", "operator", "number", "comment", "triple", "string", "uname"))
+        emit = values.extend
+
+        while pos < length:
+            m = match(text, pos, length)
+            if m is None:
+                break  # Metin sonundaki boşluklar
+            kind = m.lastindex
+            pos = m.start(kind)
+            end = m.end()
+            # En sık görülen türler önce denetlenir
+            if kind == NAME:
+                code = name_codes.get(text[pos:end], IDENTIFIER_CODE)
+            elif kind == OPERATOR:
+                code = OPERATOR_CODE
+            elif kind == NEWLINE:
+                pos = end
+                line += 1
+                line_start = end
+                if not nested:
+                    line_states.append("NORMAL")
+                    line_offsets.append(end)
+                    if resync is not None and resync():
+                        break
+                continue
+            elif kind == COMMENT:
+                code = COMMENT_CODE
+            elif kind == STRING:
+                pos, line, line_start = self.scan_regex_string(pos, line, line_start, values, length, nested)
+                continue
+            elif kind == TRIPLE:
+                close = text.find(text[pos:end], end, length)
+                end = length if close == -1 else close + 3
+                emit((COMMENT_CODE, pos, end - pos, line, pos - line_start + 1))
+                newline = text.find("\n", pos + 3, end)
+                while newline != -1:
+                    line += 1
+                    line_start = newline + 1
+                    if not nested:
+                        line_states.append("TRIPLE_STRING")
+                        line_offsets.append(line_start)
+                    newline = text.find("\n", line_start, end)
+                pos = end
+                continue
+            elif kind == UNAME and text[pos].isalpha():
+                code = name_codes.get(text[pos:end], IDENTIFIER_CODE)
+            elif kind != NUMBER and not text[pos].isdigit():
+                # Hatalı karakter veya harf olmayan sayısal karakter (ör. "²")
+                code = ERROR_CODE
+                end = pos + 1
+            else:
+                if kind != NUMBER or (end < length and (text[end] == "." or text[end].isdigit())):
+                    # Yavaş yol: ikinci nokta veya ondalık olmayan rakamlar
+                    end = pos
+                    is_float = False
+                    while end < length and (text[end].isdigit() or text[end] == "."):
+                        if text[end] == ".":
+                            if is_float:
+                                emit((ERROR_CODE, pos, end - pos, line, pos - line_start + 1))
+                                break
+                            is_float = True
+                        end += 1
+                code = NUMBER_CODE
+            emit((code, pos, end - pos, line, pos - line_start + 1))
+            pos = end
+        return pos, line, line_start
+
+    def scan_regex_string(self, pos, line, line_start, values, stop, nested=False):
+        """Regex motoru için tek tırnaklı (f-)dizeleri text[:stop] içinde tarar;
+        tokenize_string ile aynı parçaları values listesine ekler."""
+        text = self.text
+        length = stop
+        emit = values.extend
+        quote = text[pos]
+        is_f_string = pos > 0 and text[pos - 1].lower() == 'f'
+        special = STRING_PATTERNS[quote, is_f_string]
+        piece_start, piece_line, piece_column = pos, line, pos - line_start + 1
+        pos += 1
+        while True:
+            m = special.search(text, pos, length)
+            if m is None:
+                break
+            pos = m.start()
+            char = text[pos]
+            if char == quote:
+                if text[pos:pos + 2] != quote * 2:
+                    emit((FSTRING_CODE if is_f_string else STRING_CODE, piece_start, pos + 1 - piece_start,
+                          piece_line, piece_column))
+                    return pos + 1, line, line_start
+                pos += 1
+                continue
+            if char == "\n":
+                line += 1
+                line_start = pos + 1
+                if not nested:
+                    self.line_states.append("STRING")
+                    self.line_offsets.append(line_start)
+                pos += 1
+                continue
+            # f-string içindeki "{...}" ifadesi
+            if pos > piece_start:
+                emit((FSTRING_CODE, piece_start, pos - piece_start, piece_line, piece_column))
+            expr_start, expr_line, expr_column, expr_line_start = pos, line, pos - line_start + 1, line_start
+            brace_count = 1
+            pos += 1
+            while brace_count > 0:
+                m = BRACE_PATTERN.search(text, pos, length)
+                if m is None:
+                    pos = length
+                    break
+                pos = m.start()
+                char = text[pos]
+                if char == "\n":
+                    line += 1
+                    line_start = pos + 1
+                    if not nested:
+                        self.line_states.append("FSTRING_EXPR")
+                        self.line_offsets.append(line_start)
+                elif char == "{":
+                    brace_count += 1
+                else:
+                    brace_count -= 1
+                pos += 1
+            if brace_count == 0 and pos < length:
+                # Süslü parantezler FSTRING_EXPR, aradaki ifade mutlak konumlu sıradan token'lar
+                emit((FSTRING_EXPR_CODE, expr_start, 1, expr_line, expr_column))
+                self.scan_regex_range(expr_start + 1, pos - 1, expr_line, expr_line_start, values, True)
+                emit((FSTRING_EXPR_CODE, pos - 1, 1, line, pos - line_start))
+            else:
+                emit((ERROR_CODE, expr_start, pos - expr_start, expr_line, expr_column))
+            piece_start, piece_line, piece_column = pos, line, pos - line_start + 1
+        # Kapanmamış dize için hata token'ı
+        emit((ERROR_CODE, piece_start, length - piece_start, piece_line, piece_column))
+        return length, line, line_start
+
+class Node:
+    """Ayrıştırıcı düğümü; ("FUNCTION_DEF", ad, ...) demeti gibi indekslenir,
+    karşılaştırılır ve yazdırılır, ek olarak kaynak aralığını taşır.
+
+    start/end düğümün kapsadığı [start, end) token aralığı, name onu adlandıran
+    token'ın (tanımdaki veya çağrıdaki ad, döngü değişkeni, lambda anahtar
+    sözcüğü) ve params parametre adlarının konumlarıdır. Konumlar üst düzey
+    deyimin ilk token'ına göredir; böylece artımlı ayrıştırmada yer değiştiren
+    deyimler değiştirilmeden yeniden kullanılır. Mutlak konum için deyimin
+    Parser.boundaries'teki başlangıcı eklenir."""
+    __slots__ = ("fields", "start", "end", "name", "params")
+
+    def __init__(self, fields, start, end, name=None, params=()):
+        self.fields = fields
+        self.start = start
+        self.end = end
+        self.name = name
+        self.params = params
+
+    def __getitem__(self, index):
+        return self.fields[index]
+
+    def __len__(self):
+        return len(self.fields)
+
+    def __iter__(self):
+        return iter(self.fields)
+
+    def __eq__(self, other):
+        if isinstance(other, Node):
+            return (self.fields == other.fields and self.start == other.start and self.end == other.end
+                    and self.name == other.name and self.params == other.params)
+        return self.fields == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.fields)
+
+    def span(self, tokens, base=0):
+        """Düğümün (satır, sütun, bitiş satırı, bitiş sütunu) aralığı; sütunlar Tk'deki
+        gibi 0 tabanlıdır. Hiç token kapsamayan düğümler için None döner."""
+        first, last = base + self.start, min(base + self.end, len(tokens)) - 1
+        if last < first:
+            return None
+        first_token, last_token = tokens[first], tokens[last]
+        end_line = last_token.line + last_token.value.count("\n")
+        if end_line == last_token.line:
+            end_column = last_token.column - 1 + len(last_token.value)
+        else:
+            end_column = len(last_token.value) - last_token.value.rfind("\n") - 1
+        return first_token.line, first_token.column - 1, end_line, end_column
+
+class ParseCache:
+    """Üst düzey deyimlerin ayrıştırma sonuçlarını okudukları token diliminin
+    içeriğine göre saklayan LRU önbellek.
+
+    Aynı önbellek birden çok Parser arasında paylaşılabilir; tekrarlanan içe
+    aktarmalar ve kalıp kodlar, geri alınan düzenlemeler veya yeniden açılan
+    dosyalar böylece yeniden ayrıştırılmaz. hits/misses ayar için sayaçlardır."""
+
+    def __init__(self, maxsize=PARSE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+class Parser:
+    def __init__(self, tokens, engine="recursive", cache=None):
+        self.tokens = tokens
+        # "recursive": katman başına bir metot, "precedence": öncelik tablosu ve açık yığın
+        self.engine = engine
+        self.pos = 0
+        self.current_token = self.tokens[0] if self.tokens else None
+        self.max_iterations = 10000  # Sonsuz döngü önleme
+        self.statements = None  # Son ayrıştırmanın üst düzey deyimleri
+        self.boundaries = None  # Deyimlerin başladığı token konumları ve son konum
+        self.base = 0  # Ayrıştırılan üst düzey deyimin ilk token'ı; Node konumları buna göredir
+        self.cache = cache  # Üst düzey deyimler için isteğe bağlı ParseCache
+
+    def advance(self):
+        self.pos += 1
+        if self.pos < len(self.tokens):
+            self.current_token = self.tokens[self.pos]
+        else:
+            self.current_token = None
+
+    def peek(self):
+        return self.tokens[self.pos + 1] if self.pos + 1 < len(self.tokens) else None
+
+    def expect(self, token_type, value=None):
+        if self.current_token and self.current_token.type == token_type and (value is None or self.current_token.value == value):
+            self.advance()
+        else:
+            self.advance()  # Hata toleransı için devam et
+
+    def node(self, start, *fields, name=None, params=()):
+        """start'tan geçerli konuma kadar uzanan bir Node üretir; konumlar üst düzey
+        deyimin başına göre saklanır."""
+        base = self.base
+        return Node(fields, start - base, self.pos - base,
+                    None if name is None else name - base, tuple(param - base for param in params))
+
+    def seek(self, pos):
+        self.pos = pos
+        self.current_token = self.tokens[pos] if pos < len(self.tokens) else None
+
+    def parse(self):
+        statements = []
+        boundaries = array("q", [self.pos])
+        iteration_count = 0
+        while self.current_token is not None and iteration_count < self.max_iterations:
+            statements.append(self.parse_top_level())
+            boundaries.append(self.pos)
+            iteration_count += 1
+        if iteration_count >= self.max_iterations:
+            logger.warning("Parser: Maksimum iterasyon sınırına ulaşıldı.")
+        self.statements = statements
+        self.boundaries = boundaries
+        return statements
+
+    def update(self, edit_start, edit_end, new_end):
+        """Token dizisinde [edit_start, edit_end) aralığı [edit_start, new_end) ile
+        değiştirildikten sonra yalnızca etkilenen üst düzey deyimleri yeniden ayrıştırır.
+
+        Baktığı son token düzenlemeden önce kalan deyimler ve yeniden ayrıştırma
+        eski bir deyim sınırına denk geldikten sonraki deyimler olduğu gibi
+        kullanılır. Sonuç aynı token'lar üzerinde tam bir parse() ile aynıdır."""
+        if self.statements is None:
+            self.seek(0)
+            return self.parse()
+        old_statements, old_boundaries = self.statements, self.boundaries
+        count = len(old_statements)
+        delta = new_end - edit_end
+        # İlk hasarlı deyim: bitişi (ileri bakış dahil) düzenlemeye ulaşan ilk deyim
+        first = bisect_right(old_boundaries, edit_start - PARSER_LOOKAHEAD, 1, count + 1) - 1
+        statements = old_statements[:first]
+        boundaries = old_boundaries[:first + 1]
+        self.seek(boundaries[-1])
+        while self.current_token is not None and len(statements) < self.max_iterations:
+            statements.append(self.parse_top_level())
+            boundaries.append(self.pos)
+            if self.pos < new_end:
+                continue
+            # Düzenlemenin ötesinde eski bir deyim başlangıcına gelindiyse kalan
+            # token'lar eskisiyle aynıdır; deyimleri kaydırarak yeniden kullan
+            reuse = bisect_left(old_boundaries, self.pos - delta, 0, count)
+            if reuse < count and old_boundaries[reuse] == self.pos - delta:
+                statements.extend(old_statements[reuse:])
+                boundaries.extend(array("q", [pos + delta for pos in old_boundaries[reuse + 1:]]))
+                self.seek(boundaries[-1])
+        del statements[self.max_iterations:]
+        del boundaries[self.max_iterations + 1:]
+        if len(statements) >= self.max_iterations:
+            logger.warning("Parser: Maksimum iterasyon sınırına ulaşıldı.")
+        self.statements = statements
+        self.boundaries = boundaries
+        return statements
+
+    def parse_top_level(self):
+        """Geçerli konumdaki üst düzey deyimi ayrıştırır, önbellek varsa ondan alır.
+
+        Bir deyimin sonucu yalnızca [başlangıç, bitiş + PARSER_LOOKAHEAD) token'larına
+        bağlıdır; sonuç bu dilimin anahtarıyla saklanır. Dilimin uzunluğu ayrıştırmadan
+        önce bilinmediği için deyimin ilk satırının anahtarı, o satırla başlayan son
+        deyimlerin okuduğu token sayılarını gösterir; her biri sırayla denenir."""
+        start = self.base = self.pos
+        cache = self.cache
+        if cache is None:
+            return self.parse_statement()
+        head = self.slice_key(start, self.line_end(start, start + PARSE_CACHE_HEAD), "H")
+        spans = cache.get(head) or ()
+        for span in spans:
+            entry = cache.get(self.slice_key(start, start + span))
+            if entry is not None:
+                cache.hits += 1
+                statement, length = entry
+                self.seek(start + length)
+                return statement
+        cache.misses += 1
+        statement = self.parse_statement()
+        length = self.pos - start
+        span = length + PARSER_LOOKAHEAD
+        cache.put(head, ((span,) + tuple(other for other in spans if other != span))[:PARSE_CACHE_SPANS])
+        cache.put(self.slice_key(start, start + span), (statement, length))
+        return statement
+
+    def line_end(self, start, limit):
+        """start'tan sonra 1. sütunda (girintisiz satır başında) duran ilk token'ın
+        konumu; limit'e kadar bakılır."""
+        tokens = self.tokens
+        limit = min(limit, len(tokens))
+        if isinstance(tokens, TokenBuffer):
+            try:
+                return tokens.columns.index(1, start + 1, limit)
+            except ValueError:
+                return limit
+        for position in range(start + 1, limit):
+            if tokens[position].column == 1:
+                return position
+        return limit
+
+    def slice_key(self, start, stop, kind="S"):
+        """[start, stop) token diliminin önbellek anahtarı. Dosya sonunu aşan kısım ve
+        max_iterations da anahtara girer; aynı anahtar aynı ayrıştırma sonucunu verir.
+
+        Anahtar bir özet değil dilimin içeriğidir: sözlük araması eşit özetli
+        girdileri karşılaştırır, böylece özet çakışması başka bir deyimin
+        sonucunu döndüremez."""
+        tokens = self.tokens
+        end = min(stop, len(tokens))
+        if isinstance(tokens, TokenBuffer):
+            # Token'lar boşluk dışındaki her karakteri kapsadığından türler, uzunluklar
+            # ve kapsanan metin token değerlerini tek başına belirler
+            text = ""
+            if end > start:
+                text = tokens.text[tokens.starts[start]:tokens.starts[end - 1] + tokens.lengths[end - 1]]
+            content = (tokens.types[start:end].tobytes(), tokens.lengths[start:end].tobytes(), text)
+        else:
+            content = tuple((token.type, token.value) for token in tokens[start:end])
+        return kind, self.max_iterations, stop - end, content
+
+    def parse_statement(self):
+        start = self.pos
+        if self.current_token and self.current_token.type == "KEYWORD":
+            if self.current_token.value == "def":
+                return self.parse_function_def()
+            elif self.current_token.value == "async":
+                return self.parse_async_stmt()
+            elif self.current_token.value == "if":
+                return self.parse_if_stmt()
+            elif self.current_token.value == "for":
+                return self.parse_for_stmt()
+            elif self.current_token.value == "while":
+                return self.parse_while_stmt()
+            elif self.current_token.value == "try":
+                return self.parse_try_stmt()
+            elif self.current_token.value == "class":
+                return self.parse_class_def()
+            elif self.current_token.value == "import":
+                return self.parse_import_stmt()
+            elif self.current_token.value == "from":
+                return self.parse_from_stmt()
+            elif self.current_token.value == "with":
+                return self.parse_with_stmt()
+            elif self.current_token.value == "match":
+                return self.parse_match_stmt()
+            elif self.current_token.value in ["break", "continue", "pass", "return", "raise", "yield"]:
+                return self.parse_control_stmt()
+            elif self.current_token.value == "global":
+                return self.parse_global_stmt()
+            elif self.current_token.value == "nonlocal":
+                return self.parse_nonlocal_stmt()
+            elif self.current_token.value == "assert":
+                return self.parse_assert_stmt()
+            elif self.current_token.value == "del":
+                return self.parse_del_stmt()
+        elif self.current_token and self.current_token.type == "IDENTIFIER":
+            return self.parse_assignment()
+        elif self.current_token and self.current_token.type == "COMMENT":
+            comment = self.current_token.value
+            self.advance()
+            return self.node(start, "COMMENT", comment)
+        elif self.current_token and self.current_token.type == "ERROR":
+            error = self.current_token.value
+            self.advance()
+            return self.node(start, "ERROR", error)
+        else:
+            return self.parse_expression_stmt()
+
+    def parse_function_def(self):
+        start = self.pos
+        decorators = []
+        while self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == "@":
+            decorators.append(self.parse_decorator())
+        is_async = False
+        if self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "async":
+            self.expect("KEYWORD", "async")
+            is_async = True
+        self.expect("KEYWORD", "def")
+        identifier = self.current_token.value if self.current_token and self.current_token.type == "IDENTIFIER" else ""
+        name = self.pos if identifier else None
+        self.expect("IDENTIFIER")
+        self.expect("OPERATOR", "(")
+        positions = []
+        params = self.parse_param_list(positions)
+        self.expect("OPERATOR", ")")
+        self.expect("OPERATOR", ":")
+        suite = self.parse_suite()
+        return self.node(start, "FUNCTION_DEF", identifier, params, suite, decorators, is_async,
+                         name=name, params=positions)
+
+    def parse_decorator(self):
+        start = self.pos
+        self.expect("OPERATOR", "@")
+        identifier = self.current_token.value if self.current_token and self.current_token.type == "IDENTIFIER" else ""
+        name = self.pos if identifier else None
+        self.expect("IDENTIFIER")
+        return self.node(start, "DECORATOR", identifier, name=name)
+
+    def parse_param_list(self, positions=None):
+        """Parametre adlarını döndürür; positions verilirse token konumları ona eklenir."""
+        params = []
+        iteration_count = 0
+        while self.current_token and self.current_token.type == "IDENTIFIER" and iteration_count < self.max_iterations:
+            params.append(self.current_token.value)
+            if positions is not None:
+                positions.append(self.pos)
+            self.expect("IDENTIFIER")
+            if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ",":
+                self.expect("OPERATOR", ",")
+            else:
+                break
+            iteration_count += 1
+        return params
+
+    def parse_suite(self):
+        statements = []
+        self.expect("OPERATOR", ":")
+        iteration_count = 0 
+        while self.current_token and iteration_count < self.max_iterations:
+            if self.current_token.type == "KEYWORD" and self.current_token.value in ["elif", "else", "except", "finally"]:
+                break  # Suite'i sonlandır
+            statements.append(self.parse_statement())
+            iteration_count += 1
+        return statements
+
+    def parse_async_stmt(self):
+        start = self.pos
+        self.expect("KEYWORD", "async")
+        if self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "def":
+            return self.parse_function_def()
+        elif self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "with":
+            return self.parse_with_stmt()
+        elif self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "for":
+            return self.parse_for_stmt()
+        else:
+            return self.node(start, "ASYNC_STMT", None)
+
+    def parse_if_stmt(self):
+        start = self.pos
+        self.expect("KEYWORD", "if")
+        expression = self.parse_expression()
+        self.expect("OPERATOR", ":")
+        suite = self.parse_suite()
+        elif_stmts = []
+        while self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "elif":
+            clause = self.pos
+            self.expect("KEYWORD", "elif")
+            elif_expr = self.parse_expression()
+            self.expect("OPERATOR", ":")
+            elif_suite = self.parse_suite()
+            elif_stmts.append(self.node(clause, "ELIF", elif_expr, elif_suite))
+        else_suite = None
+        if self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "else":
+            self.expect("KEYWORD", "else")
+            self.expect("OPERATOR", ":")
+            else_suite = self.parse_suite()
+        return self.node(start, "IF_STMT", expression, suite, elif_stmts, else_suite)
+
+    def parse_for_stmt(self):
+        start = self.pos
+        is_async = False
+        if self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "async":
+            self.expect("KEYWORD", "async")
+            is_async = True
+        self.expect("KEYWORD", "for")
+        identifier = self.current_token.value if self.current_token and self.current_token.type == "IDENTIFIER" else ""
+        name = self.pos if identifier else None
+        self.expect("IDENTIFIER")
+        self.expect("KEYWORD", "in")
+        expression = self.parse_expression()
+        self.expect("OPERATOR", ":")
+        suite = self.parse_suite()
+        return self.node(start, "FOR_STMT", identifier, expression, suite, is_async, name=name)
+
+    def parse_while_stmt(self):
+        start = self.pos
+        self.expect("KEYWORD", "while")
+        expression = self.parse_expression()
+        self.expect("OPERATOR", ":")
+        suite = self.parse_suite()
+        return self.node(start, "WHILE_STMT", expression, suite)
+
+    def parse_try_stmt(self):
+        start = self.pos
+        self.expect("KEYWORD", "try")
+        self.expect("OPERATOR", ":")
+        try_suite = self.parse_suite()
+        except_stmts = []
+        while self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "except":
+            clause = self.pos
+            self.expect("KEYWORD", "except")
+            self.expect("OPERATOR", ":")
+            except_suite = self.parse_suite()
+            except_stmts.append(self.node(clause, "EXCEPT", except_suite))
+        finally_suite = None
+        if self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "finally":
+            self.expect("KEYWORD", "finally")
+            self.expect("OPERATOR", ":")
+            finally_suite = self.parse_suite()
+        return self.node(start, "TRY_STMT", try_suite, except_stmts, finally_suite)
+
+    def parse_class_def(self):
+        start = self.pos
+        self.expect("KEYWORD", "class")
+        identifier = self.current_token.value if self.current_token and self.current_token.type == "IDENTIFIER" else ""
+        name = self.pos if identifier else None
+        self.expect("IDENTIFIER")
+        bases = []
+        if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == "(":
+            self.expect("OPERATOR", "(")
+            if self.current_token and self.current_token.type == "IDENTIFIER":
+                bases.append(self.current_token.value)
+                self.expect("IDENTIFIER")
+                while self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ",":
+                    self.expect("OPERATOR", ",")
+                    if self.current_token and self.current_token.type == "IDENTIFIER":
+                        bases.append(self.current_token.value)
+                        self.expect("IDENTIFIER")
+            self.expect("OPERATOR", ")")
+        self.expect("OPERATOR", ":")
+        suite = self.parse_suite()
+        return self.node(start, "CLASS_DEF", identifier, bases, suite, name=name)
+
+    def parse_import_stmt(self):
+        start = self.pos
+        self.expect("KEYWORD", "import")
+        identifiers = []
+        if self.current_token and self.current_token.type == "IDENTIFIER":
+            identifiers.append(self.current_token.value)
+            self.expect("IDENTIFIER")
+            while self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ",":
+                self.expect("OPERATOR", ",")
+                if self.current_token and self.current_token.type == "IDENTIFIER":
+                    identifiers.append(self.current_token.value)
+                    self.expect("IDENTIFIER")
+        return self.node(start, "IMPORT_STMT", identifiers)
+
+    def parse_from_stmt(self):
+        start = self.pos
+        self.expect("KEYWORD", "from")
+        module = self.current_token.value if self.current_token and self.current_token.type == "IDENTIFIER" else ""
+        self.expect("IDENTIFIER")
+        self.expect("KEYWORD", "import")
+        identifiers = []
+        if self.current_token and self.current_token.type == "IDENTIFIER":
+            identifiers.append(self.current_token.value)
+            self.expect("IDENTIFIER")
+            while self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ",":
+                self.expect("OPERATOR", ",")
+                if self.current_token and self.current_token.type == "IDENTIFIER":
+                    identifiers.append(self.current_token.value)
+                    self.expect("IDENTIFIER")
+        return self.node(start, "FROM_IMPORT_STMT", module, identifiers)
+
+    def parse_with_stmt(self):
+        start = self.pos
+        is_async = False
+        if self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "async":
+            self.expect("KEYWORD", "async")
+            is_async = True
+        self.expect("KEYWORD", "with")
+        expression = self.parse_expression()
+        identifier = None
+        if self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "as":
+            self.expect("KEYWORD", "as")
+            identifier = self.current_token.value if self.current_token and self.current_token.type == "IDENTIFIER" else ""
+            self.expect("IDENTIFIER")
+        self.expect("OPERATOR", ":")
+        suite = self.parse_suite()
+        return self.node(start, "WITH_STMT", expression, identifier, suite, is_async)
+
+    def parse_match_stmt(self):
+        start = self.pos
+        self.expect("KEYWORD", "match")
+        expression = self.parse_expression()
+        self.expect("OPERATOR", ":")
+        cases = []
+        iteration_count = 0
+        while self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "case" and iteration_count < self.max_iterations:
+            clause = self.pos
+            self.expect("KEYWORD", "case")
+            pattern = self.parse_pattern()
+            self.expect("OPERATOR", ":")
+            suite = self.parse_suite()
+            cases.append(self.node(clause, "CASE", pattern, suite))
+            iteration_count += 1
+        return self.node(start, "MATCH_STMT", expression, cases)
+
+    def parse_pattern(self):
+        start = self.pos
+        if self.current_token and self.current_token.type in ["NUMBER", "STRING", "FSTRING"]:
+            value = self.current_token.value
+            self.advance()
+            return self.node(start, "LITERAL", value)
+        elif self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value in ["True", "False", "None"]:
+            value = self.current_token.value
+            self.advance()
+            return self.node(start, "LITERAL", value)
+        elif self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == "[":
+            self.expect("OPERATOR", "[")
+            patterns = self.parse_pattern_list()
+            self.expect("OPERATOR", "]")
+            return self.node(start, "LIST_PATTERN", patterns)
+        elif self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == "{":
+            self.expect("OPERATOR", "{")
+            items = self.parse_dict_pattern_list()
+            self.expect("OPERATOR", "}")
+            return self.node(start, "DICT_PATTERN", items)
+        elif self.current_token and self.current_token.type == "IDENTIFIER":
+            value = self.current_token.value
+            self.expect("IDENTIFIER")
+            return self.node(start, "IDENTIFIER", value, name=start)
+        else:
+            return self.node(start, "PATTERN", None)
+
+    def parse_pattern_list(self):
+        patterns = []
+        iteration_count = 0
+        while self.current_token and (self.current_token.type not in ["OPERATOR"] or self.current_token.value != "]") and iteration_count < self.max_iterations:
+            patterns.append(self.parse_pattern())
+            if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ",":
+                self.expect("OPERATOR", ",")
+            else:
+                break
+            iteration_count += 1
+        return patterns
+
+    def parse_dict_pattern_list(self):
+        items = []
+        iteration_count = 0
+        while self.current_token and (self.current_token.type not in ["OPERATOR"] or self.current_token.value != "}") and iteration_count < self.max_iterations:
+            key = self.parse_pattern()
+            self.expect("OPERATOR", ":")
+            value = self.parse_pattern()
+            items.append((key, value))
+            if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ",":
+                self.expect("OPERATOR", ",")
+            else:
+                break
+            iteration_count += 1
+        return items
+
+    def parse_control_stmt(self):
+        start = self.pos
+        control_type = self.current_token.value
+        self.expect("KEYWORD", control_type)
+        if control_type in ["return", "yield"]:
+            expr = self.parse_expression() if self.current_token and self.current_token.type != "OPERATOR" else None
+            return self.node(start, control_type.upper() + "_STMT", expr)
+        elif control_type == "raise":
+            expr = self.parse_expression()
+            return self.node(start, "RAISE_STMT", expr)
+        else:  # break, continue, pass
+            return self.node(start, control_type.upper() + "_STMT", None)
+
+    def parse_global_stmt(self):
+        start = self.pos
+        self.expect("KEYWORD", "global")
+        identifiers = []
+        iteration_count = 0
+        while self.current_token and self.current_token.type == "IDENTIFIER" and iteration_count < self.max_iterations:
+            identifiers.append(self.current_token.value)
+            self.expect("IDENTIFIER")
+            if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ",":
+                self.expect("OPERATOR", ",")
+            else:
+                break
+            iteration_count += 1
+        return self.node(start, "GLOBAL_STMT", identifiers)
+
+    def parse_nonlocal_stmt(self):
+        start = self.pos
+        self.expect("KEYWORD", "nonlocal")
+        identifiers = []
+        iteration_count = 0
+        while self.current_token and self.current_token.type == "IDENTIFIER" and iteration_count < self.max_iterations:
+            identifiers.append(self.current_token.value)
+            self.expect("IDENTIFIER")
+            if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ",":
+                self.expect("OPERATOR", ",")
+            else:
+                break
+            iteration_count += 1
+        return self.node(start, "NONLOCAL_STMT", identifiers)
+
+    def parse_assert_stmt(self):
+        start = self.pos
+        self.expect("KEYWORD", "assert")
+        expr = self.parse_expression()
+        msg = None
+        if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ",":
+            self.expect("OPERATOR", ",")
+            msg = self.parse_expression()
+        return self.node(start, "ASSERT_STMT", expr, msg)
+
+    def parse_del_stmt(self):
+        start = self.pos
+        self.expect("KEYWORD", "del")
+        targets = self.parse_target_list()
+        return self.node(start, "DEL_STMT", targets)
+
+    def parse_assignment(self):
+        start = self.pos
+        targets = self.parse_target_list()
+        if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value in ["=", ":="]:
+            op = self.current_token.value
+            self.expect("OPERATOR", op)
+            expressions = self.parse_expression_list()
+            return self.node(start, "ASSIGNMENT", targets, op, expressions)
+        else:
+            return self.node(start, "ASSIGNMENT", targets, None, [])
+
+    def parse_target_list(self):
+        targets = []
+        iteration_count = 0
+        while self.current_token and self.current_token.type == "IDENTIFIER" and iteration_count < self.max_iterations:
+            targets.append(self.current_token.value)
+            self.expect("IDENTIFIER")
+            if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ",":
+                self.expect("OPERATOR", ",")
+            else:
+                break
+            iteration_count += 1
+        if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value in ["(", "["]:
+            delim = self.current_token.value
+            self.expect("OPERATOR", delim)
+            targets = self.parse_target_list()
+            self.expect("OPERATOR", "]" if delim == "[" else ")")
+        return targets
+
+    def parse_fstring_expr(self):
+        """f-string içindeki "{" ... "}" ifadesini ayrıştırır. Lexer ifadeyi süslü
+        parantezleri FSTRING_EXPR olan sıradan token'lar olarak ürettiğinden ayrı
+        bir lexer veya ayrıştırıcı gerekmez."""
+        start = self.pos
+        if self.current_token and self.current_token.type == "FSTRING_EXPR" and self.current_token.value == "{":
+            self.expect("FSTRING_EXPR", "{")
+            expr = self.parse_expression()
+            self.skip_fstring_tail()
+            return self.node(start, "FSTRING_EXPR", expr)
+        return None
+
+    def skip_fstring_tail(self):
+        """Dönüşüm (!r) ve biçim belirtecini (:>10) kapanan "}" dahil atlar; bunlar
+        token olarak vurgulanır ama ayrıştırılmaz. İç içe f-string'ler sayılır."""
+        depth = 1
+        iteration_count = 0
+        while self.current_token and iteration_count < self.max_iterations:
+            if self.current_token.type == "FSTRING_EXPR":
+                depth += 1 if self.current_token.value == "{" else -1
+            self.advance()
+            if depth == 0:
+                break
+            iteration_count += 1
+
+    def parse_expression(self):
+        if self.engine == "precedence":
+            return self.run_frames(self.expression_frame())
+        start = self.pos
+        expr = self.parse_if_expr()
+        while self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ".":
+            self.expect("OPERATOR", ".")
+            if self.current_token and self.current_token.type == "IDENTIFIER":
+                attr = self.current_token.value
+                name = self.pos
+                self.expect("IDENTIFIER")
+                expr = self.node(start, "ATTRIBUTE", expr, attr, name=name)
+            else:
+                break
+        return expr
+
+    def parse_if_expr(self):
+        start = self.pos
+        expr = self.parse_logical_or_expr()
+        if self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "if":
+            self.expect("KEYWORD", "if")
+            cond = self.parse_logical_or_expr()
+            if self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "else":
+                self.expect("KEYWORD", "else")
+                else_expr = self.parse_if_expr()
+                return self.node(start, "IF_EXPR", expr, cond, else_expr)
+        return expr
+
+    def parse_logical_or_expr(self):
+        start = self.pos
+        expr = self.parse_logical_and_expr()
+        iteration_count = 0
+        while self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "or" and iteration_count < self.max_iterations:
+            self.expect("KEYWORD", "or")
+            right = self.parse_logical_and_expr()
+            expr = self.node(start, "LOGICAL_OR", expr, right)
+            iteration_count += 1
+        return expr
+
+    def parse_logical_and_expr(self):
+        start = self.pos
+        expr = self.parse_not_expr()
+        iteration_count = 0
+        while self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "and" and iteration_count < self.max_iterations:
+            self.expect("KEYWORD", "and")
+            right = self.parse_not_expr()
+            expr = self.node(start, "LOGICAL_AND", expr, right)
+            iteration_count += 1
+        return expr
+
+    def parse_not_expr(self):
+        start = self.pos
+        if self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "not":
+            self.expect("KEYWORD", "not")
+            expr = self.parse_not_expr()
+            return self.node(start, "NOT", expr)
+        return self.parse_comparison()
+
+    def parse_comparison(self):
+        start = self.pos
+        expr = self.parse_bitwise_or_expr()
+        iteration_count = 0
+        while self.current_token and (
+            (self.current_token.type == "KEYWORD" and self.current_token.value in ["in", "is"]) or
+            (self.current_token.type == "OPERATOR" and self.current_token.value in ["<", ">", "==", ">=", "<=", "!="])
+        ) and iteration_count < self.max_iterations:
+            if self.current_token.type == "KEYWORD" and self.current_token.value == "in":
+                peek_token = self.peek()
+                if peek_token and peek_token.type == "KEYWORD" and peek_token.value == "not":
+                    self.expect("KEYWORD", "in")
+                    self.expect("KEYWORD", "not")
+                    right = self.parse_bitwise_or_expr()
+                    expr = self.node(start, "NOT_IN", expr, right)
+                else:
+                    self.expect("KEYWORD", "in")
+                    right = self.parse_bitwise_or_expr()
+                    expr = self.node(start, "IN", expr, right)
+            elif self.current_token.type == "KEYWORD" and self.current_token.value == "is":
+                peek_token = self.peek()
+                if peek_token and peek_token.type == "KEYWORD" and peek_token.value == "not":
+                    self.expect("KEYWORD", "is")
+                    self.expect("KEYWORD", "not")
+                    right = self.parse_bitwise_or_expr()
+                    expr = self.node(start, "IS_NOT", expr, right)
+                else:
+                    self.expect("KEYWORD", "is")
+                    right = self.parse_bitwise_or_expr()
+                    expr = self.node(start, "IS", expr, right)
+            else:
+                op = self.current_token.value
+                self.advance()
+                right = self.parse_bitwise_or_expr()
+                expr = self.node(start, "COMPARISON", expr, op, right)
+            iteration_count += 1
+        return expr
+
+    def parse_bitwise_or_expr(self):
+        start = self.pos
+        expr = self.parse_bitwise_xor_expr()
+        iteration_count = 0
+        while self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == "|" and iteration_count < self.max_iterations:
+            self.expect("OPERATOR", "|")
+            right = self.parse_bitwise_xor_expr()
+            expr = self.node(start, "BITWISE_OR", expr, right)
+            iteration_count += 1
+        return expr
+
+    def parse_bitwise_xor_expr(self):
+        start = self.pos
+        expr = self.parse_bitwise_and_expr()
+        iteration_count = 0
+        while self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == "^" and iteration_count < self.max_iterations:
+            self.expect("OPERATOR", "^")
+            right = self.parse_bitwise_and_expr()
+            expr = self.node(start, "BITWISE_XOR", expr, right)
+            iteration_count += 1
+        return expr
+
+    def parse_bitwise_and_expr(self):
+        start = self.pos
+        expr = self.parse_shift_expr()
+        iteration_count = 0
+        while self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == "&" and iteration_count < self.max_iterations:
+            self.expect("OPERATOR", "&")
+            right = self.parse_shift_expr()
+            expr = self.node(start, "BITWISE_AND", expr, right)
+            iteration_count += 1
+        return expr
+
+    def parse_shift_expr(self):
+        start = self.pos
+        expr = self.parse_arith_expr()
+        iteration_count = 0
+        while self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value in ["<<", ">>"] and iteration_count < self.max_iterations:
+            op = self.current_token.value
+            self.expect("OPERATOR", op)
+            right = self.parse_arith_expr()
+            expr = self.node(start, "SHIFT", expr, op, right)
+            iteration_count += 1
+        return expr
+
+    def parse_arith_expr(self):
+        start = self.pos
+        expr = self.parse_term()
+        iteration_count = 0
+        while self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value in ["+", "-"] and iteration_count < self.max_iterations:
+            op = self.current_token.value
+            self.expect("OPERATOR", op)
+            right = self.parse_term()
+            expr = self.node(start, "ARITH", expr, op, right)
+            iteration_count += 1
+        return expr
+
+    def parse_term(self):
+        start = self.pos
+        expr = self.parse_factor()
+        iteration_count = 0
+        while self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value in ["*", "/", "//", "%"] and iteration_count < self.max_iterations:
+            op = self.current_token.value
+            self.expect("OPERATOR", op)
+            right = self.parse_factor()
+            expr = self.node(start, "TERM", expr, op, right)
+            iteration_count += 1
+        return expr
+
+    def parse_factor(self):
+        start = self.pos
+        if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value in ["+", "-", "~"]:
+            op = self.current_token.value
+            self.expect("OPERATOR", op)
+            expr = self.parse_factor()
+            return self.node(start, "UNARY", op, expr)
+        return self.parse_power()
+
+    def parse_power(self):
+        start = self.pos
+        expr = self.parse_primary()
+        if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == "**":
+            self.expect("OPERATOR", "**")
+            right = self.parse_factor()
+            expr = self.node(start, "POWER", expr, right)
+        return expr
+
+    def parse_primary(self):
+        start = self.pos
+        if self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "lambda":
+            return self.parse_lambda_expr()
+        elif self.current_token and self.current_token.type in ["NUMBER", "STRING", "FSTRING"]:
+            value = self.current_token.value
+            self.advance()
+            return self.node(start, "LITERAL", value)
+        elif self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value in ["True", "False", "None"]:
+            value = self.current_token.value
+            self.advance()
+            return self.node(start, "LITERAL", value)
+        elif self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == "[":
+            self.expect("OPERATOR", "[")
+            peek_token = self.peek()
+            if peek_token and peek_token.type == "KEYWORD" and peek_token.value == "for":
+                comp = self.parse_comprehension()
+                self.expect("OPERATOR", "]")
+                return self.node(start, "LIST_COMP", comp)
+            exprs = self.parse_expression_list()
+            self.expect("OPERATOR", "]")
+            return self.node(start, "LIST", exprs)
+        elif self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == "{":
+            self.expect("OPERATOR", "{")
+            peek_token = self.peek()
+            if peek_token and peek_token.type == "OPERATOR" and peek_token.value == ":":
+                items = self.parse_dict_item_list()
+                self.expect("OPERATOR", "}")
+                return self.node(start, "DICT", items)
+            elif peek_token and peek_token.type == "KEYWORD" and peek_token.value == "for":
+                comp = self.parse_dict_comprehension()
+                self.expect("OPERATOR", "}")
+                return self.node(start, "DICT_COMP", comp)
+            else:
+                exprs = self.parse_expression_list()
+                self.expect("OPERATOR", "}")
+                return self.node(start, "SET", exprs)
+        elif self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == "(":
+            self.expect("OPERATOR", "(")
+            if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ")":
+                self.expect("OPERATOR", ")")
+                return self.node(start, "TUPLE", [])
+            expr = self.parse_expression()
+            if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ",":
+                self.expect("OPERATOR", ",")
+                exprs = [expr] + self.parse_expression_list()
+                self.expect("OPERATOR", ")")
+                return self.node(start, "TUPLE", exprs)
+            self.expect("OPERATOR", ")")
+            return expr
+        elif self.current_token and self.current_token.type == "IDENTIFIER":
+            identifier = self.current_token.value
+            self.advance()
+            if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == "(":
+                self.expect("OPERATOR", "(")
+                args = self.parse_expression_list()
+                self.expect("OPERATOR", ")")
+                return self.node(start, "CALL", identifier, args, name=start)
+            return self.node(start, "IDENTIFIER", identifier, name=start)
+        elif self.current_token and self.current_token.type == "FSTRING_EXPR" and self.current_token.value == "{":
+            return self.parse_fstring_expr()
+        elif self.current_token and self.current_token.type == "ERROR":
+            value = self.current_token.value
+            self.advance()
+            return self.node(start, "ERROR", value)
+        else:
+            return self.node(start, "EXPRESSION", None)
+
+    def parse_lambda_expr(self):
+        start = self.pos
+        self.expect("KEYWORD", "lambda")
+        positions = []
+        params = self.parse_param_list(positions)
+        self.expect("OPERATOR", ":")
+        expr = self.parse_expression()
+        return self.node(start, "LAMBDA", params, expr, name=start, params=positions)
+
+    def parse_comprehension(self):
+        start = self.pos
+        expr = self.parse_expression()
+        self.expect("KEYWORD", "for")
+        identifier = self.current_token.value if self.current_token and self.current_token.type == "IDENTIFIER" else ""
+        self.expect("IDENTIFIER")
+        self.expect("KEYWORD", "in")
+        iterable = self.parse_expression()
+        conds = []
+        iteration_count = 0
+        while self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "if" and iteration_count < self.max_iterations:
+            self.expect("KEYWORD", "if")
+            conds.append(self.parse_expression())
+            iteration_count += 1
+        return self.node(start, "COMP", expr, identifier, iterable, conds)
+
+    def parse_dict_comprehension(self):
+        start = self.pos
+        key = self.parse_expression()
+        self.expect("OPERATOR", ":")
+        value = self.parse_expression()
+        self.expect("KEYWORD", "for")
+        identifier = self.current_token.value if self.current_token and self.current_token.type == "IDENTIFIER" else ""
+        self.expect("IDENTIFIER")
+        self.expect("KEYWORD", "in")
+        iterable = self.parse_expression()
+        conds = []
+        iteration_count = 0
+        while self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "if" and iteration_count < self.max_iterations:
+            self.expect("KEYWORD", "if")
+            conds.append(self.parse_expression())
+            iteration_count += 1
+        return self.node(start, "DICT_COMP", key, value, identifier, iterable, conds)
+
+    def parse_expression_list(self):
+        if self.engine == "precedence":
+            return self.run_frames(self.expression_list_frame())
+        exprs = []
+        iteration_count = 0
+        while self.current_token and (
+            self.current_token.type not in ["OPERATOR"] or
+            self.current_token.value not in ["]", ")", "}", ":"]
+        ) and iteration_count < self.max_iterations:
+            exprs.append(self.parse_expression())
+            if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ",":
+                self.expect("OPERATOR", ",")
+            else:
+                break
+            iteration_count += 1
+        return exprs
+
+    def parse_dict_item_list(self):
+        items = []
+        iteration_count = 0
+        while self.current_token and (self.current_token.type not in ["OPERATOR"] or self.current_token.value != "}") and iteration_count < self.max_iterations:
+            key = self.parse_expression()
+            self.expect("OPERATOR", ":")
+            value = self.parse_expression()
+            items.append((key, value))
+            if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ",":
+                self.expect("OPERATOR", ",")
+            else:
+                break
+            iteration_count += 1
+        return items
+
+    def parse_expression_stmt(self):
+        start = self.pos
+        expr = self.parse_expression()
+        return self.node(start, "EXPR_STMT", expr)
+
+    # engine="precedence": ifadeler Python yığınında özyineleme yapmadan ayrıştırılır.
+    # İşleç zincirleri tek bir döngüde öncelik tablosuyla kurulur; parantez, liste,
+    # çağrı gibi iç içe yapılar ise *_frame üreteçleridir. Bir üreteç alt ifade
+    # gerektiğinde onun çerçevesini yield eder, run_frames() bu çerçeveyi kendi
+    # yığınında çalıştırıp sonucu geri gönderir. Üretilen düğümler ve konumlar
+    # özyinelemeli ayrıştırıcıyla aynıdır.
+
+    def run_frames(self, frame):
+        stack = [frame]
+        value = None
+        while True:
+            try:
+                request = stack[-1].send(value)
+            except StopIteration as done:
+                stack.pop()
+                if not stack:
+                    return done.value
+                value = done.value
+                continue
+            stack.append(request)
+            value = None
+
+    def expression_frame(self, level=EXPRESSION):
+        start = self.pos
+        operands = []  # (düğüm, başladığı konum, (zincir önceliği, zincirdeki işleç sayısı))
+        operators = []  # (öncelik, düğüm türü, işleç, başladığı konum, zincirdeki sıra)
+        context = 1  # Beklenen işlenenin katmanı; önek işleçlerin geçerliliğini belirler
+        while True:
+            token = self.current_token
+            if token is not None:
+                token_type, value = token.type, token.value
+                if token_type == "KEYWORD" and value == "not" and context <= NOT_PRECEDENCE:
+                    operators.append((NOT_PRECEDENCE, "NOT", None, self.pos, 0))
+                    self.advance()
+                    context = NOT_PRECEDENCE
+                    continue
+                if token_type == "OPERATOR" and value in ("+", "-", "~") and context <= UNARY_PRECEDENCE:
+                    operators.append((UNARY_PRECEDENCE, "UNARY", value, self.pos, 0))
+                    self.advance()
+                    context = UNARY_PRECEDENCE
+                    continue
+            # Birincil ifade; basit olanlar yerinde, iç içe olanlar alt çerçevede
+            begin = self.pos
+            if token is None:
+                node = self.node(begin, "EXPRESSION", None)
+            elif token_type in ("NUMBER", "STRING", "FSTRING"):
+                self.advance()
+                node = self.node(begin, "LITERAL", value)
+            elif token_type == "KEYWORD":
+                if value == "lambda":
+                    node = yield self.lambda_frame()
+                elif value in ("True", "False", "None"):
+                    self.advance()
+                    node = self.node(begin, "LITERAL", value)
+                else:
+                    node = self.node(begin, "EXPRESSION", None)
+            elif token_type == "IDENTIFIER":
+                self.advance()
+                if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == "(":
+                    node = yield self.call_frame(begin, value)
+                else:
+                    node = self.node(begin, "IDENTIFIER", value, name=begin)
+            elif token_type == "OPERATOR" and value == "[":
+                node = yield self.list_frame()
+            elif token_type == "OPERATOR" and value == "{":
+                node = yield self.brace_frame()
+            elif token_type == "OPERATOR" and value == "(":
+                node = yield self.paren_frame()
+            elif token_type == "FSTRING_EXPR" and value == "{":
+                node = yield self.fstring_frame()
+            elif token_type == "ERROR":
+                self.advance()
+                node = self.node(begin, "ERROR", value)
+            else:
+                node = self.node(begin, "EXPRESSION", None)
+            operands.append((node, begin, None))
+
+            # İkili işleç: önce önceliği en az onunki kadar olan bekleyen işleçler indirgenir
+            token = self.current_token
+            if token is None:
+                break
+            token_type, value = token.type, token.value
+            width = 1
+            if token_type == "KEYWORD" and value in ("in", "is"):
+                precedence, kind, keep = COMPARISON_PRECEDENCE, value.upper(), False
+                peek_token = self.peek()
+                if peek_token and peek_token.type == "KEYWORD" and peek_token.value == "not":
+                    kind, width = "NOT_IN" if value == "in" else "IS_NOT", 2
+            else:
+                entry = BINARY_OPERATORS.get((token_type, value))
+                if entry is None:
+                    break
+                precedence, kind, keep = entry
+            if precedence == POWER_PRECEDENCE:
+                iteration = 0  # Sağdan birleşir ve yineleme sınırı yoktur
+            else:
+                self.reduce(operands, operators, precedence)
+                chain = operands[-1][2]
+                iteration = chain[1] if chain and chain[0] == precedence else 0
+                if iteration >= self.max_iterations:
+                    break
+            operators.append((precedence, kind, value if keep else None, operands[-1][1], iteration))
+            for _ in range(width):
+                self.advance()
+            context = UNARY_PRECEDENCE if precedence >= 10 else precedence + 1
+        self.reduce(operands, operators, 0)
+        expr = operands[-1][0]
+
+        if level != OR_EXPRESSION and self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "if":
+            self.expect("KEYWORD", "if")
+            cond = yield self.expression_frame(OR_EXPRESSION)
+            if self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "else":
+                self.expect("KEYWORD", "else")
+                else_expr = yield self.expression_frame(IF_EXPRESSION)
+                expr = self.node(start, "IF_EXPR", expr, cond, else_expr)
+        if level == EXPRESSION:
+            while self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ".":
+                self.expect("OPERATOR", ".")
+                if self.current_token and self.current_token.type == "IDENTIFIER":
+                    attr = self.current_token.value
+                    name = self.pos
+                    self.expect("IDENTIFIER")
+                    expr = self.node(start, "ATTRIBUTE", expr, attr, name=name)
+                else:
+                    break
+        return expr
+
+    def reduce(self, operands, operators, precedence):
+        """Önceliği en az precedence olan bekleyen işleçleri düğümlere dönüştürür."""
+        while operators and operators[-1][0] >= precedence:
+            level, kind, op, begin, iteration = operators.pop()
+            right = operands.pop()[0]
+            if kind == "NOT":
+                operands.append((self.node(begin, "NOT", right), begin, None))
+            elif kind == "UNARY":
+                operands.append((self.node(begin, "UNARY", op, right), begin, None))
+            else:
+                left = operands.pop()[0]
+                node = self.node(begin, kind, left, op, right) if op is not None else self.node(begin, kind, left, right)
+                operands.append((node, begin, None if level == POWER_PRECEDENCE else (level, iteration + 1)))
+
+    def expression_list_frame(self):
+        exprs = []
+        iteration_count = 0
+        while self.current_token and (
+            self.current_token.type not in ["OPERATOR"] or
+            self.current_token.value not in ["]", ")", "}", ":"]
+        ) and iteration_count < self.max_iterations:
+            exprs.append((yield self.expression_frame()))
+            if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ",":
+                self.expect("OPERATOR", ",")
+            else:
+                break
+            iteration_count += 1
+        return exprs
+
+    def lambda_frame(self):
+        start = self.pos
+        self.expect("KEYWORD", "lambda")
+        positions = []
+        params = self.parse_param_list(positions)
+        self.expect("OPERATOR", ":")
+        expr = yield self.expression_frame()
+        return self.node(start, "LAMBDA", params, expr, name=start, params=positions)
+
+    def fstring_frame(self):
+        start = self.pos
+        self.expect("FSTRING_EXPR", "{")
+        expr = yield self.expression_frame()
+        self.skip_fstring_tail()
+        return self.node(start, "FSTRING_EXPR", expr)
+
+    def call_frame(self, start, identifier):
+        self.expect("OPERATOR", "(")
+        args = yield self.expression_list_frame()
+        self.expect("OPERATOR", ")")
+        return self.node(start, "CALL", identifier, args, name=start)
+
+    def list_frame(self):
+        start = self.pos
+        self.expect("OPERATOR", "[")
+        peek_token = self.peek()
+        if peek_token and peek_token.type == "KEYWORD" and peek_token.value == "for":
+            comp = yield self.comprehension_frame()
+            self.expect("OPERATOR", "]")
+            return self.node(start, "LIST_COMP", comp)
+        exprs = yield self.expression_list_frame()
+        self.expect("OPERATOR", "]")
+        return self.node(start, "LIST", exprs)
+
+    def brace_frame(self):
+        start = self.pos
+        self.expect("OPERATOR", "{")
+        peek_token = self.peek()
+        if peek_token and peek_token.type == "OPERATOR" and peek_token.value == ":":
+            items = yield self.dict_item_list_frame()
+            self.expect("OPERATOR", "}")
+            return self.node(start, "DICT", items)
+        elif peek_token and peek_token.type == "KEYWORD" and peek_token.value == "for":
+            comp = yield self.dict_comprehension_frame()
+            self.expect("OPERATOR", "}")
+            return self.node(start, "DICT_COMP", comp)
+        exprs = yield self.expression_list_frame()
+        self.expect("OPERATOR", "}")
+        return self.node(start, "SET", exprs)
+
+    def paren_frame(self):
+        start = self.pos
+        self.expect("OPERATOR", "(")
+        if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ")":
+            self.expect("OPERATOR", ")")
+            return self.node(start, "TUPLE", [])
+        expr = yield self.expression_frame()
+        if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ",":
+            self.expect("OPERATOR", ",")
+            exprs = [expr] + (yield self.expression_list_frame())
+            self.expect("OPERATOR", ")")
+            return self.node(start, "TUPLE", exprs)
+        self.expect("OPERATOR", ")")
+        return expr
+
+    def comprehension_frame(self):
+        start = self.pos
+        expr = yield self.expression_frame()
+        self.expect("KEYWORD", "for")
+        identifier = self.current_token.value if self.current_token and self.current_token.type == "IDENTIFIER" else ""
+        self.expect("IDENTIFIER")
+        self.expect("KEYWORD", "in")
+        iterable = yield self.expression_frame()
+        conds = yield self.condition_list_frame()
+        return self.node(start, "COMP", expr, identifier, iterable, conds)
+
+    def dict_comprehension_frame(self):
+        start = self.pos
+        key = yield self.expression_frame()
+        self.expect("OPERATOR", ":")
+        value = yield self.expression_frame()
+        self.expect("KEYWORD", "for")
+        identifier = self.current_token.value if self.current_token and self.current_token.type == "IDENTIFIER" else ""
+        self.expect("IDENTIFIER")
+        self.expect("KEYWORD", "in")
+        iterable = yield self.expression_frame()
+        conds = yield self.condition_list_frame()
+        return self.node(start, "DICT_COMP", key, value, identifier, iterable, conds)
+
+    def condition_list_frame(self):
+        conds = []
+        iteration_count = 0
+        while self.current_token and self.current_token.type == "KEYWORD" and self.current_token.value == "if" and iteration_count < self.max_iterations:
+            self.expect("KEYWORD", "if")
+            conds.append((yield self.expression_frame()))
+            iteration_count += 1
+        return conds
+
+    def dict_item_list_frame(self):
+        items = []
+        iteration_count = 0
+        while self.current_token and (self.current_token.type not in ["OPERATOR"] or self.current_token.value != "}") and iteration_count < self.max_iterations:
+            key = yield self.expression_frame()
+            self.expect("OPERATOR", ":")
+            value = yield self.expression_frame()
+            items.append((key, value))
+            if self.current_token and self.current_token.type == "OPERATOR" and self.current_token.value == ",":
+                self.expect("OPERATOR", ",")
+            else:
+                break
+            iteration_count += 1
+        return items
+
+# Adlandıran token'ı (Node.name) anlamsal etiket alan düğüm türleri
+NAME_TAGS = {
+    "FUNCTION_DEF": "FUNCTION_DEF", "CLASS_DEF": "CLASS_DEF", "DECORATOR": "DECORATOR",
+    "CALL": "CALL", "LAMBDA": "LAMBDA", "FOR_STMT": "LOOP_VAR", "ATTRIBUTE": "ATTRIBUTE"
+}
+# Koşul ifadelerinde CONDITIONAL etiketi alan token türleri
+CONDITIONAL_TYPES = {"IDENTIFIER", "NUMBER", "STRING"}
+
+def semantic_tags(parser):
+    """Parser'ın son ayrıştırmasından token konumu -> anlamsal etiket sözlüğü üretir.
+
+    Düğümler kendilerini adlandıran token'ın konumunu taşıdığından yalnızca
+    o token etiketlenir (ör. def'ten sonraki ad, çağrı yerindeki ad); aynı
+    yazılışlı diğer token'lar aranmaz. Bir token birden çok etiket alırsa Tk'de
+    görünen, yani TAG_NAMES'te sonra gelen etiket seçilir."""
+    tokens = parser.tokens
+    count = len(tokens)
+    roles = {}
+
+    def tag_token(position, tag):
+        if position < count:
+            role = roles.get(position)
+            if role is None or TAG_PRIORITY[tag] > TAG_PRIORITY[role]:
+                roles[position] = tag
+
+    for base, statement in zip(parser.boundaries, parser.statements):
+        if statement is None:
+            continue  # Ayrıştırılamayan deyimler (None) atlanır
+        stack = [statement]
+        while stack:
+            node = stack.pop()
+            kind = node[0]
+            tag = NAME_TAGS.get(kind)
+            if tag is not None and node.name is not None:
+                tag_token(base + node.name, tag)
+            for param in node.params:
+                tag_token(base + param, "PARAMETER")
+            if kind == "IF_STMT" or kind == "ELIF":
+                condition = node[1]
+                for position in range(base + condition.start, min(base + condition.end, count)):
+                    if tokens[position].type in CONDITIONAL_TYPES:
+                        tag_token(position, "CONDITIONAL")
+            # Alt düğümler: doğrudan alanlar, listeler ve (anahtar, değer) çiftleri
+            for field in node.fields[1:]:
+                if isinstance(field, Node):
+                    stack.append(field)
+                elif isinstance(field, list):
+                    for item in field:
+                        if isinstance(item, Node):
+                            stack.append(item)
+                        elif isinstance(item, tuple):
+                            stack.extend(sub for sub in item if isinstance(sub, Node))
+    return roles
+
+def changed_roles(old, new, edit=None):
+    """İki semantic_tags() sonucu arasında rolü farklı olan token konumlarını
+    (yeni token dizisine göre) döndürür.
+
+    edit, eski sonuçtan beri lexer'ın birleşik token düzenlemesidir (start,
+    old_end, new_end); old_end'den sonraki eski konumlar aradaki farkla kaydırılır."""
+    if edit is not None:
+        start, old_end, new_end = edit
+        delta = new_end - old_end
+        old = {position if position < start else position + delta: role
+               for position, role in old.items() if position < start or position >= old_end}
+    changed = {position for position, role in new.items() if old.get(position) != role}
+    changed.update(position for position, role in old.items() if new.get(position) != role)
+    return changed
+
+def token_pieces(text, start, length, line, column):
+    """text[start:start + length] token'ının Tk aralıklarını (satır, sütun, bitiş satırı,
+    bitiş sütunu) listesi olarak döndürür; column 0 tabanlıdır.
+
+    Satır sonu içeren token'lar (ör. üçlü tırnaklı string'ler) satır başına
+    parçalara bölünür: her parça kendi satırında başlar ve en geç sonraki satırın
+    başında biter. Böylece etiket modeli satırlar kaydırıldığında da geçerli kalır."""
+    end = start + length
+    newline = text.find("\n", start, end)
+    if newline < 0:
+        return [(line, column, line, column + length)]
+    pieces = []
+    while newline >= 0:
+        pieces.append((line, column, line + 1, 0))
+        line, column, start = line + 1, 0, newline + 1
+        newline = text.find("\n", start, end)
+    if start < end:
+        pieces.append((line, 0, line, end - start))
+    return pieces
+
+def collect_tag_ranges(tokens, roles, first_line=1, last_line=None):
+    """Token'lardan ve semantic_tags() çıktısından etiket -> {(satır, sütun, bitiş satırı,
+    bitiş sütunu)} sözlüğü üretir. Sütunlar Tk'deki gibi 0 tabanlıdır.
+
+    first_line ve last_line verilirse yalnızca bu satırlara düşen aralıklar
+    üretilir; görünür alan ve parça parça renklendirme bunu kullanır. Çok satırlı
+    token'lar token_pieces() ile satır başına bölünür; pencereden önce başlayıp
+    içine uzanan token'ın parçaları da dahildir."""
+    start = first_token_on_line(tokens, first_line) if first_line > 1 else 0
+    stop = len(tokens) if last_line is None else first_token_on_line(tokens, last_line + 1)
+    ranges = {}
+
+    def in_window(pieces):
+        return [piece for piece in pieces
+                if first_line <= piece[0] and (last_line is None or piece[0] <= last_line)]
+
+    if isinstance(tokens, TokenBuffer):
+        text, types, starts = tokens.text, tokens.types, tokens.starts
+        lines, columns, lengths = tokens.lines, tokens.columns, tokens.lengths
+
+        def pieces(position):
+            line, column, length = lines[position], columns[position] - 1, lengths[position]
+            if types[position] not in MULTILINE_CODES:
+                return in_window([(line, column, line, column + length)])
+            return in_window(token_pieces(text, starts[position], length, line, column))
+
+        tag_names = ["CONSTANT" if token_type == "LITERAL" else token_type for token_type in TOKEN_TYPES]
+        by_tag = [set() for _ in tag_names]
+        # Lexer token'ları (Token nesnesi oluşturmadan doğrudan sütunlardan)
+        for code, offset, line, column, length in zip(types[start:stop], starts[start:stop], lines[start:stop],
+                                                      columns[start:stop], lengths[start:stop]):
+            if code in MULTILINE_CODES and text.find("\n", offset, offset + length) >= 0:
+                by_tag[code].update(in_window(token_pieces(text, offset, length, line, column - 1)))
+            else:
+                by_tag[code].add((line, column - 1, line, column - 1 + length))
+        if start and types[start - 1] in MULTILINE_CODES:
+            by_tag[types[start - 1]].update(pieces(start - 1))
+        for tag, tag_ranges in zip(tag_names, by_tag):
+            if tag_ranges:
+                ranges.setdefault(tag, set()).update(tag_ranges)
+    else:
+        def pieces(position):
+            token = tokens[position]
+            return in_window(token_pieces(token.value, 0, len(token.value), token.line, token.column - 1))
+
+        for position in range(start - 1 if start else start, stop):
+            tag = "CONSTANT" if tokens[position].type == "LITERAL" else tokens[position].type
+            ranges.setdefault(tag, set()).update(pieces(position))
+
+    # Ayrıştırıcının anlamsal etiketleri doğrudan token konumlarına bağlıdır;
+    # pencere küçükse konumlar tek tek sorulur, değilse sözlük bir kez taranır
+    first = start - 1 if start else start  # Pencereye uzanan önceki token
+    if stop - first < len(roles):
+        semantic = ((position, roles.get(position)) for position in range(first, stop))
+    else:
+        semantic = ((position, tag) for position, tag in roles.items() if first <= position < stop)
+    for position, tag in semantic:
+        if tag is not None:
+            tag_ranges = pieces(position)
+            if tag_ranges:
+                ranges.setdefault(tag, set()).update(tag_ranges)
+    return {tag: tag_ranges for tag, tag_ranges in ranges.items() if tag_ranges}
+
+class TagRanges:
+    """Etiket aralıklarının satıra göre sıralı, paralel dizilerde saklanan sıkışık biçimi.
+
+    Arka plan işçisinin sonucu GUI'ye (gerekirse süreçler arasında) bu biçimde
+    taşınır; window() bir satır penceresini TagBatcher.apply() biçimine açar."""
+    __slots__ = ("tags", "codes", "lines", "columns", "end_lines", "end_columns")
+
+    def __init__(self, ranges=None):
+        ranges = ranges or {}
+        self.tags = sorted(ranges)
+        entries = sorted((r[0], r[1], code, r[2], r[3])
+                         for code, tag in enumerate(self.tags) for r in ranges[tag])
+        self.lines = array('l', [entry[0] for entry in entries])
+        self.columns = array('l', [entry[1] for entry in entries])
+        self.codes = array('B', [entry[2] for entry in entries])
+        self.end_lines = array('l', [entry[3] for entry in entries])
+        self.end_columns = array('l', [entry[4] for entry in entries])
+
+    def __len__(self):
+        return len(self.lines)
+
+    def window(self, first_line=1, last_line=None):
+        """first_line..last_line satırlarında başlayan aralıkları etiket -> küme olarak döndürür."""
+        start = bisect_left(self.lines, first_line)
+        stop = len(self.lines) if last_line is None else bisect_left(self.lines, last_line + 1)
+        ranges = {}
+        for i in range(start, stop):
+            ranges.setdefault(self.tags[self.codes[i]], set()).add(
+                (self.lines[i], self.columns[i], self.end_lines[i], self.end_columns[i]))
+        return ranges
+
+    def changed_blocks(self, old, edit, block_lines):
+        """old'dan bu yana aralıkları değişen block_lines satırlık blokların numaralarını döndürür.
+
+        edit, old'un metninden bu yana birleşik (ilk satır, eski bitiş, yeni bitiş)
+        düzenlemesidir; ona değen bloklar her zaman değişmiş sayılır, arkasındaki
+        bloklar eski aralıklarla satır farkı kadar kaydırılarak karşılaştırılır."""
+        first_line, old_stop, new_stop = edit
+        delta = new_stop - old_stop
+        last_line = max(self.lines[-1] if self.lines else 0, old.lines[-1] + delta if old.lines else 0, new_stop)
+        blocks = range(last_line // block_lines + 1)
+        if self.tags != old.tags:
+            return set(blocks)  # Etiket kodları farklı; diziler karşılaştırılamaz
+        changed = set(range(first_line // block_lines, (new_stop - 1) // block_lines + 1))
+        for block in blocks:
+            if block in changed:
+                continue
+            start, stop = block * block_lines, (block + 1) * block_lines
+            shift = 0 if stop <= first_line else delta  # Blok düzenlemenin ya önünde ya arkasında
+            a, b = bisect_left(self.lines, start), bisect_left(self.lines, stop)
+            c, d = bisect_left(old.lines, start - shift), bisect_left(old.lines, stop - shift)
+            if (b - a != d - c or self.codes[a:b] != old.codes[c:d] or self.columns[a:b] != old.columns[c:d]
+                    or self.end_columns[a:b] != old.end_columns[c:d]):
+                changed.add(block)
+            elif shift:
+                if (any(line - old_line != shift for line, old_line in zip(self.lines[a:b], old.lines[c:d]))
+                        or any(line - old_line != shift
+                               for line, old_line in zip(self.end_lines[a:b], old.end_lines[c:d]))):
+                    changed.add(block)
+            elif self.lines[a:b] != old.lines[c:d] or self.end_lines[a:b] != old.end_lines[c:d]:
+                changed.add(block)
+        return changed
+
+def analyze(text):
+    """Metni baştan tokenlaştırıp ayrıştırır ve etiket aralıklarını TagRanges olarak döndürür.
+
+    Arka plan işçisinde (iş parçacığı veya ayrı süreç) çalışır; Tk'ye dokunmaz."""
+    lexer = Lexer(engine="regex", compact=True)
+    lexer.set_text(text)
+    tokens = lexer.tokenize()
+    parser = Parser(tokens, engine="precedence")
+    parser.parse()
+    return TagRanges(collect_tag_ranges(tokens, semantic_tags(parser)))
+
+class TagBatcher:
+    """Etiket aralıklarını etiket başına toplayıp Tk'ye tek çağrıyla gönderir.
+
+    Son uygulanan aralıklar satır başına saklanır; her geçişte yalnızca farklı
+    olan aralıklar kaldırılır veya eklenir. Satır penceresi verilerek metnin bir
+    bölümü diğerlerinden bağımsız uygulanabilir. Tcl çağrıları add/remove
+    üzerinden yapıldığından alt sınıflar başsız (Tk'siz) bir hedef sağlayabilir."""
+
+    def __init__(self, widget):
+        self.widget = widget
+        # satır -> uygulanmış (etiket, sütun, bitiş satırı farkı, bitiş sütunu) kümesi;
+        # bitiş satırı göreli tutulur, böylece satırlar kaydırılınca da geçerlidir
+        self.lines = [None]
+        self.calls = 0  # Toplam Tcl etiket çağrısı sayısı
+
+    def reset(self):
+        """Metnin tamamı değiştiğinde (ör. dosya açma) modeli temizler."""
+        self.lines = [None]
+
+    def add(self, tag, ranges):
+        self.calls += 1
+        self.widget.tag_add(tag, *self.indices(ranges))
+
+    def remove(self, tag, ranges):
+        self.calls += 1
+        self.widget.tk.call(self.widget._w, "tag", "remove", tag, *self.indices(ranges))
+
+    def indices(self, ranges):
+        indices = []
+        for line, column, end_line, end_column in sorted(ranges):
+            indices.append(f"{line}.{column}")
+            indices.append(f"{end_line}.{end_column}")
+        return indices
+
+    def reserve(self, line):
+        if len(self.lines) <= line:
+            self.lines.extend([None] * (line + 1 - len(self.lines)))
+
+    def invalidate(self, first_line, old_last_line, new_last_line):
+        """Bir düzenlemeden sonra modeli Tk'nin kaydırdığı etiketlerle hizalar.
+
+        Düzenlenen satırlardaki aralıklar Tk'den silinip modelden çıkarılır;
+        sonraki satırlar liste dilimiyle satır farkı kadar kaydırılır."""
+        self.reserve(old_last_line)
+        tags = set()
+        for entries in self.lines[first_line:old_last_line + 1]:
+            if entries:
+                tags.update(entry[0] for entry in entries)
+        self.lines[first_line:old_last_line + 1] = [None] * (new_last_line - first_line + 1)
+        for tag in tags:
+            self.remove(tag, [(first_line, 0, new_last_line + 1, 0)])
+
+    def apply(self, ranges, first_line=1, last_line=None):
+        """İstenen etiket aralıklarını uygular; yalnızca farkı Tk'ye gönderir.
+
+        Pencere verildiğinde ranges yalnızca first_line..last_line satırlarını
+        kapsamalıdır; diğer satırların modeline dokunulmaz."""
+        wanted = {}
+        for tag, tag_ranges in ranges.items():
+            for line, column, end_line, end_column in tag_ranges:
+                wanted.setdefault(line, set()).add((tag, column, end_line - line, end_column))
+        if last_line is None:
+            last_line = max(len(self.lines) - 1, max(wanted, default=0))
+        self.reserve(last_line)
+        removed, added = {}, {}
+        for line in range(first_line, last_line + 1):
+            old = self.lines[line] or set()
+            new = wanted.get(line, set())
+            if old == new:
+                continue
+            gone = old - new
+            for tag, column, span, end_column in gone:
+                removed.setdefault(tag, set()).add((line, column, line + span, end_column))
+            for tag, column, span, end_column in new - old:
+                added.setdefault(tag, set()).add((line, column, line + span, end_column))
+            if gone:
+                # Tk aynı etiketin çakışan aralıklarını birleştirir; kaldırma
+                # sırasında silinen ama hâlâ istenen aralıkları yeniden ekle
+                # (sütunlar satır farkıyla birlikte karşılaştırılır)
+                for tag, column, span, end_column in new & old:
+                    if any(g[0] == tag and (0, g[1]) < (span, end_column) and (0, column) < (g[2], g[3])
+                           for g in gone):
+                        added.setdefault(tag, set()).add((line, column, line + span, end_column))
+            self.lines[line] = new or None
+        for tag, tag_ranges in removed.items():
+            self.remove(tag, tag_ranges)
+        for tag, tag_ranges in added.items():
+            self.add(tag, tag_ranges)
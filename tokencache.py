@@ -0,0 +1,166 @@
+"""Token akışı ve anlamsal rolleri için kalıcı disk önbelleği.
+
+Örnek:
+    cache = TokenCache()
+    cached = cache.load(metin)  # (TokenBuffer, satır ofsetleri, satır durumları, roller) veya None
+    if cached is None:
+        ...  # tokenlaştır ve ayrıştır
+        cache.store(metin, cache.encode(lexer, roller))
+
+Kayıtlar metnin içerik özetiyle adlandırılır; özet, syntax.py'nin kendisinden
+türetilen bir sürüm damgasını da içerir, böylece lexer veya ayrıştırıcı
+değişince eski kayıtlar kendiliğinden ıskalanır. Her kayıt başlık ve
+array.array sütunlarının ham baytlarından oluşur (pickle kullanılmaz).
+Dizin toplam boyutu bütçeyi aşınca en uzun süredir kullanılmayan kayıtlar silinir.
+"""
+import hashlib
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+import syntax
+from syntax import TAG_NAMES, TokenBuffer
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "pysyntaxhighlight")
+CACHE_BUDGET = 256 * 1024 * 1024  # Önbellek dizininin bayt cinsinden üst sınırı
+CACHE_FORMAT = 1  # Kayıt düzeni değişince artırılır
+CACHE_MAGIC = b"PSHC"
+LINE_STATES = ["NORMAL", "TRIPLE_STRING", "STRING", "FSTRING_EXPR"]
+LINE_STATE_CODES = {state: code for code, state in enumerate(LINE_STATES)}
+TAG_CODES = {tag: code for code, tag in enumerate(TAG_NAMES)}
+# Büyü, metin uzunluğu, token, satır ofseti, satır durumu ve rol sayıları
+HEADER = struct.Struct("<4sQQQQQ")
+# Sütunların sırası ve türleri; TokenBuffer'ınkilerle aynıdır
+COLUMNS = ("types", "starts", "lengths", "lines", "columns")
+COLUMN_TYPES = ("B", "q", "l", "l", "l")
+
+_stamp = None
+
+
+def lexer_stamp():
+    """syntax.py'nin içeriği, kayıt düzeni ve platform dizi boyutlarından türetilen damga."""
+    global _stamp
+    if _stamp is None:
+        digest = hashlib.blake2b(digest_size=16)
+        try:
+            with open(syntax.__file__, "rb") as file:
+                digest.update(file.read())
+        except OSError:
+            pass  # Kaynağı olmayan dağıtımlarda yalnızca kayıt düzeni kullanılır
+        digest.update(f"{CACHE_FORMAT}:{sys.byteorder}:{array('l').itemsize}".encode())
+        _stamp = digest.digest()
+    return _stamp
+
+
+class TokenCache:
+    """Metin içeriğine göre anahtarlanan, boyut bütçeli LRU disk önbelleği.
+
+    Son kullanım zamanı dosyanın değiştirilme zamanında tutulur; isabet olan kayıt
+    yeniden dokunulur ve yazımdan sonra bütçe aşıldıysa en eskiler silinir."""
+
+    def __init__(self, directory=CACHE_DIR, budget=CACHE_BUDGET):
+        self.directory = directory
+        self.budget = budget
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, text):
+        digest = hashlib.blake2b(lexer_stamp(), digest_size=20)
+        digest.update(text.encode("utf-8", "surrogatepass"))
+        return os.path.join(self.directory, digest.hexdigest() + ".bin")
+
+    def load(self, text):
+        """Metnin kaydını okur; yoksa veya bozuksa None döndürür."""
+        path = self.path(text)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+            entry = self.decode(text, data)
+            os.utime(path)  # LRU için son kullanım
+        except (OSError, ValueError, IndexError, struct.error):
+            entry = None
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def decode(self, text, data):
+        magic, length, count, offset_count, state_count, role_count = HEADER.unpack_from(data)
+        if magic != CACHE_MAGIC or length != len(text):
+            return None
+        position = HEADER.size
+
+        def read(typecode, size):
+            nonlocal position
+            column = array(typecode)
+            stop = position + size * column.itemsize
+            if stop > len(data):
+                raise ValueError("kesik önbellek kaydı")
+            column.frombytes(data[position:stop])
+            position = stop
+            return column
+
+        tokens = TokenBuffer(text)
+        for name, typecode in zip(COLUMNS, COLUMN_TYPES):
+            setattr(tokens, name, read(typecode, count))
+        line_offsets = read("q", offset_count).tolist()
+        line_states = [LINE_STATES[code] for code in read("B", state_count)]
+        positions = read("q", role_count)
+        codes = read("B", role_count)
+        if position != len(data):
+            return None
+        roles = dict(zip(positions, [TAG_NAMES[code] for code in codes]))
+        return tokens, line_offsets, line_states, roles
+
+    def encode(self, lexer, roles):
+        """Lexer'ın tam tokenlaştırmasını ve semantic_tags() rollerini kayıt baytlarına çevirir.
+
+        Ana iş parçacığında çağrılır; dönen baytlar store() ile başka bir iş
+        parçacığında yazılabilir."""
+        tokens = lexer.tokens
+        parts = [HEADER.pack(CACHE_MAGIC, len(lexer.text), len(tokens), len(lexer.line_offsets),
+                             len(lexer.line_states), len(roles))]
+        parts.extend(getattr(tokens, name).tobytes() for name in COLUMNS)
+        parts.append(array("q", lexer.line_offsets).tobytes())
+        parts.append(bytes(LINE_STATE_CODES[state] for state in lexer.line_states))
+        parts.append(array("q", roles.keys()).tobytes())
+        parts.append(bytes(TAG_CODES[tag] for tag in roles.values()))
+        return b"".join(parts)
+
+    def store(self, text, data):
+        """Kaydı geçici dosya üzerinden yazar ve gerekirse eski kayıtları siler."""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            descriptor, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(descriptor, "wb") as file:
+                    file.write(data)
+                os.replace(temp_path, self.path(text))
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+            self.evict()
+        except OSError:
+            pass  # Önbellek yalnızca hızlandırır; yazılamaması hata değildir
+
+    def evict(self):
+        """Toplam boyut bütçeyi aşıyorsa en uzun süredir kullanılmayan kayıtları siler."""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".bin"):
+                info = entry.stat()
+                entries.append((info.st_mtime, info.st_size, entry.path))
+                total += info.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.budget:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size